@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# bench_store.py
+# Columnar result store: one Parquet dataset per export "sheet" under STORE
+# (default <OUTDIR>/store), written by export_bench_to_excel.py after each size
+# and read directly by the visualizers.
+#
+#   <store>/results/n=<N>/label_key=<key>/variant=<variant>/*.parquet   per-run rows
+#   <store>/plan_nodes/n=<N>/label_key=<key>/variant=<variant>/*.parquet   per-node rows
+#   <store>/<sheet>/n=<N>/*.parquet        summary, selectivity, pagination, ...
+#   <store>/scenarios/*.parquet            scenario catalog (latest export)
+#   <store>/plan_shapes/*.parquet          bench.plan_shapes (results.shape_hash)
+#
+# Rewriting a size replaces its n=<N> partition only, so sizes land one at a time
+# and an interrupted export keeps everything finished before it. Excel is an
+# optional rendering of the store (store_to_excel.py).
+#
+# Examples:
+#   python bench_store.py                       # sizes and row counts per dataset
+#   python bench_store.py --store exports/store
+
+import argparse, glob, json, os, re, shutil
+from decimal import Decimal
+
+import pandas as pd
+
+STORE = os.getenv("BENCH_STORE") or os.path.join(os.getenv("OUTDIR", "exports"), "store")
+
+RESULTS = "results"
+SCENARIOS = "scenarios"
+PLAN_SHAPES = "plan_shapes"
+PLAN_NODES = "plan_nodes"
+# per-size datasets in workbook order (performance_run_<N>.xlsx)
+SHEETS = ["summary", "observer_effect", "selectivity", "plan_modes", "cache_modes", "writes",
+          "aggregates", "projection", "pagination", "joins", "plan_stability", "node_breakdown",
+          "server_stats", "wait_events", "index_usage", "storage", "index_builds"]
+
+# bench.node_metric_keys(): the values of each entry of results.node_actuals
+NODE_METRIC_KEYS = ["Plan Rows", "Total Cost",
+                    "Actual Rows", "Actual Loops", "Actual Startup Time", "Actual Total Time",
+                    "Shared Hit Blocks", "Shared Read Blocks", "Shared I/O Read Time",
+                    "Temp Read Blocks", "Temp Written Blocks",
+                    "Exact Heap Blocks", "Lossy Heap Blocks", "Heap Fetches",
+                    "Rows Removed by Filter", "Rows Removed by Index Recheck",
+                    "Sort Method", "Sort Space Used", "Hash Batches", "Peak Memory Usage"]
+
+# fixed Arrow types of the per-run datasets (results, plan_nodes): chunks and sizes
+# are written separately, and an all-NULL chunk column must not come out as a different type
+RESULT_TEXT = {"label", "variant", "timing_mode", "plan_mode", "cache_mode", "dataset_fp", "sweep_point",
+               "shape_hash", "node_actuals", "label_key", "node_type", "relation_name", "index_name"}
+RESULT_INT = {"n", "run_no", "shared_reads", "shared_hits", "temp_reads", "temp_writes",
+              "wal_bytes", "rows_written", "hot_updates", "index_growth_bytes",
+              "node_no", "parent_no", "depth", "self_shared_hits", "self_shared_reads", "temp_blocks",
+              "exact_heap_blocks", "lossy_heap_blocks"}
+
+# ----------------------- Write -----------------------
+
+def _columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet-friendly copy: NUMERIC -> float, JSON/array values -> JSON text."""
+    df = df.copy()
+    for c in df.columns:
+        if df[c].dtype != object:
+            continue
+        vals = df[c].dropna()
+        if len(vals) and vals.map(lambda v: isinstance(v, Decimal)).all():
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype("float64")
+        elif vals.map(lambda v: isinstance(v, (dict, list))).any():
+            df[c] = df[c].map(lambda v: v if v is None or isinstance(v, str) else json.dumps(v))
+    return df
+
+def _results_schema(columns):
+    import pyarrow as pa
+
+    def arrow_type(c):
+        if c == "ts":
+            return pa.timestamp("us", tz="UTC")
+        if c in RESULT_TEXT:
+            return pa.string()
+        return pa.int64() if c in RESULT_INT else pa.float64()
+    return pa.schema([(c, arrow_type(c)) for c in columns])
+
+def _write(path: str, df: pd.DataFrame, partition_cols: list[str] | None = None,
+           schema=None, basename: str | None = None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(_columnar(df), schema=schema, preserve_index=False)
+    if partition_cols:
+        pq.write_to_dataset(table, root_path=path, partition_cols=partition_cols,
+                            basename_template=basename,
+                            existing_data_behavior="overwrite_or_ignore")
+    else:
+        os.makedirs(path, exist_ok=True)
+        pq.write_table(table, os.path.join(path, "part-0.parquet"))
+
+def _clear(path: str):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+def clear_results(root: str, n: int, name: str = RESULTS):
+    _clear(os.path.join(root, name, f"n={n}"))
+
+def label_key(labels: pd.Series) -> pd.Series:
+    """Label key of each bench label: "N=1000000 jsonb_indexed" -> "jsonb_indexed"."""
+    return labels.astype(str).str.split(" ", n=1).str[-1]
+
+def append_results(root: str, n: int, df: pd.DataFrame, part: int = 0, name: str = RESULTS):
+    """Add one chunk of per-run rows of size n (file part-<part>-* in each partition it touches)."""
+    if df.empty:
+        return
+    df = df.assign(n=n, label_key=label_key(df["label"]))
+    _write(os.path.join(root, name), df, ["n", "label_key", "variant"],
+           schema=_results_schema(df.columns), basename=f"part-{part}-{{i}}.parquet")
+
+def write_results(root: str, n: int, df: pd.DataFrame):
+    """Per-run rows of size n, partitioned by n / label key / variant."""
+    clear_results(root, n)
+    append_results(root, n, df)
+
+def write_sheet(root: str, name: str, n: int, df: pd.DataFrame | None):
+    """One per-size dataset (a workbook sheet), partitioned by n."""
+    base = os.path.join(root, name)
+    _clear(os.path.join(base, f"n={n}"))
+    if df is None or df.empty:
+        return
+    _write(base, df.assign(n=n), ["n"])
+
+def write_table(root: str, name: str, df: pd.DataFrame):
+    """A dataset that does not depend on N (scenarios, plan_shapes), replaced as a whole."""
+    path = os.path.join(root, name)
+    _clear(path)
+    if not df.empty:
+        _write(path, df)
+
+def write_scenarios(root: str, df: pd.DataFrame):
+    write_table(root, SCENARIOS, df)
+
+# ----------------------- Read -----------------------
+
+def _read(path: str, filters=None) -> pd.DataFrame:
+    if not os.path.isdir(path):
+        return pd.DataFrame()
+    df = pd.read_parquet(path, filters=filters)
+    # hive partition keys come back as categoricals
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(str)
+    if "n" in df.columns:
+        df["n"] = df["n"].astype("int64")
+    return df
+
+def read_sheet(root: str, name: str, n: int | None = None) -> pd.DataFrame:
+    """A per-size dataset (all sizes, or only n); empty frame if never written."""
+    base = os.path.join(root, name)
+    if not sizes(root, name):
+        return _read(base)          # unpartitioned (scenarios) or missing
+    # sizes are written separately: a column that is all NULL at one N has no type
+    # there, so read each n=<N> directory on its own and let pandas line them up
+    frames = [_read(os.path.join(base, f"n={k}")).assign(n=k)
+              for k in sizes(root, name) if n is None or k == n]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def read_results(root: str, n: int | None = None, label_key: str | None = None,
+                 variant: str | None = None) -> pd.DataFrame:
+    """Per-run rows; the filters prune partitions instead of scanning every size."""
+    filters = [(k, "=", v) for k, v in (("n", n), ("label_key", label_key), ("variant", variant))
+               if v is not None]
+    df = _read(os.path.join(root, RESULTS), filters or None)
+    return df.sort_values(["variant", "run_no"], ignore_index=True) if not df.empty else df
+
+def iter_results(root: str, n: int, columns: list[str] | None = None, batch_rows: int = 65_536):
+    """Per-run rows of size n as frames of at most batch_rows rows, without loading them all."""
+    import pyarrow.dataset as ds
+
+    path = os.path.join(root, RESULTS, f"n={n}")
+    if not os.path.isdir(path):
+        return
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_rows):
+        df = batch.to_pandas()
+        for c in ("label_key", "variant"):
+            if c in df.columns and isinstance(df[c].dtype, pd.CategoricalDtype):
+                df[c] = df[c].astype(str)
+        yield df
+
+def sizes(root: str, name: str = "summary") -> list[int]:
+    """Sizes present in a dataset, from its partition directories."""
+    out = []
+    for p in glob.glob(os.path.join(root, name, "n=*")):
+        m = re.search(r"n=(\d+)$", p)
+        if m:
+            out.append(int(m.group(1)))
+    return sorted(out)
+
+def count_rows(root: str, name: str, n: int) -> int:
+    """Row count of one size from the Parquet footers (no data is read)."""
+    import pyarrow.dataset as ds
+
+    return ds.dataset(os.path.join(root, name, f"n={n}"), format="parquet").count_rows()
+
+def scenario_meta(root: str) -> dict[str, dict]:
+    """{variant: row} of the stored catalog, like scenarios.load_scenario_sheet()."""
+    df = _read(os.path.join(root, SCENARIOS))
+    if df.empty:
+        return {}
+    df = df.astype(object).where(pd.notna(df), None)
+    return {r["variant"]: r for r in df.to_dict("records")}
+
+def expand_plan(shape: dict, actuals: list) -> dict:
+    """Plan tree of one run: the shape with node_actuals merged in (bench.plan_json)."""
+    pos = 0
+
+    def merge(node):
+        nonlocal pos
+        out = {k: v for k, v in node.items() if k != "Plans"}
+        vals = actuals[pos] if pos < len(actuals) else []
+        out.update({k: v for k, v in zip(NODE_METRIC_KEYS, vals) if v is not None})
+        pos += 1
+        if "Plans" in node:
+            out["Plans"] = [merge(c) for c in node["Plans"]]
+        return out
+    return merge(shape)
+
+def shape_lookup(root: str) -> dict[str, dict]:
+    """{shape_hash: skeleton} of the stored plan shapes."""
+    df = read_sheet(root, PLAN_SHAPES)
+    if df.empty:
+        return {}
+    return {h: json.loads(s) for h, s in zip(df["shape_hash"], df["shape"])}
+
+# ----------------------- Visualizer input -----------------------
+
+def _size_from_filename(path: str):
+    m = re.search(r"performance_run_(\d+)\.xlsx$", os.path.basename(path))
+    return int(m.group(1)) if m else None
+
+def sheet_frames(sheet: str, store: str | None = None, files_glob: str | None = None):
+    """[(N, frame)] of one sheet, from the store or (files_glob) older Excel exports.
+
+    Column names are lower-cased; N is None for workbooks named differently.
+    """
+    frames = []
+    if files_glob:
+        for p in sorted(glob.glob(files_glob)):
+            try:
+                d = pd.read_excel(p, sheet_name=sheet)
+            except Exception as e:
+                print(f"[warn] no {sheet} sheet in {p}: {e}")
+                continue
+            d.columns = [c.strip().lower() for c in d.columns]
+            frames.append((_size_from_filename(p), d))
+    else:
+        df = read_sheet(store or STORE, sheet)
+        if not df.empty:
+            df.columns = [c.strip().lower() for c in df.columns]
+            frames = [(int(n), d.drop(columns="n").reset_index(drop=True))
+                      for n, d in df.groupby("n", sort=True)]
+    return frames
+
+def sheet_frame(sheet: str, store: str | None = None, files_glob: str | None = None) -> pd.DataFrame:
+    """All sizes of one sheet in one frame, with columns size (N) and key (label key)."""
+    frames = [d.assign(size=n) for n, d in sheet_frames(sheet, store, files_glob)]
+    if not frames:
+        raise SystemExit(f"No {sheet} data in {files_glob or store or STORE}")
+    df = pd.concat(frames, ignore_index=True)
+    df["key"] = label_key(df["label"])
+    return df
+
+def load_meta(store: str | None = None, files_glob: str | None = None) -> dict[str, dict]:
+    """Scenario catalog rows from the store, or the union of the workbooks' "scenarios" sheets."""
+    if not files_glob:
+        return scenario_meta(store or STORE)
+    from scenarios import load_scenario_sheet
+
+    meta = {}
+    for p in sorted(glob.glob(files_glob)):
+        try:
+            meta.update(load_scenario_sheet(p))
+        except Exception as e:
+            print(f"[warn] no scenario sheet in {p}: {e}")
+    return meta
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="List the sizes and row counts in the columnar result store.")
+    ap.add_argument("--store", default=STORE, help="Store directory (BENCH_STORE, default <OUTDIR>/store)")
+    args = ap.parse_args()
+
+    names = [RESULTS, PLAN_NODES] + SHEETS
+    found = False
+    for name in names:
+        for n in sizes(args.store, name):
+            rows = count_rows(args.store, name, n)
+            print(f"{name:16s} N={n:<10,} {rows:>8,} rows")
+            found = True
+    if not found:
+        print(f"(empty store: {os.path.abspath(args.store)})")
+
+if __name__ == "__main__":
+    main()
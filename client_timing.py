@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# client_timing.py
+# Client-side wall-clock timing of the catalog scenarios, with no EXPLAIN.
+#
+# Every execution is the raw query plus fetching all rows, timed with
+# time.perf_counter() on the client. Each recorded run becomes a bench.results
+# row with timing_mode='client' and client_ms set (execution_ms/shape_hash NULL),
+# under the same label/variant/run_no as the bench.run rows. Together with
+# bench.run(..., p_timing => 'both') this fills every column of
+# bench.observer_effect.
+#
+# --plan-mode custom|generic runs each scenario the way the application does:
+# a psycopg server-side prepared statement with bound parameters, under
+# plan_cache_mode = force_custom_plan / force_generic_plan (plan_mode column).
+#
+# Example:
+#   python client_timing.py --runs 30 --warmup 2
+#   python client_timing.py --labels jsonb_indexed rel_indexed --variants S3_trgm_contains S9_or_keys
+#   python client_timing.py --variants S2_like_prefix --sweep     # every sweep point too
+#   python client_timing.py --plan-mode generic
+
+import argparse
+import os
+import time
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+from scenarios import LABEL_KEYS, fetch_catalog, page_params, parameterize, scenario_sql, sweep_points
+
+# ---- connection config (env or defaults) -------------------------------------
+PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
+PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
+PGDATABASE = os.getenv("POSTGRES_DB", "ledgerdb")
+PGUSER     = os.getenv("POSTGRES_USER", "postgres")
+PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+
+
+def connect():
+    return psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE,
+        user=PGUSER, password=PGPASSWORD,
+        autocommit=True, prepare_threshold=None,
+    )
+
+
+PLAN_CACHE_MODE = {"custom": "force_custom_plan", "generic": "force_generic_plan"}
+
+
+def time_query(cur, sql: str, args: list | None = None) -> tuple[float, int]:
+    """Return (client wall ms, rows fetched) for one raw execution.
+
+    With args, the statement is a server-side prepared one (prepared on first use).
+    """
+    t0 = time.perf_counter()
+    if args is None:
+        cur.execute(sql)
+    else:
+        cur.execute(sql, args, prepare=True)
+    rows = cur.fetchall()
+    return (time.perf_counter() - t0) * 1000.0, len(rows)
+
+
+def record_client_runs(n: int, runs: int = 30, warm: int = 2,
+                       labels: list[str] | None = None, variants: list[str] | None = None,
+                       sweep: bool = False, plan_mode: str = "simple"):
+    """Time every (label, variant[, sweep point]) from the client and insert timing_mode='client' rows."""
+    labels = labels or LABEL_KEYS
+    insert = """
+        INSERT INTO bench.results (label, variant, run_no, query_sql, timing_mode,
+                                   plan_mode, client_ms, actual_rows, selectivity, params,
+                                   sweep_point, dataset_fp)
+        VALUES (%s, %s, %s, %s, 'client', %s, %s, %s,
+                %s::numeric / NULLIF((SELECT rows FROM bench.dataset), 0), %s, %s,
+                (SELECT fingerprint FROM bench.dataset))
+    """
+    with connect() as conn, conn.cursor() as cur:
+        catalog = fetch_catalog(conn)
+        if plan_mode != "simple":
+            conn.execute(f"SET plan_cache_mode = {PLAN_CACHE_MODE[plan_mode]}")
+        for key in labels:
+            label = f"N={n} {key}"
+            for variant in variants or list(catalog):
+                if key not in catalog[variant]["queries"]:
+                    continue
+                points = sweep_points(catalog[variant])
+                for point, params in (points if sweep else points[:1]):
+                    params = page_params(conn, catalog[variant]["queries"][key], params)
+                    if plan_mode == "simple":
+                        sql, args = scenario_sql(catalog, variant, key, params), None
+                    else:
+                        sql, args = parameterize(catalog[variant]["queries"][key], params)
+                    for _ in range(max(warm, 0)):
+                        time_query(cur, sql, args)
+                    rows = []
+                    for i in range(1, max(runs, 1) + 1):
+                        ms, nrows = time_query(cur, sql, args)
+                        rows.append((label, variant, i, sql, plan_mode, round(ms, 3), nrows, nrows,
+                                     Jsonb(params), point))
+                    cur.executemany(insert, rows)
+                    print(f"   {label:<26} {variant:<18} {point or '':<10} "
+                          f"median={sorted(r[5] for r in rows)[len(rows) // 2]} ms")
+
+
+def clear_client_runs(n: int):
+    with connect() as conn:
+        conn.execute(
+            "DELETE FROM bench.results WHERE timing_mode = 'client' AND label LIKE %s",
+            (f"N={n} %",),
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Client-side wall-clock timing of the catalog scenarios (no EXPLAIN).")
+    ap.add_argument("--runs", type=int, default=30, help="Recorded runs per scenario (default 30)")
+    ap.add_argument("--warmup", type=int, default=2, help="Unrecorded warmups per scenario (default 2)")
+    ap.add_argument("--labels", nargs="+", default=LABEL_KEYS,
+                    help="Label keys (default: every label the suite runs, scenarios.LABEL_KEYS)")
+    ap.add_argument("--variants", nargs="+", default=[], help="Restrict to these scenarios (default: whole catalog)")
+    ap.add_argument("--rows", type=int, default=None, help="Dataset size for labels (default: count(*) of inv_rel)")
+    ap.add_argument("--clear", action="store_true", help="Delete previous client-timed rows for this N first")
+    ap.add_argument("--sweep", action="store_true", help="Also time every sweep point of each scenario")
+    ap.add_argument("--plan-mode", choices=["simple", "custom", "generic"], default="simple",
+                    help="simple = literal SQL (default); custom/generic = prepared statement "
+                         "under the matching plan_cache_mode")
+    args = ap.parse_args()
+
+    with connect() as conn:
+        catalog = fetch_catalog(conn)
+        n = args.rows if args.rows is not None else conn.execute("SELECT count(*) FROM inv_rel").fetchone()[0]
+    unknown = [v for v in args.variants if v not in catalog]
+    if unknown:
+        raise SystemExit(f"Not in bench.scenarios: {unknown}")
+
+    print(f"\n▶ Client-side timing for N={n:,} ...")
+    if args.clear:
+        clear_client_runs(n)
+    record_client_runs(n, args.runs, args.warmup, args.labels, args.variants or None,
+                       args.sweep, args.plan_mode)
+    print("   ...done (see bench.observer_effect)")
+
+
+if __name__ == "__main__":
+    main()
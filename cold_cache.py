@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# cold_cache.py
+# Catalog scenarios under explicit cache regimes (bench.results.cache_mode):
+#
+#   hot      runs after warmups (what bench.run_suite_for_size measures)
+#   evicted  the dataset tables, TOAST and indexes are evicted from
+#            shared_buffers before every run (bench.evict_buffers, PG17
+#            pg_buffercache_evict); reads are served by the OS page cache
+#   os_cold  evicted + the OS page cache dropped before every run with
+#            --drop-cmd, so reads hit the disk. This needs a host/VM where
+#            dropping caches is allowed (privileged container, Linux host or
+#            the Docker Desktop VM); the command is tried once before timing.
+#
+# hot/evicted are one bench.run call per (label, variant); os_cold calls
+# bench.run once per run, right after dropping the caches. Compare the regimes
+# in bench.cache_modes (shared_reads, io_read_ms with track_io_timing = on).
+#
+# Example:
+#   python cold_cache.py --runs 10
+#   python cold_cache.py --regimes os_cold --variants S3_trgm_contains --labels jsonb_indexed rel_indexed
+#   BENCH_DROP_CACHES_CMD="sudo sh -c 'sync; echo 3 > /proc/sys/vm/drop_caches'" python cold_cache.py
+
+import argparse
+import os
+import subprocess
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+from scenarios import BASE_LABEL_KEYS, fetch_catalog, scenario_sql
+
+# ---- connection config (env or defaults) -------------------------------------
+PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
+PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
+PGDATABASE = os.getenv("POSTGRES_DB", "ledgerdb")
+PGUSER     = os.getenv("POSTGRES_USER", "postgres")
+PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+
+# Drops the (shared) kernel page cache from a throwaway privileged container.
+DROP_CACHES_CMD = os.getenv(
+    "BENCH_DROP_CACHES_CMD",
+    "docker run --rm --privileged alpine sh -c 'sync; echo 3 > /proc/sys/vm/drop_caches'",
+)
+
+REGIMES = ["hot", "evicted", "os_cold"]
+
+
+def connect():
+    return psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE,
+        user=PGUSER, password=PGPASSWORD,
+        autocommit=True, prepare_threshold=None,
+    )
+
+
+def drop_os_cache(cmd: str = DROP_CACHES_CMD):
+    res = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    if res.returncode != 0:
+        raise SystemExit(f"Dropping the OS page cache failed ({cmd!r}): "
+                         f"{(res.stderr or res.stdout).strip()}")
+
+
+def record_cache_runs(n: int, runs: int = 10, warm: int = 2, regimes: list[str] | None = None,
+                      labels: list[str] | None = None, variants: list[str] | None = None,
+                      drop_cmd: str = DROP_CACHES_CMD):
+    """Run every (label, variant) under each regime through bench.run(p_cache => regime)."""
+    regimes = regimes or ["evicted", "os_cold"]
+    labels = labels or BASE_LABEL_KEYS
+    if "os_cold" in regimes:
+        drop_os_cache(drop_cmd)   # fail before timing anything
+    with connect() as conn:
+        catalog = fetch_catalog(conn)
+        for regime in regimes:
+            for key in labels:
+                label = f"N={n} {key}"
+                for variant in variants or list(catalog):
+                    if key not in catalog[variant]["queries"]:
+                        continue
+                    sql = scenario_sql(catalog, variant, key)
+                    params = Jsonb(catalog[variant]["params"] or {})
+                    if regime != "os_cold":
+                        conn.execute(
+                            "SELECT bench.run(%s, %s, %s, %s, %s, p_params => %s, p_cache => %s)",
+                            (label, variant, sql, runs, warm, params, regime),
+                        )
+                    else:
+                        conn.execute("EXPLAIN " + sql)   # warm catalog caches, read no data
+                        for i in range(1, max(runs, 1) + 1):
+                            conn.execute("SELECT bench.evict_buffers()")
+                            drop_os_cache(drop_cmd)
+                            conn.execute(
+                                "SELECT bench.run(%s, %s, %s, 1, 0, p_params => %s, "
+                                "p_cache => 'os_cold', p_first_run => %s)",
+                                (label, variant, sql, params, i),
+                            )
+                    p50, reads = conn.execute(
+                        """
+                        SELECT p50_ms, avg_shared_reads FROM bench.cache_modes
+                        WHERE label = %s AND variant = %s AND cache_mode = %s
+                        """,
+                        (label, variant, regime),
+                    ).fetchone()
+                    print(f"   {regime:<8} {label:<26} {variant:<18} p50={p50} ms reads={reads}")
+
+
+def clear_cache_runs(n: int, regimes: list[str]):
+    with connect() as conn:
+        conn.execute(
+            "DELETE FROM bench.results WHERE cache_mode = ANY(%s) AND label LIKE %s",
+            (regimes, f"N={n} %"),
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Catalog scenarios under hot / evicted / OS-cold cache regimes.")
+    ap.add_argument("--regimes", nargs="+", choices=REGIMES, default=["evicted", "os_cold"],
+                    help="Cache regimes to run (default: evicted os_cold)")
+    ap.add_argument("--runs", type=int, default=10, help="Recorded runs per scenario and regime (default 10)")
+    ap.add_argument("--warmup", type=int, default=2, help="Unrecorded warmups for hot/evicted (default 2)")
+    ap.add_argument("--labels", nargs="+", default=BASE_LABEL_KEYS,
+                    help="Label keys (default: the base labels, scenarios.BASE_LABEL_KEYS)")
+    ap.add_argument("--variants", nargs="+", default=[], help="Restrict to these scenarios (default: whole catalog)")
+    ap.add_argument("--rows", type=int, default=None, help="Dataset size for labels (default: bench.dataset rows)")
+    ap.add_argument("--drop-cmd", default=DROP_CACHES_CMD,
+                    help="Shell command that drops the OS page cache (env BENCH_DROP_CACHES_CMD)")
+    ap.add_argument("--clear", action="store_true", help="Delete previous rows of these regimes for this N first")
+    args = ap.parse_args()
+
+    with connect() as conn:
+        catalog = fetch_catalog(conn)
+        if args.rows is None:
+            row = conn.execute("SELECT rows FROM bench.dataset").fetchone()
+            n = row[0] if row else conn.execute("SELECT count(*) FROM inv_rel").fetchone()[0]
+        else:
+            n = args.rows
+    unknown = [v for v in args.variants if v not in catalog]
+    if unknown:
+        raise SystemExit(f"Not in bench.scenarios: {unknown}")
+
+    print(f"\n▶ Cache regimes {', '.join(args.regimes)} for N={n:,} ...")
+    if args.clear:
+        clear_cache_runs(n, args.regimes)
+    record_cache_runs(n, args.runs, args.warmup, args.regimes, args.labels, args.variants or None,
+                      args.drop_cmd)
+    print("   ...done (see bench.cache_modes)")
+
+
+if __name__ == "__main__":
+    main()
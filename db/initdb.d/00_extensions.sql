@@ -1,2 +1,4 @@
 CREATE EXTENSION IF NOT EXISTS pg_trgm;
 CREATE EXTENSION IF NOT EXISTS btree_gin;
+CREATE EXTENSION IF NOT EXISTS pg_buffercache;   -- bench.evict_buffers (cache regimes)
+CREATE EXTENSION IF NOT EXISTS pg_stat_statements;   -- bench.stat_snapshot (server-side counters)
@@ -2,3 +2,11 @@ CREATE TABLE IF NOT EXISTS inv_jsonb (
   id       BIGSERIAL PRIMARY KEY,
   payload  JSONB NOT NULL
 );
+
+-- Same documents as inv_jsonb, indexed by one payload-wide
+-- GIN (payload jsonb_path_ops) instead of per-key expression indexes
+-- (09_indexes.sql); queried with payload @> {...} containment.
+CREATE TABLE IF NOT EXISTS inv_jsonb_gin (
+  id       BIGSERIAL PRIMARY KEY,
+  payload  JSONB NOT NULL
+);
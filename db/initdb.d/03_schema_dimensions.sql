@@ -0,0 +1,21 @@
+-- Relational dimension tables for the join scenarios (J1-J3 in
+-- 06_queries_bench.sql): customers keyed by the invoice key the documents
+-- carry in indexed_text_2 / unindexed_text_2 ('INV' + 7 digits of n % 1e7).
+-- dim_customer_<c> holds keys 1..c, so it matches the dataset rows n <= c.
+-- Filled by bench.seed_dimensions (07_procedures_bench.sql), independent of
+-- the dataset size and seed; the list matches bench.dimension_tables().
+DO $$
+DECLARE
+  t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['dim_customer_1k', 'dim_customer_100k', 'dim_customer_1m'] LOOP
+    EXECUTE format($ddl$
+      CREATE TABLE IF NOT EXISTS %I (
+        key     TEXT PRIMARY KEY,
+        name    TEXT NOT NULL,
+        region  TEXT NOT NULL,
+        tier    INT  NOT NULL
+      )$ddl$, t);
+  END LOOP;
+END
+$$;
@@ -0,0 +1,42 @@
+-- Hybrid design: the full JSONB payload (same documents as inv_jsonb) with the
+-- hot keys (every indexed_* key) promoted to STORED generated columns, which
+-- get ordinary column indexes (09_indexes.sql). The unindexed_* keys are only
+-- in the payload. Writers only ever set payload.
+
+-- Payload timestamps are ISO 8601 with an explicit 'Z' offset, so the cast
+-- does not depend on TimeZone / DateStyle; declared IMMUTABLE so it can back
+-- a generated column.
+CREATE OR REPLACE FUNCTION public.iso_ts(p TEXT) RETURNS TIMESTAMPTZ
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$ SELECT p::timestamptz $$;
+
+-- JSONB array of strings -> text[] (NULL when the value is not an array).
+CREATE OR REPLACE FUNCTION public.jsonb_text_array(p JSONB) RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$ SELECT CASE WHEN jsonb_typeof(p) = 'array'
+               THEN ARRAY(SELECT jsonb_array_elements_text(p)) END $$;
+
+CREATE TABLE IF NOT EXISTS inv_hybrid (
+  id       BIGSERIAL PRIMARY KEY,
+  payload  JSONB NOT NULL,
+
+  indexed_text_1 TEXT GENERATED ALWAYS AS (payload->>'indexed_text_1') STORED,
+  indexed_text_2 TEXT GENERATED ALWAYS AS (payload->>'indexed_text_2') STORED,
+  indexed_text_3 TEXT GENERATED ALWAYS AS (payload->>'indexed_text_3') STORED,
+
+  indexed_timestamp_1 TIMESTAMPTZ GENERATED ALWAYS AS (iso_ts(payload->>'indexed_timestamp_1')) STORED,
+  indexed_timestamp_2 TIMESTAMPTZ GENERATED ALWAYS AS (iso_ts(payload->>'indexed_timestamp_2')) STORED,
+  indexed_timestamp_3 TIMESTAMPTZ GENERATED ALWAYS AS (iso_ts(payload->>'indexed_timestamp_3')) STORED,
+
+  indexed_number_1 NUMERIC(18,2) GENERATED ALWAYS AS ((payload->>'indexed_number_1')::numeric) STORED,
+  indexed_number_2 NUMERIC(18,2) GENERATED ALWAYS AS ((payload->>'indexed_number_2')::numeric) STORED,
+  indexed_number_3 NUMERIC(18,2) GENERATED ALWAYS AS ((payload->>'indexed_number_3')::numeric) STORED,
+
+  indexed_text_array_1 TEXT[] GENERATED ALWAYS AS (jsonb_text_array(payload->'indexed_text_array_1')) STORED,
+  indexed_text_array_2 TEXT[] GENERATED ALWAYS AS (jsonb_text_array(payload->'indexed_text_array_2')) STORED,
+  indexed_text_array_3 TEXT[] GENERATED ALWAYS AS (jsonb_text_array(payload->'indexed_text_array_3')) STORED,
+
+  indexed_boolean_1 BOOLEAN GENERATED ALWAYS AS ((payload->>'indexed_boolean_1')::boolean) STORED,
+  indexed_boolean_2 BOOLEAN GENERATED ALWAYS AS ((payload->>'indexed_boolean_2')::boolean) STORED,
+  indexed_boolean_3 BOOLEAN GENERATED ALWAYS AS ((payload->>'indexed_boolean_3')::boolean) STORED
+);
@@ -7,9 +7,16 @@ CREATE TABLE IF NOT EXISTS bench.results (
   variant         TEXT        NOT NULL,
   run_no          INT         NOT NULL,
   query_sql       TEXT        NOT NULL,
-  plan_json       JSONB       NOT NULL,
+  timing_mode     TEXT        NOT NULL DEFAULT 'explain',  -- 'explain' | 'both' | 'client'
+  plan_mode       TEXT        NOT NULL DEFAULT 'simple',   -- 'simple' | 'custom' | 'generic' (prepared)
+  cache_mode      TEXT        NOT NULL DEFAULT 'hot',      -- 'hot' | 'evicted' | 'os_cold'
+  shape_hash      TEXT,                   -- bench.plan_shapes; NULL for client-timed rows
+  node_actuals    JSONB,                  -- per-node run values, bench.plan_actuals
   planning_ms     NUMERIC,
-  execution_ms    NUMERIC,
+  execution_ms    NUMERIC,                -- EXPLAIN (ANALYZE, BUFFERS) execution time
+  timing_off_ms   NUMERIC,                -- EXPLAIN (ANALYZE, TIMING OFF) execution time
+  wall_ms         NUMERIC,                -- raw query, server clock_timestamp() delta
+  client_ms       NUMERIC,                -- raw query + fetch, client wall clock
   actual_rows     BIGINT,
   shared_hits     BIGINT,
   shared_reads    BIGINT,
@@ -17,5 +24,221 @@ CREATE TABLE IF NOT EXISTS bench.results (
   shared_written  BIGINT,
   temp_reads      BIGINT,
   temp_writes     BIGINT,
+  io_read_ms      NUMERIC,                -- shared I/O read time (track_io_timing)
+  serialize_ms    NUMERIC,                -- EXPLAIN (SERIALIZE, PG17+): output conversion, incl. detoast;
+  output_kb       NUMERIC,                --   part of execution_ms; output volume
+  serialize_blocks BIGINT,                --   shared blocks hit + read while serializing (TOAST)
+  wal_bytes       BIGINT,                 -- write scenarios (bench.run_write): WAL insert LSN delta
+  wal_records     BIGINT,                 --   EXPLAIN (WAL) records
+  wal_fpi         BIGINT,                 --   EXPLAIN (WAL) full-page images
+  rows_written    BIGINT,                 --   tuples inserted + updated + deleted
+  hot_updates     BIGINT,                 --   of which HOT updates
+  index_growth_bytes BIGINT,              --   growth of the tables' indexes during the run
+  selectivity     NUMERIC,                -- actual_rows / bench.dataset.rows
+  params          JSONB,                  -- scenario params bound into query_sql
+  sweep_point     TEXT,                   -- bench.scenarios.sweep point (NULL = default params)
+  dataset_fp      TEXT,                   -- bench.dataset.fingerprint at run time
   notes           TEXT
-);
\ No newline at end of file
+);
+
+-- Every plan node of every recorded run, flattened (bench.extract_plan_nodes,
+-- from bench.plan_shapes + bench.results.node_actuals). Times are per node
+-- over all its loops; self_* = the node minus its direct children, i.e.
+-- what the node itself spent. Buffers count shared blocks hit / read.
+CREATE TABLE IF NOT EXISTS bench.plan_nodes (
+  result_id        BIGINT  NOT NULL REFERENCES bench.results(id) ON DELETE CASCADE,
+  node_no          INT     NOT NULL,   -- depth-first, 1 = top node (bench.plan_node_list)
+  parent_no        INT,
+  depth            INT     NOT NULL,
+  label            TEXT    NOT NULL,
+  variant          TEXT    NOT NULL,
+  run_no           INT     NOT NULL,
+  node_type        TEXT    NOT NULL,
+  relation_name    TEXT,
+  index_name       TEXT,
+  est_rows         NUMERIC,            -- "Plan Rows" (per loop)
+  actual_rows      NUMERIC,            -- "Actual Rows" (per loop)
+  loops            NUMERIC,
+  total_ms         NUMERIC,            -- "Actual Total Time" x loops
+  self_ms          NUMERIC,
+  shared_hits      BIGINT,
+  shared_reads     BIGINT,
+  self_shared_hits  BIGINT,
+  self_shared_reads BIGINT,
+  temp_blocks      BIGINT,             -- temp blocks read + written
+  exact_heap_blocks BIGINT,            -- bitmap heap scans
+  lossy_heap_blocks BIGINT,
+  rows_removed_by_filter  NUMERIC,
+  rows_removed_by_recheck NUMERIC,
+  PRIMARY KEY (result_id, node_no)
+);
+
+-- Server-side counters around one benchmark step (bench.stat_snapshot deltas):
+-- a bench.run / bench.run_write call, or one load_bench.py phase. The step's
+-- backends carry application_name 'bench:<id>', which is how the wait-event
+-- sampler (server_stats.py) attributes its samples to bench.wait_samples.
+--   stmt_* / shared_* / temp_* / wal_*  pg_stat_statements of the step's statement
+--                                       (all executions: warmups and runs)
+--   heap_* / idx_* / toast_*            pg_statio_user_tables/_indexes of the dataset
+--                                       and dimension tables
+--   io_*                                pg_stat_io, all backend types
+CREATE TABLE IF NOT EXISTS bench.run_stats (
+  id              BIGSERIAL PRIMARY KEY,
+  ts              TIMESTAMPTZ NOT NULL DEFAULT now(),
+  source          TEXT        NOT NULL,   -- 'run' | 'run_write' | 'load'
+  label           TEXT        NOT NULL,
+  variant         TEXT        NOT NULL,
+  plan_mode       TEXT,                   -- as bench.results; NULL for load phases
+  cache_mode      TEXT,
+  sweep_point     TEXT,
+  query_id        BIGINT,                 -- pg_stat_statements queryid
+  elapsed_ms      NUMERIC,
+  stmt_calls      BIGINT,
+  stmt_rows       BIGINT,
+  stmt_exec_ms    NUMERIC,
+  shared_blks_hit      BIGINT,
+  shared_blks_read     BIGINT,
+  shared_blks_dirtied  BIGINT,
+  shared_blks_written  BIGINT,
+  shared_blk_read_ms   NUMERIC,           -- track_io_timing
+  shared_blk_write_ms  NUMERIC,
+  temp_blks_read  BIGINT,
+  temp_blks_written BIGINT,
+  wal_records     BIGINT,
+  wal_fpi         BIGINT,
+  wal_bytes       NUMERIC,
+  heap_blks_read  BIGINT,
+  heap_blks_hit   BIGINT,
+  idx_blks_read   BIGINT,
+  idx_blks_hit    BIGINT,
+  toast_blks_read BIGINT,
+  toast_blks_hit  BIGINT,
+  io_reads        BIGINT,
+  io_read_ms      NUMERIC,
+  io_writes       BIGINT,
+  io_write_ms     NUMERIC,
+  io_extends      BIGINT,
+  io_hits         BIGINT,
+  io_evictions    BIGINT,
+  io_fsyncs       BIGINT
+);
+
+-- pg_stat_activity samples of the backends of one bench.run_stats step,
+-- counted per wait event ('CPU' = active without a wait event).
+CREATE TABLE IF NOT EXISTS bench.wait_samples (
+  stat_id          BIGINT  NOT NULL REFERENCES bench.run_stats(id) ON DELETE CASCADE,
+  wait_event_type  TEXT    NOT NULL,
+  wait_event       TEXT    NOT NULL,
+  samples          BIGINT  NOT NULL,
+  interval_ms      NUMERIC NOT NULL,    -- sampling interval
+  PRIMARY KEY (stat_id, wait_event_type, wait_event)
+);
+
+-- Distinct plan shapes of the recorded runs. A shape is the EXPLAIN plan tree
+-- without anything a run measures or the planner estimates (bench.plan_skeleton):
+-- node types, relations, indexes, join types, strategies, keys and conditions.
+-- bench.results keeps only its hash plus the per-node values of each run
+-- (bench.plan_actuals); bench.plan_json puts a full plan back together.
+CREATE TABLE IF NOT EXISTS bench.plan_shapes (
+  shape_hash  TEXT        PRIMARY KEY,    -- md5 of the skeleton's jsonb text
+  node_count  INT         NOT NULL,
+  node_types  TEXT        NOT NULL,       -- depth-first, 'Limit > Sort > Bitmap Heap Scan > ...'
+  indexes     TEXT[]      NOT NULL,       -- bench.plan_indexes
+  joins       TEXT[]      NOT NULL,       -- bench.plan_joins
+  shape       JSONB       NOT NULL,       -- the skeleton (top-level Plan node)
+  first_seen  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- The dataset currently loaded in inv_rel/inv_jsonb (single row),
+-- written by bench.seed_both / seed_copy.py via bench.record_dataset.
+--   seed NULL   = legacy random() generator; fingerprint is unique per seeding
+--   seed NOT NULL = hash-derived values; same (rows, seed) => same fingerprint
+--   doc_kb      = KiB of bench.doc_extra bulk per document (0 = default shape)
+--   toast_compression = default_toast_compression while seeding (NULL = server default)
+CREATE TABLE IF NOT EXISTS bench.dataset (
+  singleton   BOOLEAN     PRIMARY KEY DEFAULT true CHECK (singleton),
+  rows        BIGINT      NOT NULL,
+  seed        BIGINT,
+  generator   TEXT        NOT NULL,     -- 'seed_both' | 'seed_copy'
+  fingerprint TEXT        NOT NULL,
+  seeded_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+  doc_kb      INT         NOT NULL DEFAULT 0,
+  toast_compression TEXT
+);
+
+-- Scenario catalog (registered in 06_queries_bench.sql via
+-- bench.register_scenario). queries maps label key -> SQL template
+-- with {{name}} placeholders bound from params (bench.render_sql).
+-- sweep lists extra parameter sets, each {"point": "<tag>", <param>: <value>, ...},
+-- run on top of params when bench.run_suite_for_size(..., p_sweep => true).
+CREATE TABLE IF NOT EXISTS bench.scenarios (
+  variant              TEXT    PRIMARY KEY,    -- e.g. 'S1_expr_eq_num'
+  ord                  INT     NOT NULL,       -- run / plot order
+  kind                 TEXT    NOT NULL DEFAULT 'read'
+                       CHECK (kind IN ('read', 'write')),  -- write: bench.run_write
+  family               TEXT    NOT NULL,       -- chart panel, e.g. 'S1'
+  title                TEXT    NOT NULL,
+  description          TEXT,
+  queries              JSONB   NOT NULL,       -- {"jsonb_indexed": "SELECT ...", ...}
+  params               JSONB   NOT NULL DEFAULT '{}',
+  sweep                JSONB   NOT NULL DEFAULT '[]',  -- [{"point": "p3", "prefix": "INV%"}, ...]
+  expected_selectivity NUMERIC,                -- matched fraction of N (NULL = depends on N)
+  enabled              BOOLEAN NOT NULL DEFAULT true
+);
+
+-- Parked datasets (bench.snapshot_park / bench.snapshot_restore):
+-- seeded + indexed inv_rel/inv_jsonb pairs kept in schema_name.
+CREATE TABLE IF NOT EXISTS bench.snapshots (
+  rows        BIGINT      NOT NULL,
+  seed        BIGINT      NOT NULL,
+  schema_name TEXT        NOT NULL UNIQUE,
+  generator   TEXT        NOT NULL,
+  fingerprint TEXT        NOT NULL,
+  seeded_at   TIMESTAMPTZ NOT NULL,
+  parked_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (rows, seed)
+);
+
+-- Index builds (index_build.py): one row per (index, build mode) per run,
+-- each index dropped and rebuilt on its own at the loaded N.
+CREATE TABLE IF NOT EXISTS bench.index_builds (
+  id              BIGSERIAL PRIMARY KEY,
+  ts              TIMESTAMPTZ NOT NULL DEFAULT now(),
+  rows            BIGINT      NOT NULL,   -- bench.dataset.rows
+  dataset_fp      TEXT,
+  table_name      TEXT        NOT NULL,
+  index_name      TEXT        NOT NULL,
+  index_method    TEXT        NOT NULL,   -- btree | gin | ...
+  build_mode      TEXT        NOT NULL,   -- 'plain' | 'concurrent'
+  maintenance_work_mem TEXT   NOT NULL,
+  build_ms        NUMERIC     NOT NULL,
+  size_bytes      BIGINT      NOT NULL,   -- pg_relation_size after the build
+  temp_files      BIGINT,                 -- sort spill (pg_stat_database delta)
+  temp_bytes      BIGINT,
+  index_def       TEXT        NOT NULL
+);
+
+-- Concurrent load runs (load_bench.py): one row per
+-- (label, variant, arrival mode, clients, target rate) phase.
+CREATE TABLE IF NOT EXISTS bench.load_results (
+  id              BIGSERIAL PRIMARY KEY,
+  ts              TIMESTAMPTZ NOT NULL DEFAULT now(),
+  label           TEXT        NOT NULL,
+  variant         TEXT        NOT NULL,
+  arrival_mode    TEXT        NOT NULL,   -- 'closed' | 'open'
+  clients         INT         NOT NULL,
+  target_qps      NUMERIC,                -- open loop only
+  duration_s      NUMERIC     NOT NULL,
+  completed       BIGINT      NOT NULL,
+  errors          BIGINT      NOT NULL DEFAULT 0,
+  dropped         BIGINT      NOT NULL DEFAULT 0,  -- open-loop arrivals never served
+  qps             NUMERIC,
+  mean_ms         NUMERIC,
+  p50_ms          NUMERIC,
+  p95_ms          NUMERIC,
+  p99_ms          NUMERIC,
+  max_ms          NUMERIC,
+  histogram       JSONB,                  -- {bucket upper edge ms: count}
+  stat_id         BIGINT,                 -- bench.run_stats of the phase
+  notes           TEXT
+);
@@ -1,14 +1,379 @@
 \set ON_ERROR_STOP on
 
+-- ===========================================================
+-- bench.drop_routines(name)  RETURNS void
+--
+-- Drops every overload of bench.<name>. Called before a
+-- routine whose signature changed is re-created, so that
+-- re-applying these files never leaves an older overload
+-- behind (which would make positional calls ambiguous).
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.drop_routines(p_name TEXT) RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  r RECORD;
+BEGIN
+  FOR r IN
+    SELECT p.oid::regprocedure AS sig, p.prokind
+    FROM pg_proc p
+    WHERE p.pronamespace = 'bench'::regnamespace
+      AND p.proname = p_name
+  LOOP
+    EXECUTE format('DROP %s %s',
+                   CASE r.prokind WHEN 'p' THEN 'PROCEDURE' ELSE 'FUNCTION' END,
+                   r.sig);
+  END LOOP;
+END;
+$$;
+
+-- ===========================================================
+-- bench.hash_u31(seed, n, stream)  RETURNS bigint in [0, 2^31-1)
+--
+-- Deterministic hash used by the dataset generators: three
+-- xorshift + Lehmer-multiplier rounds modulo the Mersenne prime
+-- 2^31-1. Plain bigint arithmetic (no hashtext/random), so
+-- seed_copy.py reproduces it bit for bit. 'stream' separates the
+-- independent values derived from one row number.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.mix31(x BIGINT) RETURNS BIGINT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$ SELECT ((x # (x >> 16)) * 48271 + 12345) % 2147483647 $$;
+
+CREATE OR REPLACE FUNCTION bench.hash_u31(p_seed BIGINT, p_n BIGINT, p_stream BIGINT)
+RETURNS BIGINT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$
+  SELECT bench.mix31(bench.mix31(bench.mix31(
+           ((p_n % 2147483647) * 1000003
+            + (p_stream % 2147483647) * 7919
+            + ((p_seed % 2147483647) + 2147483647) % 2147483647) % 2147483647)))
+$$;
+
+-- ===========================================================
+-- bench.doc_extra(seed, n, kb)  RETURNS jsonb
+--
+-- Bulk added to document n for large-document datasets
+-- (bench.seed_both / seed_copy.py --doc-kb): about kb KiB of
+--   customer  nested object (id, address.street, address.zip)
+--   lines     array of kb*6 line objects (line, sku, qty, memo)
+--   notes     kb*64 words from a 16-word vocabulary
+-- The md5 memos do not compress; the notes and the repeated
+-- line keys do, so pglz / lz4 have realistic work. NULL for
+-- kb = 0. seed_copy.doc_extra_text reproduces it exactly.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.doc_extra(p_seed BIGINT, p_n BIGINT, p_kb INT) RETURNS JSONB
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS
+$$
+  SELECT CASE WHEN COALESCE(p_kb, 0) > 0 THEN jsonb_build_object(
+    'customer', jsonb_build_object(
+      'id', 'C' || to_char(bench.hash_u31(p_seed, p_n, 40) % 1000000, 'FM000000'),
+      'address', jsonb_build_object(
+        'street', md5(format('%s:%s:street', p_seed, p_n)),
+        'zip', to_char(bench.hash_u31(p_seed, p_n, 41) % 100000, 'FM00000'))),
+    'lines', (SELECT jsonb_agg(jsonb_build_object(
+                       'line', i,
+                       'sku', 'SKU' || to_char(bench.hash_u31(p_seed, p_n, 100 + i) % 100000, 'FM00000'),
+                       'qty', 1 + bench.hash_u31(p_seed, p_n, 100 + i) % 50,
+                       'memo', md5(format('%s:%s:l%s', p_seed, p_n, i))) ORDER BY i)
+              FROM generate_series(1, p_kb * 6) AS i),
+    'notes', (SELECT string_agg((ARRAY['invoice','payment','overdue','settled','customer','account',
+                                       'review','pending','approved','rejected','transfer','balance',
+                                       'credit','debit','refund','ledger'])
+                                  [bench.hash_u31(p_seed, p_n, 1000000 + i) % 16 + 1], ' ' ORDER BY i)
+              FROM generate_series(1, p_kb * 64) AS i)) END
+$$;
+
+-- ===========================================================
+-- bench.dimension_tables()  RETURNS SETOF (name, rows)
+-- Dimension tables of the join scenarios (03_schema_dimensions.sql)
+-- and their row counts; filled by bench.seed_dimensions.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.dimension_tables(OUT name TEXT, OUT rows BIGINT)
+RETURNS SETOF RECORD
+LANGUAGE sql IMMUTABLE AS
+$$ VALUES ('dim_customer_1k', 1000::bigint), ('dim_customer_100k', 100000), ('dim_customer_1m', 1000000) $$;
+
+-- ===========================================================
+-- bench.record_dataset(rows, seed, generator, doc_kb, compression)
+--   RETURNS text
+--
+-- Stores the loaded dataset in bench.dataset and returns its
+-- fingerprint. Seeded datasets are a pure function of
+-- (generator version, rows, seed), so the fingerprint is too;
+-- both seeders share it because they produce identical rows.
+-- Large-document options (p_doc_kb > 0, bench.doc_extra) and
+-- the TOAST compression are part of the fingerprint; the
+-- default shape keeps its fingerprints.
+-- Unseeded (random) datasets get a fingerprint that is unique
+-- per seeding.
+-- ===========================================================
+SELECT bench.drop_routines('record_dataset');
+
+CREATE OR REPLACE FUNCTION bench.record_dataset(p_rows BIGINT, p_seed BIGINT, p_generator TEXT,
+                                                p_doc_kb INT DEFAULT 0, p_compression TEXT DEFAULT NULL)
+RETURNS TEXT
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  v_fp TEXT;
+BEGIN
+  v_fp := CASE
+            WHEN p_seed IS NULL
+              THEN 'random-' || left(md5(format('%s|%s', p_rows, clock_timestamp())), 12)
+            WHEN COALESCE(p_doc_kb, 0) = 0 AND p_compression IS NULL
+              THEN 'h31v1-' || left(md5(format('h31v1|%s|%s', p_rows, p_seed)), 12)
+            ELSE 'h31v1-' || left(md5(format('h31v1|%s|%s|doc%s|%s', p_rows, p_seed,
+                                             COALESCE(p_doc_kb, 0), COALESCE(p_compression, 'default'))), 12)
+          END;
+  INSERT INTO bench.dataset (singleton, rows, seed, generator, fingerprint, seeded_at,
+                             doc_kb, toast_compression)
+  VALUES (true, p_rows, p_seed, p_generator, v_fp, now(), COALESCE(p_doc_kb, 0), p_compression)
+  ON CONFLICT (singleton) DO UPDATE
+    SET rows = EXCLUDED.rows, seed = EXCLUDED.seed, generator = EXCLUDED.generator,
+        fingerprint = EXCLUDED.fingerprint, seeded_at = EXCLUDED.seeded_at,
+        doc_kb = EXCLUDED.doc_kb, toast_compression = EXCLUDED.toast_compression;
+  RETURN v_fp;
+END;
+$$;
+
+-- ===========================================================
+-- bench.dataset_checksum()  RETURNS text
+--
+-- Content checksum of the dataset tables (bench.dataset_tables;
+-- order-independent sum of per-row hashes, one full scan of each
+-- table). Use it
+-- to verify that two seedings with the same fingerprint are
+-- really identical. Timestamps are hashed in their text form,
+-- so compare checksums taken with the same TimeZone setting.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.dataset_checksum() RETURNS TEXT
+LANGUAGE plpgsql STABLE AS
+$$
+DECLARE
+  t     TEXT;
+  v_sum TEXT;
+  v_all TEXT[] := '{}';
+BEGIN
+  FOREACH t IN ARRAY bench.dataset_tables() LOOP
+    EXECUTE format('SELECT count(*) || '':'' || COALESCE(sum(hashtextextended(x::text, 0)::numeric), 0)
+                    FROM public.%I x', t)
+    INTO v_sum;
+    v_all := v_all || v_sum;
+  END LOOP;
+  RETURN md5(array_to_string(v_all, '|'));
+END;
+$$;
+
+-- ===========================================================
+-- bench.query_id(sql)  RETURNS bigint
+-- pg_stat_statements queryid of a statement, from
+-- EXPLAIN (VERBOSE) without running it; NULL when
+-- compute_query_id is off.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.query_id(p_sql TEXT) RETURNS BIGINT
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  j JSON;
+BEGIN
+  EXECUTE 'EXPLAIN (VERBOSE, FORMAT JSON) ' || p_sql INTO j;
+  RETURN NULLIF(((j::jsonb)->0)->>'Query Identifier', '')::bigint;
+END;
+$$;
+
+-- ===========================================================
+-- bench.stat_snapshot(query_id=NULL)  RETURNS jsonb
+--
+-- Cumulative server counters, named as the bench.run_stats
+-- columns; the difference of two snapshots (bench.stat_delta)
+-- is what happened in between:
+--   stmt_* / shared_* / temp_* / wal_*
+--       pg_stat_statements of p_query_id in this database
+--       (left out without the extension / preload)
+--   heap_* / idx_* / toast_*
+--       pg_statio_user_tables/_indexes counters of the dataset
+--       and dimension tables (TOAST: table + its index), plus
+--       this backend's not yet flushed ones (pg_stat_get_xact_*),
+--       so deltas inside one transaction count its own reads
+--   io_*
+--       pg_stat_io over all backend types. A backend reports its
+--       own I/O there when it goes idle, so inside a running
+--       CALL these deltas are the other processes' (checkpointer,
+--       background writer, autovacuum, concurrent clients).
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.stat_snapshot(p_query_id BIGINT DEFAULT NULL) RETURNS JSONB
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  v_snap JSONB;
+  v_stmt JSONB := '{}';
+BEGIN
+  -- statistics views are cached per transaction (stats_fetch_consistency)
+  PERFORM pg_stat_clear_snapshot();
+
+  WITH t AS (
+    SELECT c.oid, c.reltoastrelid
+    FROM pg_class c
+    WHERE c.relnamespace = 'public'::regnamespace
+      AND c.relname = ANY(bench.dataset_tables() || ARRAY(SELECT name FROM bench.dimension_tables()))
+  ), rel AS (
+    SELECT 'heap' AS kind, t.oid FROM t
+    UNION ALL
+    SELECT 'idx', x.indexrelid FROM pg_index x JOIN t ON x.indrelid = t.oid
+    UNION ALL
+    SELECT 'toast', t.reltoastrelid FROM t WHERE t.reltoastrelid <> 0
+    UNION ALL
+    SELECT 'toast', x.indexrelid FROM pg_index x JOIN t ON x.indrelid = t.reltoastrelid
+  ), b AS (
+    SELECT kind,
+           sum(pg_stat_get_blocks_fetched(oid) + pg_stat_get_xact_blocks_fetched(oid)) AS fetched,
+           sum(pg_stat_get_blocks_hit(oid) + pg_stat_get_xact_blocks_hit(oid)) AS hit
+    FROM rel
+    GROUP BY kind
+  )
+  SELECT COALESCE(jsonb_object_agg(kind || '_blks_read', fetched - hit)
+                  || jsonb_object_agg(kind || '_blks_hit', hit), '{}')
+  INTO v_snap
+  FROM b;
+
+  SELECT v_snap || jsonb_build_object(
+           'io_reads',     COALESCE(sum(reads), 0),
+           'io_read_ms',   COALESCE(sum(read_time), 0),
+           'io_writes',    COALESCE(sum(writes), 0),
+           'io_write_ms',  COALESCE(sum(write_time), 0),
+           'io_extends',   COALESCE(sum(extends), 0),
+           'io_hits',      COALESCE(sum(hits), 0),
+           'io_evictions', COALESCE(sum(evictions), 0),
+           'io_fsyncs',    COALESCE(sum(fsyncs), 0))
+  INTO v_snap
+  FROM pg_stat_io;
+
+  IF p_query_id IS NOT NULL
+     AND to_regclass('public.pg_stat_statements') IS NOT NULL
+     AND current_setting('shared_preload_libraries') ~ '\mpg_stat_statements\M' THEN
+    SELECT jsonb_build_object(
+             'stmt_calls',          COALESCE(sum(calls), 0),
+             'stmt_rows',           COALESCE(sum(rows), 0),
+             'stmt_exec_ms',        COALESCE(sum(total_exec_time), 0),
+             'shared_blks_hit',     COALESCE(sum(shared_blks_hit), 0),
+             'shared_blks_read',    COALESCE(sum(shared_blks_read), 0),
+             'shared_blks_dirtied', COALESCE(sum(shared_blks_dirtied), 0),
+             'shared_blks_written', COALESCE(sum(shared_blks_written), 0),
+             'shared_blk_read_ms',  COALESCE(sum(shared_blk_read_time), 0),
+             'shared_blk_write_ms', COALESCE(sum(shared_blk_write_time), 0),
+             'temp_blks_read',      COALESCE(sum(temp_blks_read), 0),
+             'temp_blks_written',   COALESCE(sum(temp_blks_written), 0),
+             'wal_records',         COALESCE(sum(wal_records), 0),
+             'wal_fpi',             COALESCE(sum(wal_fpi), 0),
+             'wal_bytes',           COALESCE(sum(wal_bytes), 0))
+    INTO v_stmt
+    FROM public.pg_stat_statements(false) ss   -- without query texts
+    WHERE ss.queryid = p_query_id
+      AND ss.dbid = (SELECT oid FROM pg_database WHERE datname = current_database());
+  END IF;
+
+  RETURN v_snap || v_stmt;
+END;
+$$;
+
+-- ===========================================================
+-- bench.stat_delta(before, after)  RETURNS jsonb
+-- Per-key difference of two bench.stat_snapshot values.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.stat_delta(p_before JSONB, p_after JSONB) RETURNS JSONB
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT COALESCE(jsonb_object_agg(a.key, a.value::numeric - COALESCE((p_before->>a.key)::numeric, 0)), '{}')
+  FROM jsonb_each_text(p_after) AS a
+$$;
+
+-- ===========================================================
+-- bench.record_stats(id, source, label, variant, query_id,
+--                    before, after, elapsed_ms, plan_mode=NULL,
+--                    cache_mode=NULL, point=NULL)  RETURNS void
+-- Stores one bench.run_stats row: the snapshot delta of a
+-- step whose id was drawn (and tagged) beforehand.
+-- ===========================================================
+SELECT bench.drop_routines('record_stats');
+
+CREATE OR REPLACE FUNCTION bench.record_stats(
+  p_id         BIGINT,
+  p_source     TEXT,
+  p_label      TEXT,
+  p_variant    TEXT,
+  p_query_id   BIGINT,
+  p_before     JSONB,
+  p_after      JSONB,
+  p_elapsed_ms NUMERIC,
+  p_plan_mode  TEXT DEFAULT NULL,
+  p_cache_mode TEXT DEFAULT NULL,
+  p_point      TEXT DEFAULT NULL
+) RETURNS VOID
+LANGUAGE sql AS
+$$
+  INSERT INTO bench.run_stats
+  SELECT *
+  FROM jsonb_populate_record(NULL::bench.run_stats,
+         bench.stat_delta(p_before, p_after)
+         || jsonb_build_object('id', p_id, 'ts', clock_timestamp(), 'source', p_source,
+                               'label', p_label, 'variant', p_variant,
+                               'plan_mode', p_plan_mode, 'cache_mode', p_cache_mode,
+                               'sweep_point', p_point, 'query_id', p_query_id,
+                               'elapsed_ms', round(p_elapsed_ms, 3)))
+$$;
+
 -- ===========================================================
 -- bench.run(label, variant, sql, runs=30, warmup=2,
---           seqscan=NULL, jit=NULL)  RETURNS void
+--           seqscan=NULL, jit=NULL, timing='explain',
+--           params=NULL, point=NULL,
+--           plan_mode='simple', args=NULL,
+--           cache='hot', first_run=1)  RETURNS void
 --
 -- Executes the given SQL with:
---   EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+--   EXPLAIN (ANALYZE, BUFFERS, SERIALIZE, FORMAT JSON)
+-- SERIALIZE (PG17+) converts every result row to its text output
+-- form as a client fetch would, so projected JSONB values are
+-- detoasted inside execution_ms; serialize_ms / output_kb /
+-- serialize_blocks record that part (NULL on older servers).
 -- Warmups are not recorded. Each recorded run is inserted
--- into bench.results with timing + buffer metrics + plan JSON.
+-- into bench.results with timing + buffer metrics, its plan
+-- shape (bench.plan_shape) + per-node values (bench.plan_actuals)
+-- and the fingerprint of the loaded dataset (bench.dataset).
+-- selectivity = actual_rows / bench.dataset.rows; p_params and
+-- p_point (the sweep point, NULL for the scenario defaults) are
+-- stored as given.
+-- Server-side counters of the whole call (warmups included) go
+-- to bench.run_stats (bench.stat_snapshot delta); meanwhile the
+-- backend's application_name is 'bench:<run_stats id>'.
+--
+-- p_timing:
+--   'explain' - instrumented run only (execution_ms)
+--   'both'    - additionally, per recorded run:
+--                 timing_off_ms = EXPLAIN (ANALYZE, TIMING OFF) execution time
+--                 wall_ms       = raw query (no EXPLAIN), server-side
+--                                 clock_timestamp() delta; includes planning,
+--                                 excludes output conversion (rows discarded)
+--               so per-node timing overhead can be quantified and removed.
+--
+-- p_plan_mode:
+--   'simple'  - p_sql is planned and executed on every run (dynamic SQL)
+--   'custom'  - p_sql (with $1..$n, see bench.prepare_sql) is PREPAREd once
+--   'generic'   and each run EXPLAINs EXECUTE stmt(p_args) under
+--               plan_cache_mode = force_custom_plan / force_generic_plan,
+--               so planning_ms is what a prepared statement pays per call.
+--
+-- p_cache:
+--   'hot'     - runs after the warmups, data wherever it already is
+--   'evicted' - dataset tables/indexes evicted from shared_buffers
+--               (bench.evict_buffers) before every measured execution;
+--               reads then come from the OS page cache
+--   'os_cold' - as 'evicted', for callers that also dropped the OS page
+--               cache just before (cold_cache.py); one run per call, so
+--               p_runs must be 1 and p_first_run numbers it
 -- ===========================================================
+SELECT bench.drop_routines('run');
+
 CREATE OR REPLACE FUNCTION bench.run(
   p_label   TEXT,
   p_variant TEXT,
@@ -16,13 +381,21 @@ CREATE OR REPLACE FUNCTION bench.run(
   p_runs    INT DEFAULT 30,
   p_warmup  INT DEFAULT 2,
   p_seqscan BOOLEAN DEFAULT NULL,
-  p_jit     BOOLEAN DEFAULT NULL
+  p_jit     BOOLEAN DEFAULT NULL,
+  p_timing  TEXT    DEFAULT 'explain',
+  p_params  JSONB   DEFAULT NULL,
+  p_point   TEXT    DEFAULT NULL,
+  p_plan_mode TEXT  DEFAULT 'simple',
+  p_args    TEXT    DEFAULT NULL,    -- EXECUTE arguments (SQL literals, comma-separated)
+  p_cache   TEXT    DEFAULT 'hot',
+  p_first_run INT   DEFAULT 1
 ) RETURNS VOID
 LANGUAGE plpgsql AS
 $$
 DECLARE
   i           INT;
   j           JSON;     -- EXPLAIN output (FORMAT JSON)
+  j_off       JSON;     -- EXPLAIN (TIMING OFF) output
   root        JSONB;    -- top-level JSONB object
   root_plan   JSONB;    -- top-level Plan node
   v_planning  NUMERIC;
@@ -34,7 +407,35 @@ DECLARE
   v_write     BIGINT;
   v_tmp_r     BIGINT;
   v_tmp_w     BIGINT;
+  v_io_read   NUMERIC;
+  v_off       NUMERIC;
+  v_wall      NUMERIC;
+  t0          TIMESTAMPTZ;
+  v_fp        TEXT;
+  v_n         BIGINT;   -- rows in the loaded dataset
+  v_sql       TEXT := p_sql;   -- statement actually run
+  v_pcm       TEXT;            -- plan_cache_mode before this call
+  v_stat_id   BIGINT;          -- bench.run_stats row of this call
+  v_qid       BIGINT;
+  v_stats     JSONB;
+  v_app       TEXT;
+  t_stat      TIMESTAMPTZ;
+  v_ser       TEXT := CASE WHEN current_setting('server_version_num')::int >= 170000
+                           THEN ', SERIALIZE' ELSE '' END;
 BEGIN
+  IF p_timing NOT IN ('explain', 'both') THEN
+    RAISE EXCEPTION 'bench.run: unknown timing mode % (expected explain|both)', p_timing;
+  END IF;
+  IF p_plan_mode NOT IN ('simple', 'custom', 'generic') THEN
+    RAISE EXCEPTION 'bench.run: unknown plan mode % (expected simple|custom|generic)', p_plan_mode;
+  END IF;
+  IF p_cache NOT IN ('hot', 'evicted', 'os_cold') THEN
+    RAISE EXCEPTION 'bench.run: unknown cache mode % (expected hot|evicted|os_cold)', p_cache;
+  END IF;
+  IF p_cache = 'os_cold' AND (p_runs <> 1 OR p_timing <> 'explain') THEN
+    RAISE EXCEPTION 'bench.run: os_cold takes one explain run per call (the caller drops the OS cache)';
+  END IF;
+
   -- Session-local toggles (optional)
   IF p_seqscan IS NOT NULL THEN
     EXECUTE format('SET LOCAL enable_seqscan = %s',
@@ -46,14 +447,42 @@ BEGIN
                    CASE WHEN p_jit THEN 'on' ELSE 'off' END);
   END IF;
 
-  -- Warmup runs (not recorded)
+  SELECT fingerprint, rows INTO v_fp, v_n FROM bench.dataset;
+
+  -- Prepared modes: one PREPARE, then EXECUTE under a forced plan_cache_mode
+  -- (restored at the end, so later calls in the transaction are unaffected)
+  IF p_plan_mode <> 'simple' THEN
+    IF EXISTS (SELECT 1 FROM pg_prepared_statements WHERE name = 'bench_run_stmt') THEN
+      EXECUTE 'DEALLOCATE bench_run_stmt';
+    END IF;
+    v_pcm := current_setting('plan_cache_mode');
+    PERFORM set_config('plan_cache_mode',
+                       CASE p_plan_mode WHEN 'custom' THEN 'force_custom_plan'
+                                        ELSE 'force_generic_plan' END, true);
+    EXECUTE 'PREPARE bench_run_stmt AS ' || p_sql;
+    v_sql := 'EXECUTE bench_run_stmt' || COALESCE('(' || NULLIF(p_args, '') || ')', '');
+  END IF;
+
+  -- Server-side counters from here on; the tag lets the wait-event
+  -- sampler (server_stats.py) attribute this backend's samples
+  v_stat_id := nextval(pg_get_serial_sequence('bench.run_stats', 'id'));
+  v_app := current_setting('application_name');
+  PERFORM set_config('application_name', 'bench:' || v_stat_id, true);
+  v_qid := bench.query_id(v_sql);
+  v_stats := bench.stat_snapshot(v_qid);
+  t_stat := clock_timestamp();
+
+  -- Warmup runs (not recorded); in generic mode the first one builds the plan
   FOR i IN 1..GREATEST(p_warmup, 0) LOOP
-    EXECUTE 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' || p_sql INTO j;
+    EXECUTE 'EXPLAIN (ANALYZE, BUFFERS' || v_ser || ', FORMAT JSON) ' || v_sql INTO j;
   END LOOP;
 
   -- Recorded runs
   FOR i IN 1..GREATEST(p_runs, 1) LOOP
-    EXECUTE 'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' || p_sql INTO j;
+    IF p_cache <> 'hot' THEN
+      PERFORM bench.evict_buffers();
+    END IF;
+    EXECUTE 'EXPLAIN (ANALYZE, BUFFERS' || v_ser || ', FORMAT JSON) ' || v_sql INTO j;
 
     -- Parse the JSON once
     root      := (j::jsonb)->0;
@@ -70,33 +499,698 @@ BEGIN
     v_write  := COALESCE(NULLIF(root_plan->>'Shared Written Blocks','')::bigint, 0);
     v_tmp_r  := COALESCE(NULLIF(root_plan->>'Temp Read Blocks','')::bigint, 0);
     v_tmp_w  := COALESCE(NULLIF(root_plan->>'Temp Written Blocks','')::bigint, 0);
+    -- PG17 splits shared/local I/O timing; older servers report 'I/O Read Time'
+    v_io_read := COALESCE(NULLIF(root_plan->>'Shared I/O Read Time','')::numeric,
+                          NULLIF(root_plan->>'I/O Read Time','')::numeric);
+
+    v_off  := NULL;
+    v_wall := NULL;
+    IF p_timing = 'both' THEN
+      IF p_cache <> 'hot' THEN
+        PERFORM bench.evict_buffers();
+      END IF;
+      EXECUTE 'EXPLAIN (ANALYZE, TIMING OFF' || v_ser || ', FORMAT JSON) ' || v_sql INTO j_off;
+      v_off := NULLIF(((j_off::jsonb)->0)->>'Execution Time','')::numeric;
+
+      -- raw execution; result rows are discarded
+      IF p_cache <> 'hot' THEN
+        PERFORM bench.evict_buffers();
+      END IF;
+      t0 := clock_timestamp();
+      EXECUTE v_sql;
+      v_wall := 1000 * EXTRACT(epoch FROM clock_timestamp() - t0);
+    END IF;
 
     INSERT INTO bench.results (
-      label, variant, run_no, query_sql, plan_json,
-      planning_ms, execution_ms, actual_rows,
+      label, variant, run_no, query_sql, timing_mode, plan_mode, cache_mode, shape_hash, node_actuals,
+      planning_ms, execution_ms, timing_off_ms, wall_ms, actual_rows,
       shared_hits, shared_reads, shared_dirtied, shared_written,
-      temp_reads, temp_writes
+      temp_reads, temp_writes, io_read_ms, serialize_ms, output_kb, serialize_blocks,
+      selectivity, params, sweep_point, dataset_fp
     )
     VALUES (
-      p_label, p_variant, i, p_sql, j::jsonb,
-      v_planning, v_exec, v_rows,
+      p_label, p_variant, p_first_run + i - 1, p_sql, p_timing, p_plan_mode, p_cache,
+      bench.plan_shape(j::jsonb), bench.plan_actuals(j::jsonb),
+      v_planning, v_exec, v_off, v_wall, v_rows,
       v_hit, v_read, v_dirty, v_write,
-      v_tmp_r, v_tmp_w
+      v_tmp_r, v_tmp_w, v_io_read,
+      NULLIF(root->'Serialization'->>'Time','')::numeric,
+      NULLIF(root->'Serialization'->>'Output Volume','')::numeric,
+      COALESCE(NULLIF(root->'Serialization'->>'Shared Hit Blocks','')::bigint, 0)
+        + COALESCE(NULLIF(root->'Serialization'->>'Shared Read Blocks','')::bigint, 0),
+      v_rows::numeric / NULLIF(v_n, 0), p_params, p_point, v_fp
+    );
+  END LOOP;
+
+  PERFORM bench.record_stats(v_stat_id, 'run', p_label, p_variant, v_qid, v_stats,
+                             bench.stat_snapshot(v_qid),
+                             1000 * EXTRACT(epoch FROM clock_timestamp() - t_stat),
+                             p_plan_mode, p_cache, p_point);
+  PERFORM set_config('application_name', v_app, true);
+
+  IF p_plan_mode <> 'simple' THEN
+    EXECUTE 'DEALLOCATE bench_run_stmt';
+    PERFORM set_config('plan_cache_mode', v_pcm, true);
+  END IF;
+END;
+$$;
+
+-- ===========================================================
+-- bench.run_write(label, variant, sql, runs=30, warmup=2,
+--                 params=NULL)  RETURNS void
+--
+-- Write scenarios (INSERT / UPDATE / DELETE). Every execution runs
+-- inside a subtransaction that is rolled back, so the dataset (and
+-- its fingerprint) stays the same; the dead tuples and index pages
+-- it leaves behind stay too, as they would in production. Per run:
+--   execution_ms       EXPLAIN (ANALYZE, BUFFERS, WAL) execution time
+--   wal_bytes          pg_current_wal_insert_lsn() delta
+--   wal_records/fpi    from EXPLAIN (WAL)
+--   rows_written       inserted + updated + deleted tuples and
+--   hot_updates        HOT updates, from the transaction's table stats
+--   index_growth_bytes size growth of the indexes of the dataset tables
+-- Server-side counters of the whole call go to bench.run_stats,
+-- as in bench.run.
+-- ===========================================================
+SELECT bench.drop_routines('run_write');
+
+CREATE OR REPLACE FUNCTION bench.run_write(
+  p_label   TEXT,
+  p_variant TEXT,
+  p_sql     TEXT,
+  p_runs    INT   DEFAULT 30,
+  p_warmup  INT   DEFAULT 2,
+  p_params  JSONB DEFAULT NULL
+) RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  i         INT;
+  j         JSON;
+  root      JSONB;
+  root_plan JSONB;
+  v_tabs    OID[];
+  v_lsn0    PG_LSN;
+  v_wal     BIGINT;
+  v_w0      BIGINT;
+  v_w1      BIGINT;
+  v_hot0    BIGINT;
+  v_hot1    BIGINT;
+  v_idx0    BIGINT;
+  v_idx1    BIGINT;
+  v_fp      TEXT;
+  v_stat_id BIGINT;
+  v_qid     BIGINT;
+  v_stats   JSONB;
+  v_app     TEXT;
+  t_stat    TIMESTAMPTZ;
+BEGIN
+  SELECT array_agg(to_regclass(format('public.%I', t))::oid)
+  INTO v_tabs
+  FROM unnest(bench.dataset_tables()) AS t;
+  SELECT fingerprint INTO v_fp FROM bench.dataset;
+
+  v_stat_id := nextval(pg_get_serial_sequence('bench.run_stats', 'id'));
+  v_app := current_setting('application_name');
+  PERFORM set_config('application_name', 'bench:' || v_stat_id, true);
+  v_qid := bench.query_id(p_sql);
+  v_stats := bench.stat_snapshot(v_qid);
+  t_stat := clock_timestamp();
+
+  FOR i IN 1 - GREATEST(p_warmup, 0)..GREATEST(p_runs, 1) LOOP   -- i <= 0: warmup
+    BEGIN
+      SELECT sum(pg_stat_get_xact_tuples_inserted(t) + pg_stat_get_xact_tuples_updated(t)
+                 + pg_stat_get_xact_tuples_deleted(t)),
+             sum(pg_stat_get_xact_tuples_hot_updated(t))
+      INTO v_w0, v_hot0
+      FROM unnest(v_tabs) AS t;
+      SELECT COALESCE(sum(pg_relation_size(indexrelid)), 0) INTO v_idx0
+      FROM pg_index WHERE indrelid = ANY(v_tabs);
+      v_lsn0 := pg_current_wal_insert_lsn();
+
+      EXECUTE 'EXPLAIN (ANALYZE, BUFFERS, WAL, FORMAT JSON) ' || p_sql INTO j;
+
+      v_wal := pg_wal_lsn_diff(pg_current_wal_insert_lsn(), v_lsn0);
+      SELECT sum(pg_stat_get_xact_tuples_inserted(t) + pg_stat_get_xact_tuples_updated(t)
+                 + pg_stat_get_xact_tuples_deleted(t)),
+             sum(pg_stat_get_xact_tuples_hot_updated(t))
+      INTO v_w1, v_hot1
+      FROM unnest(v_tabs) AS t;
+      SELECT COALESCE(sum(pg_relation_size(indexrelid)), 0) INTO v_idx1
+      FROM pg_index WHERE indrelid = ANY(v_tabs);
+
+      RAISE SQLSTATE 'BW001';   -- roll the write back
+    EXCEPTION WHEN SQLSTATE 'BW001' THEN
+      NULL;
+    END;
+
+    CONTINUE WHEN i <= 0;
+
+    root      := (j::jsonb)->0;
+    root_plan := root->'Plan';
+    INSERT INTO bench.results (
+      label, variant, run_no, query_sql, timing_mode, shape_hash, node_actuals,
+      planning_ms, execution_ms, actual_rows,
+      shared_hits, shared_reads, shared_dirtied, shared_written,
+      temp_reads, temp_writes,
+      wal_bytes, wal_records, wal_fpi, rows_written, hot_updates, index_growth_bytes,
+      params, dataset_fp
+    )
+    VALUES (
+      p_label, p_variant, i, p_sql, 'explain', bench.plan_shape(j::jsonb), bench.plan_actuals(j::jsonb),
+      NULLIF(root->>'Planning Time','')::numeric,
+      NULLIF(root->>'Execution Time','')::numeric,
+      v_w1 - v_w0,
+      COALESCE(NULLIF(root_plan->>'Shared Hit Blocks','')::bigint, 0),
+      COALESCE(NULLIF(root_plan->>'Shared Read Blocks','')::bigint, 0),
+      COALESCE(NULLIF(root_plan->>'Shared Dirtied Blocks','')::bigint, 0),
+      COALESCE(NULLIF(root_plan->>'Shared Written Blocks','')::bigint, 0),
+      COALESCE(NULLIF(root_plan->>'Temp Read Blocks','')::bigint, 0),
+      COALESCE(NULLIF(root_plan->>'Temp Written Blocks','')::bigint, 0),
+      v_wal,
+      NULLIF(root_plan->>'WAL Records','')::bigint,
+      NULLIF(root_plan->>'WAL FPI','')::bigint,
+      v_w1 - v_w0, v_hot1 - v_hot0, v_idx1 - v_idx0,
+      p_params, v_fp
     );
   END LOOP;
+
+  PERFORM bench.record_stats(v_stat_id, 'run_write', p_label, p_variant, v_qid, v_stats,
+                             bench.stat_snapshot(v_qid),
+                             1000 * EXTRACT(epoch FROM clock_timestamp() - t_stat),
+                             'simple', 'hot');
+  PERFORM set_config('application_name', v_app, true);
+END;
+$$;
+
+-- ===========================================================
+-- bench.sql_literal(value)  RETURNS text
+-- SQL literal of one JSON param value: strings quoted, numbers
+-- and booleans as is, null as NULL, arrays/objects as quoted
+-- JSON text.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.sql_literal(p_value JSONB) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT CASE jsonb_typeof(p_value)
+           WHEN 'string'  THEN quote_literal(p_value #>> '{}')
+           WHEN 'number'  THEN p_value::text
+           WHEN 'boolean' THEN p_value::text
+           WHEN 'null'    THEN 'NULL'
+           ELSE quote_literal(p_value::text)
+         END
+$$;
+
+-- ===========================================================
+-- bench.render_sql(template, params)  RETURNS text
+--
+-- Binds every {{name}} in a scenario template to the SQL literal
+-- of params->name (bench.sql_literal). An unbound placeholder
+-- raises. scenarios.render() in Python does the same.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.render_sql(p_template TEXT, p_params JSONB DEFAULT '{}')
+RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE AS
+$$
+DECLARE
+  v_sql TEXT := p_template;
+  r     RECORD;
+BEGIN
+  FOR r IN SELECT key, value FROM jsonb_each(COALESCE(p_params, '{}'::jsonb)) LOOP
+    v_sql := replace(v_sql, '{{' || r.key || '}}', bench.sql_literal(r.value));
+  END LOOP;
+  IF v_sql ~ '\{\{\w+\}\}' THEN
+    RAISE EXCEPTION 'bench.render_sql: unbound placeholder % in: %',
+      substring(v_sql from '\{\{\w+\}\}'), p_template;
+  END IF;
+  RETURN v_sql;
+END;
+$$;
+
+-- ===========================================================
+-- bench.prepare_sql(template, params)  RETURNS (sql, args)
+--
+-- Parameterized form of a template for PREPARE: each distinct
+-- {{name}} becomes $1, $2, ... in order of first appearance
+-- (types are inferred by the server from the context), and
+-- args lists the matching SQL literals for EXECUTE stmt(args).
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.prepare_sql(p_template TEXT, p_params JSONB DEFAULT '{}',
+                                             OUT sql TEXT, OUT args TEXT)
+LANGUAGE plpgsql IMMUTABLE AS
+$$
+DECLARE
+  v_name TEXT;
+  v_lits TEXT[] := '{}';
+BEGIN
+  sql := p_template;
+  FOR v_name IN
+    SELECT m[1] FROM regexp_matches(p_template, '\{\{(\w+)\}\}', 'g') AS m
+    GROUP BY m[1] ORDER BY min(strpos(p_template, '{{' || m[1] || '}}'))
+  LOOP
+    IF NOT COALESCE(p_params, '{}'::jsonb) ? v_name THEN
+      RAISE EXCEPTION 'bench.prepare_sql: unbound placeholder {{%}} in: %', v_name, p_template;
+    END IF;
+    v_lits := v_lits || bench.sql_literal(p_params->v_name);
+    sql := replace(sql, '{{' || v_name || '}}', '$' || cardinality(v_lits));
+  END LOOP;
+  args := NULLIF(array_to_string(v_lits, ', '), '');
+END;
+$$;
+
+-- ===========================================================
+-- bench.page_params(template, params)  RETURNS jsonb
+--
+-- Pagination scenarios (L family) carry "page" (1-based) and
+-- "limit" in their params; this adds where that page starts, so
+-- each page runs as a plain read with literal bounds:
+--   offset              (page - 1) * limit
+--   after_ts, after_id  keyset cursor, only for templates using
+--                       {{after_ts}}: (ts, id) of the last row of
+--                       the previous page, taken from the same
+--                       template run from the start cursor with
+--                       limit (page - 1) * limit (not timed).
+--                       Past the end of the group the cursor is
+--                       the last row, so the page comes back empty.
+-- Page 1 keeps the start cursor of the params. Params without
+-- "page" are returned unchanged. scenarios.page_params() calls
+-- this for the Python drivers.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.page_params(p_template TEXT, p_params JSONB) RETURNS JSONB
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  v_page  INT := (p_params->>'page')::int;
+  v_limit INT := (p_params->>'limit')::int;
+  v_ts    TEXT;
+  v_id    BIGINT;
+BEGIN
+  IF v_page IS NULL THEN
+    RETURN p_params;
+  END IF;
+  IF v_page < 1 OR COALESCE(v_limit, 0) < 1 THEN
+    RAISE EXCEPTION 'bench.page_params: page must be >= 1 and limit >= 1 (got page %, limit %)',
+      v_page, v_limit;
+  END IF;
+
+  p_params := p_params || jsonb_build_object('offset', (v_page - 1) * v_limit);
+  IF v_page > 1 AND strpos(p_template, '{{after_ts}}') > 0 THEN
+    EXECUTE format('SELECT ts::text, id FROM (%s) p ORDER BY ts DESC, id DESC LIMIT 1',
+                   bench.render_sql(p_template,
+                                    p_params || jsonb_build_object('limit', (v_page - 1) * v_limit)))
+      INTO v_ts, v_id;
+    IF v_id IS NOT NULL THEN
+      p_params := p_params || jsonb_build_object('after_ts', v_ts, 'after_id', v_id);
+    END IF;
+  END IF;
+  RETURN p_params;
+END;
+$$;
+
+-- ===========================================================
+-- bench.scenario_labels(queries)  RETURNS SETOF text
+-- Label keys of a scenario in run order: jsonb_indexed,
+-- jsonb_unindexed, rel_indexed, rel_unindexed, hybrid_indexed,
+-- jsonb_gin_containment, jsonpath_exists, jsonpath_match,
+-- json_table, jsonb_payload, then any others.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.scenario_labels(p_queries JSONB) RETURNS SETOF TEXT
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT k
+  FROM jsonb_object_keys(p_queries) AS k
+  ORDER BY array_position(ARRAY['jsonb_indexed','jsonb_unindexed','rel_indexed','rel_unindexed',
+                                'hybrid_indexed','jsonb_gin_containment',
+                                'jsonpath_exists','jsonpath_match','json_table',
+                                'jsonb_payload'], k)
+           NULLS LAST, k
+$$;
+
+-- ===========================================================
+-- bench.register_scenario(variant, family, title, queries, ...)
+--
+-- Adds or replaces one catalog entry in bench.scenarios.
+-- p_ord defaults to the end of the catalog for new entries and
+-- keeps the current position for existing ones. p_sweep is a
+-- JSON array of parameter sets, each with a unique "point" tag.
+-- p_kind 'write' marks INSERT/UPDATE/DELETE scenarios, which only
+-- bench.run_write executes (rolled back).
+-- ===========================================================
+SELECT bench.drop_routines('register_scenario');
+
+CREATE OR REPLACE FUNCTION bench.register_scenario(
+  p_variant     TEXT,
+  p_family      TEXT,
+  p_title       TEXT,
+  p_queries     JSONB,
+  p_params      JSONB   DEFAULT '{}',
+  p_selectivity NUMERIC DEFAULT NULL,
+  p_description TEXT    DEFAULT NULL,
+  p_ord         INT     DEFAULT NULL,
+  p_enabled     BOOLEAN DEFAULT true,
+  p_sweep       JSONB   DEFAULT '[]',
+  p_kind        TEXT    DEFAULT 'read'
+) RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+BEGIN
+  IF jsonb_typeof(p_queries) <> 'object' OR p_queries = '{}'::jsonb THEN
+    RAISE EXCEPTION 'bench.register_scenario(%): queries must map label keys to SQL', p_variant;
+  END IF;
+  IF jsonb_typeof(COALESCE(p_sweep, '[]')) <> 'array'
+     OR EXISTS (SELECT 1 FROM jsonb_array_elements(COALESCE(p_sweep, '[]')) e
+                WHERE jsonb_typeof(e) <> 'object' OR jsonb_typeof(e->'point') IS DISTINCT FROM 'string')
+     OR (SELECT count(DISTINCT e->>'point') <> count(*)
+         FROM jsonb_array_elements(COALESCE(p_sweep, '[]')) e) THEN
+    RAISE EXCEPTION 'bench.register_scenario(%): sweep must be an array of objects with unique "point" tags', p_variant;
+  END IF;
+
+  INSERT INTO bench.scenarios AS s (variant, ord, kind, family, title, description, queries,
+                                    params, sweep, expected_selectivity, enabled)
+  VALUES (p_variant,
+          COALESCE(p_ord,
+                   (SELECT ord FROM bench.scenarios WHERE variant = p_variant),
+                   (SELECT COALESCE(max(ord), 0) + 10 FROM bench.scenarios)),
+          p_kind, p_family, p_title, p_description, p_queries,
+          COALESCE(p_params, '{}'::jsonb), COALESCE(p_sweep, '[]'::jsonb),
+          p_selectivity, p_enabled)
+  ON CONFLICT (variant) DO UPDATE
+    SET ord = EXCLUDED.ord, kind = EXCLUDED.kind, family = EXCLUDED.family, title = EXCLUDED.title,
+        description = EXCLUDED.description, queries = EXCLUDED.queries,
+        params = EXCLUDED.params, sweep = EXCLUDED.sweep,
+        expected_selectivity = EXCLUDED.expected_selectivity,
+        enabled = EXCLUDED.enabled;
+END;
+$$;
+
+-- ===========================================================
+-- bench.add_scenario_queries(variant, queries)  RETURNS void
+--
+-- Merges extra label keys into a registered scenario (same
+-- params and sweep), e.g. alternative query syntaxes kept in
+-- their own block of 06_queries_bench.sql.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.add_scenario_queries(p_variant TEXT, p_queries JSONB) RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+BEGIN
+  UPDATE bench.scenarios SET queries = queries || p_queries WHERE variant = p_variant;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'bench.add_scenario_queries: unknown scenario %', p_variant;
+  END IF;
+END;
+$$;
+
+-- ===========================================================
+-- bench.plan_indexes(plan)  RETURNS text[]
+-- Names of the indexes an EXPLAIN (FORMAT JSON) plan scans
+-- (Index / Index Only / Bitmap Index Scan nodes at any depth);
+-- empty when the plan reads no index.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.plan_indexes(p_plan JSONB) RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT COALESCE(array_agg(DISTINCT n #>> '{}' ORDER BY n #>> '{}'), '{}')
+  FROM jsonb_path_query(p_plan, 'strict $.**."Index Name"') AS n
+$$;
+
+-- ===========================================================
+-- bench.plan_joins(plan)  RETURNS text[]
+-- Join nodes of an EXPLAIN (FORMAT JSON) plan in plan order
+-- (outermost first): 'Nested Loop', 'Hash Join', 'Merge Join';
+-- empty when the plan joins nothing.
+--
+-- bench.q_error(estimated, actual)  RETURNS numeric
+-- Row-estimate error of one plan node, max(est/act, act/est)
+-- with both clamped to >= 1 (1 = exact; same for over- and
+-- underestimates). Compare per-loop "Plan Rows" with per-loop
+-- "Actual Rows".
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.plan_joins(p_plan JSONB) RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT COALESCE(array_agg(n #>> '{}'), '{}')
+  FROM jsonb_path_query(p_plan,
+         'strict $.**."Node Type" ? (@ == "Nested Loop" || @ == "Hash Join" || @ == "Merge Join")') AS n
+$$;
+
+CREATE OR REPLACE FUNCTION bench.q_error(p_est NUMERIC, p_act NUMERIC) RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE AS
+$$ SELECT GREATEST(GREATEST(p_est, 1) / GREATEST(p_act, 1), GREATEST(p_act, 1) / GREATEST(p_est, 1)) $$;
+
+-- ===========================================================
+-- Compact plan storage
+--
+-- bench.node_metric_keys()  RETURNS text[]
+-- The EXPLAIN keys kept per plan node and run, in the order of
+-- the per-node arrays of bench.plan_actuals (bench_store.py
+-- mirrors it as NODE_METRIC_KEYS). The estimates are here, not
+-- in the shape: they move with N while the shape stays put.
+--
+-- bench.plan_node_list(plan)  RETURNS SETOF (node_no, parent_no, depth, node)
+-- Every node of a plan depth-first (a node, then its children
+-- in order), numbered from 1. Takes EXPLAIN (FORMAT JSON)
+-- output, its first element or a Plan node.
+--
+-- bench.plan_skeleton(plan)  RETURNS jsonb
+-- The Plan tree without costs, estimates and everything a run
+-- measures (times, rows, loops, buffers, sort / hash / worker
+-- details): node types, relations, indexes, join types,
+-- strategies, keys and conditions. Same skeleton = same plan
+-- shape, whatever the timings or N.
+--
+-- bench.plan_actuals(plan)  RETURNS jsonb
+-- [[value per bench.node_metric_keys()], ...] per node in
+-- bench.plan_node_list order; null where a node has no value.
+--
+-- bench.plan_shape(plan)  RETURNS text
+-- md5 of the skeleton; adds it to bench.plan_shapes when new.
+--
+-- bench.node_metric(actuals, node_no, key)  RETURNS numeric
+-- One numeric value of node node_no out of plan_actuals.
+--
+-- bench.plan_json(shape_hash, actuals)  RETURNS jsonb
+-- The plan put back together: the shape with the run's values
+-- merged in, as [{"Plan": ...}]. Keys outside
+-- bench.node_metric_keys() (and the top-level Planning /
+-- Execution Time, kept in bench.results) are not restored.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.node_metric_keys() RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT ARRAY['Plan Rows', 'Total Cost',
+               'Actual Rows', 'Actual Loops', 'Actual Startup Time', 'Actual Total Time',
+               'Shared Hit Blocks', 'Shared Read Blocks', 'Shared I/O Read Time',
+               'Temp Read Blocks', 'Temp Written Blocks',
+               'Exact Heap Blocks', 'Lossy Heap Blocks', 'Heap Fetches',
+               'Rows Removed by Filter', 'Rows Removed by Index Recheck',
+               'Sort Method', 'Sort Space Used', 'Hash Batches', 'Peak Memory Usage']
+$$;
+
+CREATE OR REPLACE FUNCTION bench.plan_node_list(p_plan JSONB)
+RETURNS TABLE (node_no INT, parent_no INT, depth INT, node JSONB)
+LANGUAGE sql IMMUTABLE AS
+$$
+  WITH RECURSIVE t(path, node) AS (
+    SELECT ARRAY[1], CASE WHEN jsonb_typeof(p_plan) = 'array' THEN p_plan->0->'Plan'
+                          WHEN p_plan ? 'Plan' THEN p_plan->'Plan'
+                          ELSE p_plan END
+    UNION ALL
+    SELECT t.path || c.ord::int, c.child
+    FROM t, jsonb_array_elements(t.node->'Plans') WITH ORDINALITY AS c(child, ord)
+  ), o AS (
+    SELECT path, node, (row_number() OVER (ORDER BY path))::int AS node_no FROM t
+  )
+  SELECT o.node_no, p.node_no, cardinality(o.path) - 1, o.node
+  FROM o
+  LEFT JOIN o p ON p.path = o.path[1:cardinality(o.path) - 1]
+  ORDER BY o.node_no
+$$;
+
+CREATE OR REPLACE FUNCTION bench.plan_skeleton(p_plan JSONB) RETURNS JSONB
+LANGUAGE plpgsql IMMUTABLE AS
+$$
+DECLARE
+  v_node JSONB := CASE WHEN jsonb_typeof(p_plan) = 'array' THEN p_plan->0->'Plan'
+                       WHEN p_plan ? 'Plan' THEN p_plan->'Plan'
+                       ELSE p_plan END;
+  v_out  JSONB;
+BEGIN
+  SELECT COALESCE(jsonb_object_agg(key, value), '{}') INTO v_out
+  FROM jsonb_each(v_node)
+  WHERE key <> 'Plans'
+    AND key !~ ('^(Startup Cost|Total Cost|Plan Rows|Plan Width|Planned Partitions|Actual .*'
+                '|Rows Removed by .*|Heap Fetches|(Exact|Lossy) Heap Blocks'
+                '|(Shared|Local|Temp) .*(Blocks|Time)|I/O .* Time|WAL .*'
+                '|Sort Method|Sort Space .*|Peak Memory Usage|(Original )?Hash (Buckets|Batches)'
+                '|HashAgg Batches|Disk Usage|Workers|Workers Launched|Full-sort Groups'
+                '|Pre-sorted Groups|Cache (Hits|Misses|Evictions|Overflows)|(Maximum )?Storage)$');
+  IF v_node ? 'Plans' THEN
+    v_out := v_out || jsonb_build_object('Plans',
+      (SELECT jsonb_agg(bench.plan_skeleton(c.child) ORDER BY c.ord)
+       FROM jsonb_array_elements(v_node->'Plans') WITH ORDINALITY AS c(child, ord)));
+  END IF;
+  RETURN v_out;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.plan_actuals(p_plan JSONB) RETURNS JSONB
+LANGUAGE sql IMMUTABLE AS
+$$
+  SELECT jsonb_agg((SELECT jsonb_agg(n.node->k.key ORDER BY k.ord)
+                    FROM unnest(bench.node_metric_keys()) WITH ORDINALITY AS k(key, ord))
+                   ORDER BY n.node_no)
+  FROM bench.plan_node_list(p_plan) AS n
+$$;
+
+CREATE OR REPLACE FUNCTION bench.plan_shape(p_plan JSONB) RETURNS TEXT
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  v_shape JSONB := bench.plan_skeleton(p_plan);
+  v_hash  TEXT  := md5(v_shape::text);
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM bench.plan_shapes WHERE shape_hash = v_hash) THEN
+    INSERT INTO bench.plan_shapes (shape_hash, node_count, node_types, indexes, joins, shape)
+    SELECT v_hash, COUNT(*), string_agg(n.node->>'Node Type', ' > ' ORDER BY n.node_no),
+           bench.plan_indexes(v_shape), bench.plan_joins(v_shape), v_shape
+    FROM bench.plan_node_list(v_shape) AS n
+    ON CONFLICT (shape_hash) DO NOTHING;
+  END IF;
+  RETURN v_hash;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.node_metric(p_actuals JSONB, p_node_no INT, p_key TEXT) RETURNS NUMERIC
+LANGUAGE sql IMMUTABLE AS
+$$ SELECT (p_actuals -> (p_node_no - 1) ->> (array_position(bench.node_metric_keys(), p_key) - 1))::numeric $$;
+
+CREATE OR REPLACE FUNCTION bench.plan_merge(p_node JSONB, p_actuals JSONB, INOUT p_pos INT, OUT p_plan JSONB)
+LANGUAGE plpgsql IMMUTABLE AS
+$$
+DECLARE
+  v_keys  TEXT[] := bench.node_metric_keys();
+  v_vals  JSONB  := p_actuals -> p_pos;
+  v_kids  JSONB  := '[]';
+  v_child JSONB;
+  v_sub   RECORD;
+  k       INT;
+BEGIN
+  p_plan := p_node - 'Plans';
+  FOR k IN 1..cardinality(v_keys) LOOP
+    IF jsonb_typeof(v_vals -> (k - 1)) <> 'null' THEN
+      p_plan := p_plan || jsonb_build_object(v_keys[k], v_vals -> (k - 1));
+    END IF;
+  END LOOP;
+  p_pos := p_pos + 1;
+  FOR v_child IN SELECT value FROM jsonb_array_elements(p_node->'Plans') LOOP
+    SELECT * INTO v_sub FROM bench.plan_merge(v_child, p_actuals, p_pos);
+    p_pos  := v_sub.p_pos;
+    v_kids := v_kids || jsonb_build_array(v_sub.p_plan);
+  END LOOP;
+  IF p_node ? 'Plans' THEN
+    p_plan := p_plan || jsonb_build_object('Plans', v_kids);
+  END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.plan_json(p_shape_hash TEXT, p_actuals JSONB) RETURNS JSONB
+LANGUAGE sql STABLE AS
+$$
+  SELECT jsonb_build_array(jsonb_build_object('Plan', (bench.plan_merge(s.shape, p_actuals, 0)).p_plan))
+  FROM bench.plan_shapes s
+  WHERE s.shape_hash = p_shape_hash
+$$;
+
+-- ===========================================================
+-- bench.extract_plan_nodes(label_like='%')  RETURNS bigint
+--
+-- Flattens the plan of every recorded run whose label matches
+-- (LIKE) into bench.plan_nodes, one row per node; runs already
+-- there are skipped, so calling it again only adds new runs.
+-- Returns the number of node rows added. self_ms and the
+-- self_shared_* blocks subtract the direct children from the
+-- node's own (inclusive) numbers, clamped at 0; under a Gather
+-- the children's times are per-worker averages, so read those
+-- as approximate.
+-- ===========================================================
+CREATE OR REPLACE FUNCTION bench.extract_plan_nodes(p_label_like TEXT DEFAULT '%') RETURNS BIGINT
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  v_added BIGINT;
+BEGIN
+  WITH todo AS (
+    SELECT r.id, r.label, r.variant, r.run_no, r.node_actuals, ps.shape
+    FROM bench.results r
+    JOIN bench.plan_shapes ps ON ps.shape_hash = r.shape_hash
+    WHERE r.label LIKE p_label_like
+      AND NOT EXISTS (SELECT 1 FROM bench.plan_nodes pn WHERE pn.result_id = r.id)
+  ), nodes AS (
+    SELECT
+      t.id, t.label, t.variant, t.run_no, n.node_no, n.parent_no, n.depth,
+      n.node->>'Node Type' AS node_type,
+      n.node->>'Relation Name' AS relation_name,
+      n.node->>'Index Name' AS index_name,
+      bench.node_metric(t.node_actuals, n.node_no, 'Plan Rows') AS est_rows,
+      bench.node_metric(t.node_actuals, n.node_no, 'Actual Rows') AS actual_rows,
+      COALESCE(bench.node_metric(t.node_actuals, n.node_no, 'Actual Loops'), 1) AS loops,
+      bench.node_metric(t.node_actuals, n.node_no, 'Actual Total Time')
+        * COALESCE(bench.node_metric(t.node_actuals, n.node_no, 'Actual Loops'), 1) AS total_ms,
+      bench.node_metric(t.node_actuals, n.node_no, 'Shared Hit Blocks')::bigint AS shared_hits,
+      bench.node_metric(t.node_actuals, n.node_no, 'Shared Read Blocks')::bigint AS shared_reads,
+      (COALESCE(bench.node_metric(t.node_actuals, n.node_no, 'Temp Read Blocks'), 0)
+       + COALESCE(bench.node_metric(t.node_actuals, n.node_no, 'Temp Written Blocks'), 0))::bigint AS temp_blocks,
+      bench.node_metric(t.node_actuals, n.node_no, 'Exact Heap Blocks')::bigint AS exact_heap_blocks,
+      bench.node_metric(t.node_actuals, n.node_no, 'Lossy Heap Blocks')::bigint AS lossy_heap_blocks,
+      bench.node_metric(t.node_actuals, n.node_no, 'Rows Removed by Filter') AS rows_removed_by_filter,
+      bench.node_metric(t.node_actuals, n.node_no, 'Rows Removed by Index Recheck') AS rows_removed_by_recheck
+    FROM todo t, bench.plan_node_list(t.shape) AS n
+  ), children AS (
+    SELECT id, parent_no, SUM(total_ms) AS total_ms,
+           SUM(shared_hits) AS shared_hits, SUM(shared_reads) AS shared_reads
+    FROM nodes
+    WHERE parent_no IS NOT NULL
+    GROUP BY id, parent_no
+  )
+  INSERT INTO bench.plan_nodes (
+    result_id, node_no, parent_no, depth, label, variant, run_no,
+    node_type, relation_name, index_name,
+    est_rows, actual_rows, loops, total_ms, self_ms,
+    shared_hits, shared_reads, self_shared_hits, self_shared_reads,
+    temp_blocks, exact_heap_blocks, lossy_heap_blocks,
+    rows_removed_by_filter, rows_removed_by_recheck
+  )
+  SELECT
+    n.id, n.node_no, n.parent_no, n.depth, n.label, n.variant, n.run_no,
+    n.node_type, n.relation_name, n.index_name,
+    n.est_rows, n.actual_rows, n.loops, n.total_ms,
+    GREATEST(n.total_ms - COALESCE(c.total_ms, 0), 0),
+    n.shared_hits, n.shared_reads,
+    GREATEST(n.shared_hits - COALESCE(c.shared_hits, 0), 0),
+    GREATEST(n.shared_reads - COALESCE(c.shared_reads, 0), 0),
+    n.temp_blocks, n.exact_heap_blocks, n.lossy_heap_blocks,
+    n.rows_removed_by_filter, n.rows_removed_by_recheck
+  FROM nodes n
+  LEFT JOIN children c ON c.id = n.id AND c.parent_no = n.node_no;
+
+  GET DIAGNOSTICS v_added = ROW_COUNT;
+  RETURN v_added;
 END;
 $$;
 
 -- =======================================
 -- bench.clear(label)  RETURNS void
--- Deletes prior results for a label.
+-- Deletes prior results for a label (and the
+-- server-side counters of its suite runs).
 -- =======================================
 CREATE OR REPLACE FUNCTION bench.clear(p_label TEXT) RETURNS VOID
 LANGUAGE plpgsql AS
 $$
 BEGIN
   DELETE FROM bench.results WHERE label = p_label;
+  DELETE FROM bench.run_stats WHERE label = p_label AND source <> 'load';
 END;
 $$;
 
-DO $$ BEGIN RAISE NOTICE 'bench functions created: bench.run, bench.clear'; END $$;
+DO $$ BEGIN RAISE NOTICE 'bench functions created: bench.drop_routines, bench.hash_u31, bench.doc_extra, bench.dimension_tables, bench.record_dataset, bench.dataset_checksum, bench.query_id, bench.stat_snapshot, bench.stat_delta, bench.record_stats, bench.run, bench.run_write, bench.sql_literal, bench.render_sql, bench.prepare_sql, bench.page_params, bench.register_scenario, bench.add_scenario_queries, bench.plan_indexes, bench.plan_joins, bench.q_error, bench.node_metric_keys, bench.plan_node_list, bench.plan_skeleton, bench.plan_actuals, bench.plan_shape, bench.node_metric, bench.plan_merge, bench.plan_json, bench.extract_plan_nodes, bench.clear'; END $$;
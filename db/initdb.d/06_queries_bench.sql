@@ -1,409 +1,1013 @@
 \set ON_ERROR_STOP on
 
 /* =============================================================================
-   Benchmark query registration
-   - Each scenario runs four variants under these labels:
-       'jsonb_indexed', 'jsonb_unindexed', 'rel_indexed', 'rel_unindexed'
-   - Use bench.summary to compare p50/p95/avg afterwards.
+   Benchmark query registration (scenario catalog)
+   - Every scenario is one row of bench.scenarios. bench.run_suite_for_size,
+     the Python drivers (scenarios.py) and, through the exported "scenarios"
+     sheet, the visualizers all read it from there. Adding a scenario means
+     adding one bench.register_scenario(...) call below (or running one
+     against a live database).
+   - queries: label key -> SQL template. The base labels are
+       'jsonb_indexed', 'jsonb_unindexed', 'rel_indexed', 'rel_unindexed',
+       'hybrid_indexed' (inv_hybrid: payload + generated columns)
+     and a scenario may define any subset of them (or extra label keys).
+     'jsonb_gin_containment' (inv_jsonb_gin: one GIN (payload jsonb_path_ops),
+     payload @> {...}) is defined where the predicate is an equality or
+     array containment (S1, S5-S10; S1/S8 recheck the numeric range).
+   - {{name}} placeholders are bound from params by bench.render_sql
+     (strings become quoted literals, numbers stay as they are).
+   - kind: 'read' (default) or 'write' (INSERT/UPDATE/DELETE, see the
+     write scenarios at the end; only bench.run_write executes them).
+   - expected_selectivity: fraction of N the query returns on a seeded
+     dataset (NULL when it depends on N).
+   - sweep: optional parameter sets layered over params, one per point on
+     the selectivity curve (run with run_suite_for_size(..., p_sweep => true));
+     bench.results.selectivity records the fraction actually returned.
+     For the pagination scenarios (L1-L4) the points are pages instead.
    - Notes:
      * JSONB timestamps are ISO8601 strings; comparisons are lexicographic.
-     * JSONB containment uses the GIN(jsonb_path_ops) index.
      * Trigram cases assume pg_trgm + GIN(trgm_ops).
      * Array semantics:
          AND  = must contain ALL values  → @> (rel arrays and JSONB arrays)
-         OR   = any overlap              → && (rel arrays) / OR of @> (JSONB)
+         OR   = any overlap              → OR of = ANY (rel) / OR of @> (JSONB)
    ========================================================================== */
 
--- start with a clean slate for these labels (safe to keep/comment)
-SELECT bench.clear('jsonb_indexed');
-SELECT bench.clear('jsonb_unindexed');
-SELECT bench.clear('rel_indexed');
-SELECT bench.clear('rel_unindexed');
 
-
-/* ============================================================================
-   S1) Equality on text + numeric inequality
-   Purpose: classic selective predicate on two fields.
-
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE (payload->>'indexed_text_1') = 'A'
-       AND ((payload->>'indexed_number_1')::numeric) > 100;
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_1 = 'A' AND indexed_number_1 > 100;
-   ========================================================================== */
-SELECT bench.run('jsonb_indexed','S1_expr_eq_num',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'indexed_text_1') = 'A'
-AND ((payload->>'indexed_number_1')::numeric) > 100$$);
-
-SELECT bench.run('jsonb_unindexed','S1_expr_eq_num',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_text_1') = 'A'
-AND ((payload->>'unindexed_number_1')::numeric) > 100$$);
-
-SELECT bench.run('rel_indexed','S1_expr_eq_num',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_1 = 'A' AND indexed_number_1 > 100$$);
-
-SELECT bench.run('rel_unindexed','S1_expr_eq_num',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_1 = 'A' AND unindexed_number_1 > 100$$);
-
-
-
-/* ============================================================================
-   S2) LIKE prefix (left-anchored)
+/* S1) Equality on text + numeric inequality
+   Purpose: classic selective predicate on two fields. */
+SELECT bench.register_scenario(
+  'S1_expr_eq_num', 'S1', 'Equality + Numeric Inequality',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+        AND ((payload->>'indexed_number_1')::numeric) > {{num}}$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+        AND ((payload->>'unindexed_number_1')::numeric) > {{num}}$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_1 = {{text}} AND indexed_number_1 > {{num}}$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_1 = {{text}} AND unindexed_number_1 > {{num}}$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}} AND indexed_number_1 > {{num}}$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+        AND ((payload->>'indexed_number_1')::numeric) > {{num}}$q$),
+  p_params      => '{"text": "A", "num": 100}',
+  p_selectivity => 0.0385,
+  p_description => 'Classic selective predicate on two fields.',
+  p_ord         => 10,
+  -- numeric threshold: 0.0385 x (1 - num / 1e6) of N
+  p_sweep       => '[{"point": "num>999900", "num": 999900},
+                     {"point": "num>999000", "num": 999000},
+                     {"point": "num>990000", "num": 990000},
+                     {"point": "num>900000", "num": 900000},
+                     {"point": "num>500000", "num": 500000},
+                     {"point": "num>0",      "num": 0}]');
+
+/* S2) LIKE prefix (left-anchored)
    Purpose: measure pattern_ops / btree LIKE behavior vs JSONB expression.
-
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE (payload->>'indexed_text_2') LIKE 'INV00012%';
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_2 LIKE 'INV00012%';
-   ========================================================================== */
-SELECT bench.run('jsonb_indexed','S2_like_prefix',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'indexed_text_2') LIKE 'INV00012%'$$);
-
-SELECT bench.run('jsonb_unindexed','S2_like_prefix',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_text_2') LIKE 'INV00012%'$$);
-
-SELECT bench.run('rel_indexed','S2_like_prefix',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_2 LIKE 'INV00012%'$$);
-
-SELECT bench.run('rel_unindexed','S2_like_prefix',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_2 LIKE 'INV00012%'$$);
-
+   100 matching keys per 10M rows, so the fraction depends on N. */
+SELECT bench.register_scenario(
+  'S2_like_prefix', 'S2', 'LIKE Prefix Search',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_2') LIKE {{prefix}}$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_2') LIKE {{prefix}}$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_2 LIKE {{prefix}}$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_2 LIKE {{prefix}}$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_2 LIKE {{prefix}}$q$),
+  p_params      => '{"prefix": "INV00012%"}',
+  p_description => 'pattern_ops / btree LIKE behavior vs JSONB expression.',
+  p_ord         => 20,
+  -- prefix length 3..9 (keys are 'INV' + 7 digits of n % 1e7)
+  p_sweep       => '[{"point": "len3", "prefix": "INV%"},
+                     {"point": "len4", "prefix": "INV0%"},
+                     {"point": "len5", "prefix": "INV00%"},
+                     {"point": "len6", "prefix": "INV000%"},
+                     {"point": "len7", "prefix": "INV0001%"},
+                     {"point": "len8", "prefix": "INV00012%"},
+                     {"point": "len9", "prefix": "INV000123%"}]');
+
+/* S3) Substring contains (ILIKE '%...%') via trigram
+   Purpose: full substring search. */
+SELECT bench.register_scenario(
+  'S3_trgm_contains', 'S3', 'Substring Contains (ILIKE/trigram)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_3') ILIKE {{pattern}}$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_3') ILIKE {{pattern}}$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_3 ILIKE {{pattern}}$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_3 ILIKE {{pattern}}$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_3 ILIKE {{pattern}}$q$),
+  p_params      => '{"pattern": "%priority%"}',
+  p_selectivity => 0.1667,
+  p_description => 'Full substring search.',
+  p_ord         => 30);
+
+/* S4) Timestamp range
+   Purpose: range scan on time. JSONB uses ISO8601 string (lexicographic);
+   the same ISO literal is cast to timestamptz on the relational side.
+   Selectivity: January 2025 out of the 365 seeded days before 2025-10-01. */
+SELECT bench.register_scenario(
+  'S4_ts_range', 'S4', 'Timestamp Range',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_timestamp_1') >= {{ts_from}}
+        AND (payload->>'indexed_timestamp_1') <  {{ts_to}}$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_timestamp_1') >= {{ts_from}}
+        AND (payload->>'unindexed_timestamp_1') <  {{ts_to}}$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_timestamp_1 >= {{ts_from}}::timestamptz
+        AND indexed_timestamp_1 <  {{ts_to}}::timestamptz$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_timestamp_1 >= {{ts_from}}::timestamptz
+        AND unindexed_timestamp_1 <  {{ts_to}}::timestamptz$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_timestamp_1 >= {{ts_from}}::timestamptz
+        AND indexed_timestamp_1 <  {{ts_to}}::timestamptz$q$),
+  p_params      => '{"ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-02-01T00:00:00.000Z"}',
+  p_selectivity => 0.0849,
+  p_description => 'Range scan on time; JSONB compares ISO8601 strings.',
+  p_ord         => 40,
+  -- window length from 2025-01-01: 1 hour .. 6 months
+  p_sweep       => '[{"point": "1h",  "ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-01-01T01:00:00.000Z"},
+                     {"point": "1d",  "ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-01-02T00:00:00.000Z"},
+                     {"point": "1w",  "ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-01-08T00:00:00.000Z"},
+                     {"point": "1mo", "ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-02-01T00:00:00.000Z"},
+                     {"point": "3mo", "ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-04-01T00:00:00.000Z"},
+                     {"point": "6mo", "ts_from": "2025-01-01T00:00:00.000Z", "ts_to": "2025-07-01T00:00:00.000Z"}]');
+
+/* S5) Array AND (must contain BOTH 'aml' and 'priority')
+   Purpose: containment semantics. */
+SELECT bench.register_scenario(
+  'S5_array_and', 'S5', 'Array AND (must contain both)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->'indexed_text_array_1') @> '["aml","priority"]'::jsonb$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->'unindexed_text_array_1') @> '["aml","priority"]'::jsonb$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_array_1 @> ARRAY['aml','priority']::text[]$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_array_1 @> ARRAY['aml','priority']::text[]$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_array_1 @> ARRAY['aml','priority']::text[]$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> '{"indexed_text_array_1": ["aml","priority"]}'::jsonb$q$),
+  p_selectivity => 0.1225,
+  p_description => 'Containment semantics.',
+  p_ord         => 50);
+
+/* S6) Array OR (any overlap with {'aml','priority'})
+   Purpose: overlap semantics (broader predicate than S5). */
+SELECT bench.register_scenario(
+  'S6_array_or', 'S6', 'Array OR (any overlap)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->'indexed_text_array_1') @> '["aml"]'::jsonb
+         OR (payload->'indexed_text_array_1') @> '["priority"]'::jsonb$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->'unindexed_text_array_1') @> '["aml"]'::jsonb
+         OR (payload->'unindexed_text_array_1') @> '["priority"]'::jsonb$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE 'aml' = ANY(indexed_text_array_1)
+         OR 'priority' = ANY(indexed_text_array_1)$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE 'aml' = ANY(unindexed_text_array_1)
+         OR 'priority' = ANY(unindexed_text_array_1)$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE 'aml' = ANY(indexed_text_array_1)
+         OR 'priority' = ANY(indexed_text_array_1)$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> '{"indexed_text_array_1": ["aml"]}'::jsonb
+         OR payload @> '{"indexed_text_array_1": ["priority"]}'::jsonb$q$),
+  p_selectivity => 0.5775,
+  p_description => 'Overlap semantics (broader predicate than S5).',
+  p_ord         => 60);
+
+/* S7) Multi-key AND (two keys)
+   Purpose: two-field AND. ('A' rows are n % 26 = 0, which are all even,
+   so the boolean does not narrow the result.) */
+SELECT bench.register_scenario(
+  'S7_and2', 'S7', 'Multi-key AND (2 keys)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+        AND ((payload->>'indexed_boolean_1')::boolean) IS TRUE$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+        AND ((payload->>'unindexed_boolean_1')::boolean) IS TRUE$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_1 = {{text}} AND indexed_boolean_1 = true$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_1 = {{text}} AND unindexed_boolean_1 = true$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}} AND indexed_boolean_1 = true$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text,
+                                          'indexed_boolean_1', true)$q$),
+  p_params      => '{"text": "A"}',
+  p_selectivity => 0.0385,
+  p_description => 'Two-field AND (text + boolean).',
+  p_ord         => 70);
+
+/* S8) Multi-key AND (three keys: text + boolean + number)
+   Purpose: higher selectivity with three fields. */
+SELECT bench.register_scenario(
+  'S8_and3', 'S8', 'Multi-key AND (3 keys)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+        AND ((payload->>'indexed_boolean_1')::boolean) IS TRUE
+        AND ((payload->>'indexed_number_1')::numeric) > {{num}}::numeric$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+        AND ((payload->>'unindexed_boolean_1')::boolean) IS TRUE
+        AND ((payload->>'unindexed_number_1')::numeric) > {{num}}::numeric$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_1 = {{text}} AND indexed_boolean_1 = true AND indexed_number_1 > {{num}}$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_1 = {{text}} AND unindexed_boolean_1 = true AND unindexed_number_1 > {{num}}$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}} AND indexed_boolean_1 = true AND indexed_number_1 > {{num}}$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text,
+                                          'indexed_boolean_1', true)
+        AND ((payload->>'indexed_number_1')::numeric) > {{num}}::numeric$q$),
+  p_params      => '{"text": "A", "num": 100}',
+  p_selectivity => 0.0385,
+  p_description => 'Three-field AND (text + boolean + number).',
+  p_ord         => 80);
+
+/* S9) OR across keys
+   Purpose: broader retrieval via OR of selective predicates. */
+SELECT bench.register_scenario(
+  'S9_or_keys', 'S9', 'OR Across Keys',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+         OR ((payload->>'indexed_boolean_1')::boolean) IS TRUE$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+         OR ((payload->>'unindexed_boolean_1')::boolean) IS TRUE$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_1 = {{text}} OR indexed_boolean_1 = true$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_1 = {{text}} OR unindexed_boolean_1 = true$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}} OR indexed_boolean_1 = true$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+         OR payload @> '{"indexed_boolean_1": true}'::jsonb$q$),
+  p_params      => '{"text": "A"}',
+  p_selectivity => 0.5,
+  p_description => 'Broader retrieval via OR of selective predicates.',
+  p_ord         => 90);
+
+/* S10) Top-N ordering within a group
+   Purpose: ORDER BY compatibility and index support. */
+SELECT bench.register_scenario(
+  'S10_topn_order', 'S10', 'Top-N by Timestamp Within Group',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+      ORDER BY (payload->>'indexed_timestamp_1')$q$,
+    'jsonb_unindexed', $q$SELECT id FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+      ORDER BY (payload->>'unindexed_timestamp_1')$q$,
+    'rel_indexed', $q$SELECT id FROM inv_rel
+      WHERE indexed_text_1 = {{text}}
+      ORDER BY indexed_timestamp_1$q$,
+    'rel_unindexed', $q$SELECT id FROM inv_rel
+      WHERE unindexed_text_1 = {{text}}
+      ORDER BY unindexed_timestamp_1$q$,
+    'hybrid_indexed', $q$SELECT id FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}
+      ORDER BY indexed_timestamp_1$q$,
+    'jsonb_gin_containment', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+      ORDER BY (payload->>'indexed_timestamp_1')$q$),
+  p_params      => '{"text": "A"}',
+  p_selectivity => 0.0385,
+  p_description => 'ORDER BY compatibility and index support.',
+  p_ord         => 100);
 
 
-/* ============================================================================
-   S3) Substring contains (ILIKE '%...%') via trigram
-   Purpose: full substring search.
 
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE (payload->>'indexed_text_3') ILIKE '%priority%';
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_3 ILIKE '%priority%';
-   ========================================================================== */
-SELECT bench.run('jsonb_indexed','S3_trgm_contains',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'indexed_text_3') ILIKE '%priority%'$$);
-
-SELECT bench.run('jsonb_unindexed','S3_trgm_contains',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_text_3') ILIKE '%priority%'$$);
-
-SELECT bench.run('rel_indexed','S3_trgm_contains',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_3 ILIKE '%priority%'$$);
-
-SELECT bench.run('rel_unindexed','S3_trgm_contains',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_3 ILIKE '%priority%'$$);
-
-
-
-/* ============================================================================
-   S4) Timestamp range
-   Purpose: range scan on time. JSONB uses ISO8601 string (lexicographic).
-
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE (payload->>'indexed_timestamp_1') >= '2025-01-01T00:00:00.000Z'
-       AND (payload->>'indexed_timestamp_1') <  '2025-02-01T00:00:00.000Z';
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_timestamp_1 >= '2025-01-01 00:00:00+00'
-       AND indexed_timestamp_1 <  '2025-02-01 00:00:00+00';
+/* =============================================================================
+   SQL/JSON forms of S1-S10 (PG17), as extra label keys on the same scenarios,
+   all against inv_jsonb_gin, whose GIN (payload jsonb_path_ops) is the only
+   index that can serve jsonpath:
+     jsonpath_exists  payload @? '$ ? (<filter>)'
+     jsonpath_match   payload @@ '<predicate>'
+     json_table       JSON_TABLE(payload, '$' COLUMNS (...)) + SQL WHERE
+   jsonb_path_ops answers @? / @@ only for == comparisons of accessor chains,
+   so ranges, starts with and like_regex are filtered on the heap and
+   JSON_TABLE always scans. bench.index_usage records which plans used an index.
+   Parameters are spliced into the jsonpath text as JSON string literals
+   (to_json(...)::text, so '"' and '\' in a value stay part of it), which the
+   server evaluates once per execution (prepared modes pass them as $n).
    ========================================================================== */
-SELECT bench.run('jsonb_indexed','S4_ts_range',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'indexed_timestamp_1') >= '2025-01-01T00:00:00.000Z'
-AND (payload->>'indexed_timestamp_1') <  '2025-02-01T00:00:00.000Z'$$);
-
-SELECT bench.run('jsonb_unindexed','S4_ts_range',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_timestamp_1') >= '2025-01-01T00:00:00.000Z'
-AND (payload->>'unindexed_timestamp_1') <  '2025-02-01T00:00:00.000Z'$$);
-
-SELECT bench.run('rel_indexed','S4_ts_range',
-$$SELECT id FROM inv_rel
-WHERE indexed_timestamp_1 >= '2025-01-01 00:00:00+00'
-AND indexed_timestamp_1 <  '2025-02-01 00:00:00+00'$$);
 
-SELECT bench.run('rel_unindexed','S4_ts_range',
-$$SELECT id FROM inv_rel
-WHERE unindexed_timestamp_1 >= '2025-01-01 00:00:00+00'
-AND unindexed_timestamp_1 <  '2025-02-01 00:00:00+00'$$);
+SELECT bench.add_scenario_queries('S1_expr_eq_num', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' && @.indexed_number_1 > ' || {{num}}::text || ')')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' && $.indexed_number_1 > ' || {{num}}::text)::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_1   text    PATH '$.indexed_text_1',
+        number_1 numeric PATH '$.indexed_number_1')) jt
+      WHERE jt.text_1 = {{text}} AND jt.number_1 > {{num}}$q$));
+
+SELECT bench.add_scenario_queries('S2_like_prefix', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_2 starts with '
+                        || to_json(rtrim({{prefix}}::text, '%'))::text || ')')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_2 starts with '
+                        || to_json(rtrim({{prefix}}::text, '%'))::text)::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_2 text PATH '$.indexed_text_2')) jt
+      WHERE jt.text_2 LIKE {{prefix}}$q$));
+
+SELECT bench.add_scenario_queries('S3_trgm_contains', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_3 like_regex '
+                        || to_json(btrim({{pattern}}::text, '%'))::text || ' flag "i")')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_3 like_regex '
+                        || to_json(btrim({{pattern}}::text, '%'))::text || ' flag "i"')::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_3 text PATH '$.indexed_text_3')) jt
+      WHERE jt.text_3 ILIKE {{pattern}}$q$));
+
+SELECT bench.add_scenario_queries('S4_ts_range', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_timestamp_1 >= ' || to_json({{ts_from}}::text)::text
+                        || ' && @.indexed_timestamp_1 < ' || to_json({{ts_to}}::text)::text || ')')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_timestamp_1 >= ' || to_json({{ts_from}}::text)::text
+                        || ' && $.indexed_timestamp_1 < ' || to_json({{ts_to}}::text)::text)::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        timestamp_1 text PATH '$.indexed_timestamp_1')) jt
+      WHERE jt.timestamp_1 >= {{ts_from}} AND jt.timestamp_1 < {{ts_to}}$q$));
+
+SELECT bench.add_scenario_queries('S5_array_and', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? '$ ? (@.indexed_text_array_1[*] == "aml"
+                             && @.indexed_text_array_1[*] == "priority")'$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ '$.indexed_text_array_1[*] == "aml"
+                        && $.indexed_text_array_1[*] == "priority"'$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_array_1 jsonb PATH '$.indexed_text_array_1')) jt
+      WHERE jt.text_array_1 @> '["aml","priority"]'::jsonb$q$));
+
+SELECT bench.add_scenario_queries('S6_array_or', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? '$ ? (@.indexed_text_array_1[*] == "aml"
+                             || @.indexed_text_array_1[*] == "priority")'$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ '$.indexed_text_array_1[*] == "aml"
+                        || $.indexed_text_array_1[*] == "priority"'$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_array_1 jsonb PATH '$.indexed_text_array_1')) jt
+      WHERE jt.text_array_1 @> '["aml"]'::jsonb
+         OR jt.text_array_1 @> '["priority"]'::jsonb$q$));
+
+SELECT bench.add_scenario_queries('S7_and2', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' && @.indexed_boolean_1 == true)')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' && $.indexed_boolean_1 == true')::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_1    text    PATH '$.indexed_text_1',
+        boolean_1 boolean PATH '$.indexed_boolean_1')) jt
+      WHERE jt.text_1 = {{text}} AND jt.boolean_1$q$));
+
+SELECT bench.add_scenario_queries('S8_and3', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' && @.indexed_boolean_1 == true && @.indexed_number_1 > '
+                        || {{num}}::text || ')')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' && $.indexed_boolean_1 == true && $.indexed_number_1 > '
+                        || {{num}}::text)::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_1    text    PATH '$.indexed_text_1',
+        boolean_1 boolean PATH '$.indexed_boolean_1',
+        number_1  numeric PATH '$.indexed_number_1')) jt
+      WHERE jt.text_1 = {{text}} AND jt.boolean_1 AND jt.number_1 > {{num}}$q$));
+
+SELECT bench.add_scenario_queries('S9_or_keys', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' || @.indexed_boolean_1 == true)')::jsonpath$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_1 == ' || to_json({{text}}::text)::text
+                        || ' || $.indexed_boolean_1 == true')::jsonpath$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_1    text    PATH '$.indexed_text_1',
+        boolean_1 boolean PATH '$.indexed_boolean_1')) jt
+      WHERE jt.text_1 = {{text}} OR jt.boolean_1$q$));
+
+SELECT bench.add_scenario_queries('S10_topn_order', jsonb_build_object(
+  'jsonpath_exists', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @? ('$ ? (@.indexed_text_1 == ' || to_json({{text}}::text)::text || ')')::jsonpath
+      ORDER BY (payload->>'indexed_timestamp_1')$q$,
+  'jsonpath_match', $q$SELECT id FROM inv_jsonb_gin
+      WHERE payload @@ ('$.indexed_text_1 == ' || to_json({{text}}::text)::text)::jsonpath
+      ORDER BY (payload->>'indexed_timestamp_1')$q$,
+  'json_table', $q$SELECT j.id FROM inv_jsonb_gin j,
+      JSON_TABLE(j.payload, '$' COLUMNS (
+        text_1      text PATH '$.indexed_text_1',
+        timestamp_1 text PATH '$.indexed_timestamp_1')) jt
+      WHERE jt.text_1 = {{text}}
+      ORDER BY jt.timestamp_1$q$));
 
 
-
-/* ============================================================================
-   S5) Array AND (must contain BOTH 'aml' and 'priority')
-   Purpose: containment semantics.
-
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE (payload->'indexed_text_array_1') @> '["aml","priority"]'::jsonb;
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_array_1 @> ARRAY['aml','priority']::text[];
+/* =============================================================================
+   Aggregation scenarios (A1-A4): reporting queries that read the values,
+   not just the ids. The filter (indexed_text_1 = {{text}}, ~1/26 of N)
+   decides which rows are aggregated; on the JSONB tables every one of them
+   has its payload detoasted and parsed again for each ->> it evaluates,
+   while inv_rel / inv_hybrid read plain columns. bench.aggregates relates
+   time and buffers to the rows fed into the aggregate (per-row cost) and
+   records the aggregate strategy (Hashed / Sorted / Plain).
+   The result is one row per group, so actual_rows / selectivity are the
+   group counts here; expected_selectivity stays NULL.
    ========================================================================== */
-SELECT bench.run('jsonb_indexed','S5_array_and',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->'indexed_text_array_1') @> '["aml","priority"]'::jsonb$$);
 
-SELECT bench.run('jsonb_unindexed','S5_array_and',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->'unindexed_text_array_1') @> '["aml","priority"]'::jsonb$$);
+/* A1) SUM per group (few groups: hash aggregate) */
+SELECT bench.register_scenario(
+  'A1_hash_sum', 'A1', 'Hash Aggregate: SUM per Group',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT payload->>'indexed_text_3' AS grp,
+             SUM((payload->>'indexed_number_1')::numeric) AS total
+      FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+      GROUP BY payload->>'indexed_text_3'$q$,
+    'jsonb_unindexed', $q$SELECT payload->>'unindexed_text_3' AS grp,
+             SUM((payload->>'unindexed_number_1')::numeric) AS total
+      FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+      GROUP BY payload->>'unindexed_text_3'$q$,
+    'rel_indexed', $q$SELECT indexed_text_3 AS grp, SUM(indexed_number_1) AS total
+      FROM inv_rel
+      WHERE indexed_text_1 = {{text}}
+      GROUP BY indexed_text_3$q$,
+    'rel_unindexed', $q$SELECT unindexed_text_3 AS grp, SUM(unindexed_number_1) AS total
+      FROM inv_rel
+      WHERE unindexed_text_1 = {{text}}
+      GROUP BY unindexed_text_3$q$,
+    'hybrid_indexed', $q$SELECT indexed_text_3 AS grp, SUM(indexed_number_1) AS total
+      FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}
+      GROUP BY indexed_text_3$q$,
+    'jsonb_gin_containment', $q$SELECT payload->>'indexed_text_3' AS grp,
+             SUM((payload->>'indexed_number_1')::numeric) AS total
+      FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+      GROUP BY payload->>'indexed_text_3'$q$),
+  p_params      => '{"text": "A"}',
+  p_description => 'SUM(number_1) GROUP BY text_3 (6 groups) over the matching rows.',
+  p_ord         => 110);
+
+/* A2) Median per group, ordered output
+   An ordered-set aggregate cannot be hashed: the input is sorted by
+   (group, value) and fed to a sorted GroupAggregate. */
+SELECT bench.register_scenario(
+  'A2_sorted_median', 'A2', 'Sorted Aggregate: Median per Group',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT payload->>'indexed_text_3' AS grp,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY (payload->>'indexed_number_1')::numeric) AS median
+      FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+      GROUP BY payload->>'indexed_text_3'
+      ORDER BY 1$q$,
+    'jsonb_unindexed', $q$SELECT payload->>'unindexed_text_3' AS grp,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY (payload->>'unindexed_number_1')::numeric) AS median
+      FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+      GROUP BY payload->>'unindexed_text_3'
+      ORDER BY 1$q$,
+    'rel_indexed', $q$SELECT indexed_text_3 AS grp,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY indexed_number_1) AS median
+      FROM inv_rel
+      WHERE indexed_text_1 = {{text}}
+      GROUP BY indexed_text_3
+      ORDER BY 1$q$,
+    'rel_unindexed', $q$SELECT unindexed_text_3 AS grp,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY unindexed_number_1) AS median
+      FROM inv_rel
+      WHERE unindexed_text_1 = {{text}}
+      GROUP BY unindexed_text_3
+      ORDER BY 1$q$,
+    'hybrid_indexed', $q$SELECT indexed_text_3 AS grp,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY indexed_number_1) AS median
+      FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}
+      GROUP BY indexed_text_3
+      ORDER BY 1$q$,
+    'jsonb_gin_containment', $q$SELECT payload->>'indexed_text_3' AS grp,
+             percentile_cont(0.5) WITHIN GROUP (ORDER BY (payload->>'indexed_number_1')::numeric) AS median
+      FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+      GROUP BY payload->>'indexed_text_3'
+      ORDER BY 1$q$),
+  p_params      => '{"text": "A"}',
+  p_description => 'percentile_cont(0.5) per text_3 group; sorted input, no hashing.',
+  p_ord         => 120);
+
+/* A3) Counts per array element
+   jsonb_array_elements over the JSONB array vs unnest(text[]). */
+SELECT bench.register_scenario(
+  'A3_array_counts', 'A3', 'Counts per Array Element',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT e.tag, COUNT(*) AS cnt
+      FROM inv_jsonb j
+      CROSS JOIN LATERAL jsonb_array_elements(j.payload->'indexed_text_array_1') AS e(tag)
+      WHERE (j.payload->>'indexed_text_1') = {{text}}
+      GROUP BY e.tag$q$,
+    'jsonb_unindexed', $q$SELECT e.tag, COUNT(*) AS cnt
+      FROM inv_jsonb j
+      CROSS JOIN LATERAL jsonb_array_elements(j.payload->'unindexed_text_array_1') AS e(tag)
+      WHERE (j.payload->>'unindexed_text_1') = {{text}}
+      GROUP BY e.tag$q$,
+    'rel_indexed', $q$SELECT e.tag, COUNT(*) AS cnt
+      FROM inv_rel r
+      CROSS JOIN LATERAL unnest(r.indexed_text_array_1) AS e(tag)
+      WHERE r.indexed_text_1 = {{text}}
+      GROUP BY e.tag$q$,
+    'rel_unindexed', $q$SELECT e.tag, COUNT(*) AS cnt
+      FROM inv_rel r
+      CROSS JOIN LATERAL unnest(r.unindexed_text_array_1) AS e(tag)
+      WHERE r.unindexed_text_1 = {{text}}
+      GROUP BY e.tag$q$,
+    'hybrid_indexed', $q$SELECT e.tag, COUNT(*) AS cnt
+      FROM inv_hybrid h
+      CROSS JOIN LATERAL unnest(h.indexed_text_array_1) AS e(tag)
+      WHERE h.indexed_text_1 = {{text}}
+      GROUP BY e.tag$q$,
+    'jsonb_gin_containment', $q$SELECT e.tag, COUNT(*) AS cnt
+      FROM inv_jsonb_gin j
+      CROSS JOIN LATERAL jsonb_array_elements(j.payload->'indexed_text_array_1') AS e(tag)
+      WHERE j.payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+      GROUP BY e.tag$q$),
+  p_params      => '{"text": "A"}',
+  p_description => 'Tag counts: jsonb_array_elements vs unnest(text[]) (~2.1 elements per row).',
+  p_ord         => 130);
+
+/* A4) COUNT DISTINCT per group
+   DISTINCT aggregates are not hashed either; each group's values are
+   sorted and de-duplicated (text_2 is ~unique per row below 10M rows). */
+SELECT bench.register_scenario(
+  'A4_count_distinct', 'A4', 'COUNT DISTINCT per Group',
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT payload->>'indexed_text_3' AS grp,
+             COUNT(DISTINCT payload->>'indexed_text_2') AS keys
+      FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+      GROUP BY payload->>'indexed_text_3'$q$,
+    'jsonb_unindexed', $q$SELECT payload->>'unindexed_text_3' AS grp,
+             COUNT(DISTINCT payload->>'unindexed_text_2') AS keys
+      FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+      GROUP BY payload->>'unindexed_text_3'$q$,
+    'rel_indexed', $q$SELECT indexed_text_3 AS grp, COUNT(DISTINCT indexed_text_2) AS keys
+      FROM inv_rel
+      WHERE indexed_text_1 = {{text}}
+      GROUP BY indexed_text_3$q$,
+    'rel_unindexed', $q$SELECT unindexed_text_3 AS grp, COUNT(DISTINCT unindexed_text_2) AS keys
+      FROM inv_rel
+      WHERE unindexed_text_1 = {{text}}
+      GROUP BY unindexed_text_3$q$,
+    'hybrid_indexed', $q$SELECT indexed_text_3 AS grp, COUNT(DISTINCT indexed_text_2) AS keys
+      FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}
+      GROUP BY indexed_text_3$q$,
+    'jsonb_gin_containment', $q$SELECT payload->>'indexed_text_3' AS grp,
+             COUNT(DISTINCT payload->>'indexed_text_2') AS keys
+      FROM inv_jsonb_gin
+      WHERE payload @> jsonb_build_object('indexed_text_1', {{text}}::text)
+      GROUP BY payload->>'indexed_text_3'$q$),
+  p_params      => '{"text": "A"}',
+  p_description => 'COUNT(DISTINCT text_2) per text_3 group.',
+  p_ord         => 140);
 
-SELECT bench.run('rel_indexed','S5_array_and',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_array_1 @> ARRAY['aml','priority']::text[]$$);
 
-SELECT bench.run('rel_unindexed','S5_array_and',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_array_1 @> ARRAY['aml','priority']::text[]$$);
-
-
-/* ============================================================================
-   S6) Array OR (any overlap with {'aml','priority'})
-   Purpose: overlap semantics (broader predicate than S5).
-
-   Example (manual):
-     -- JSONB (OR of containments):
-     SELECT id FROM inv_jsonb
-     WHERE (payload->'indexed_text_array_1') @> '["aml"]'::jsonb
-        OR (payload->'indexed_text_array_1') @> '["priority"]'::jsonb;
-
-     -- Relational (overlap operator):
-     SELECT id FROM inv_rel
-     WHERE indexed_text_array_1 && ARRAY['aml','priority']::text[];
+/* =============================================================================
+   Projection width (P1, P5, P15, P30): the rows of indexed_text_1 = {{text}}
+   (~1/26 of N, found through the same index) returned with 1, 5, 15 or all
+   30 attributes, so only the select list changes across the family:
+     jsonb_indexed   payload->>'<key>' per attribute (one detoast + lookup each)
+     rel_indexed     the inv_rel columns
+     hybrid_indexed  generated columns for the indexed_* keys, payload->> for
+                     the unindexed_* keys (P30 mixes both)
+     jsonb_payload   P30 only: the whole document, SELECT id, payload
+   bench.run measures with EXPLAIN (SERIALIZE) so the output rows are
+   really produced (serialize_ms, output_kb); bench.projection lists them.
    ========================================================================== */
-SELECT bench.run('jsonb_indexed','S6_array_or',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->'indexed_text_array_1') @> '["aml"]'::jsonb
-OR (payload->'indexed_text_array_1') @> '["priority"]'::jsonb$$);
-
-SELECT bench.run('jsonb_unindexed','S6_array_or',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->'unindexed_text_array_1') @> '["aml"]'::jsonb
-OR (payload->'unindexed_text_array_1') @> '["priority"]'::jsonb$$);
-
-SELECT bench.run('rel_indexed','S6_array_or',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_array_1 && ARRAY['aml','priority']::text[]$$);
-
-SELECT bench.run('rel_unindexed','S6_array_or',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_array_1 && ARRAY['aml','priority']::text[]$$);
-
 
+SELECT bench.register_scenario(
+  format('P%s_proj_%s', w.width, w.width), 'P' || w.width,
+  format('Projection: %s of 30 attributes', w.width),
+  jsonb_build_object(
+    'jsonb_indexed', format($q$SELECT id, %s FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}$q$, c.jsonb_cols),
+    'rel_indexed', format($q$SELECT id, %s FROM inv_rel
+      WHERE indexed_text_1 = {{text}}$q$, c.rel_cols),
+    'hybrid_indexed', format($q$SELECT id, %s FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}$q$, c.hybrid_cols))
+  || CASE WHEN w.width = 30 THEN jsonb_build_object(
+    'jsonb_payload', $q$SELECT id, payload FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}$q$) ELSE '{}'::jsonb END,
+  p_params      => '{"text": "A"}',
+  p_selectivity => 0.0385,
+  p_description => format('%s attribute(s) per matching row; same filter and index as S10.', w.width),
+  p_ord         => 140 + w.pos * 10)
+FROM unnest(ARRAY[1, 5, 15, 30]) WITH ORDINALITY AS w(width, pos),
+LATERAL (
+  SELECT string_agg(format('payload->>%L AS %I', k, k), ', ' ORDER BY o) AS jsonb_cols,
+         string_agg(quote_ident(k), ', ' ORDER BY o) AS rel_cols,
+         string_agg(CASE WHEN k LIKE 'indexed\_%' THEN quote_ident(k)
+                         ELSE format('payload->>%L AS %I', k, k) END, ', ' ORDER BY o) AS hybrid_cols
+  FROM unnest(ARRAY[
+         -- P1
+         'indexed_number_1',
+         -- P5
+         'indexed_text_2', 'indexed_text_3', 'indexed_timestamp_1', 'indexed_boolean_1',
+         -- P15: every indexed_* key
+         'indexed_text_1', 'indexed_timestamp_2', 'indexed_timestamp_3',
+         'indexed_number_2', 'indexed_number_3',
+         'indexed_text_array_1', 'indexed_text_array_2', 'indexed_text_array_3',
+         'indexed_boolean_2', 'indexed_boolean_3',
+         -- P30: every unindexed_* key as well
+         'unindexed_text_1', 'unindexed_text_2', 'unindexed_text_3',
+         'unindexed_timestamp_1', 'unindexed_timestamp_2', 'unindexed_timestamp_3',
+         'unindexed_number_1', 'unindexed_number_2', 'unindexed_number_3',
+         'unindexed_text_array_1', 'unindexed_text_array_2', 'unindexed_text_array_3',
+         'unindexed_boolean_1', 'unindexed_boolean_2', 'unindexed_boolean_3'])
+       WITH ORDINALITY AS a(k, o)
+  WHERE o <= w.width
+) c;
 
-/* ============================================================================
-   S7) Multi-key AND (two keys)
-   Purpose: compare JSONB containment with two pairs vs column equality AND.
 
-   Example (manual):
-     -- JSONB (single @> with two pairs → one GIN probe):
-     SELECT id FROM inv_jsonb
-     WHERE payload @> '{"indexed_text_1":"A","indexed_boolean_1":true}';
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_1 = 'A' AND indexed_boolean_1 = true;
+/* =============================================================================
+   Pagination (L1-L4): pages of {{limit}} rows (20 or 100) of the
+   indexed_text_1 = {{text}} group in (timestamp_1, id) order, the way an API
+   lists them, served by the (indexed_text_1, indexed_timestamp_1) composite
+   index and its JSONB expression twin (S10 sorts the whole group instead):
+     L1, L2  LIMIT {{limit}} OFFSET {{offset}}: page k reads and discards
+             (k - 1) * limit rows first
+     L3, L4  keyset: (ts, id) > ({{after_ts}}, {{after_id}}), the last row of
+             the previous page; every page starts with an index descent.
+             id breaks timestamp ties (an Incremental Sort over the index order)
+   Every query returns (id, ts). The defaults are page 1; the sweep points are
+   the rest of the sequence (pages 2-10, then 25, 50, 100, 250), run with
+   run_suite_for_size(..., p_sweep => true). bench.page_params turns "page"
+   into offset / cursor per label before each page is measured, and
+   bench.pagination lists latency per page.
    ========================================================================== */
--- cannot be used without indexes, as it cannot use GIN(jsonb_path_ops)
--- SELECT bench.run('jsonb_indexed','S7_and2',
--- $$SELECT id FROM inv_jsonb
--- WHERE payload @> '{"indexed_text_1":"A","indexed_boolean_1":true}'$$);
-
-SELECT bench.run('jsonb_indexed','S7_and2',
-$$SELECT id FROM inv_jsonb 
-WHERE (payload->>'indexed_text_1') = 'A' AND ((payload->>'indexed_boolean_1')::boolean) IS TRUE;
-$$);
-
--- cannot be used without indexes, as it cannot use GIN(jsonb_path_ops)
--- SELECT bench.run('jsonb_unindexed','S7_and2',
--- $$SELECT id FROM inv_jsonb
--- WHERE payload @> '{"unindexed_text_1":"A","unindexed_boolean_1":true}'$$);
-
--- S7_and2 : unindexed fields (functionally the same, will scan without indexes)
-SELECT bench.run('jsonb_unindexed','S7_and2',
-$$ SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_text_1') = 'A' AND ((payload->>'unindexed_boolean_1')::boolean) IS TRUE;
-$$);
-
-SELECT bench.run('rel_indexed','S7_and2',
-$$SELECT id FROM inv_rel WHERE indexed_text_1 = 'A' AND indexed_boolean_1 = true$$);
-
-SELECT bench.run('rel_unindexed','S7_and2',
-$$SELECT id FROM inv_rel WHERE unindexed_text_1 = 'A' AND unindexed_boolean_1 = true$$);
-
 
+SELECT bench.register_scenario(
+  format('L%s_offset_%s', l.pos, l.page_size), 'L' || l.pos,
+  format('Pagination: LIMIT %s OFFSET', l.page_size),
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id, payload->>'indexed_timestamp_1' AS ts FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+      ORDER BY payload->>'indexed_timestamp_1', id
+      LIMIT {{limit}} OFFSET {{offset}}$q$,
+    'jsonb_unindexed', $q$SELECT id, payload->>'unindexed_timestamp_1' AS ts FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+      ORDER BY payload->>'unindexed_timestamp_1', id
+      LIMIT {{limit}} OFFSET {{offset}}$q$,
+    'rel_indexed', $q$SELECT id, indexed_timestamp_1 AS ts FROM inv_rel
+      WHERE indexed_text_1 = {{text}}
+      ORDER BY indexed_timestamp_1, id
+      LIMIT {{limit}} OFFSET {{offset}}$q$,
+    'rel_unindexed', $q$SELECT id, unindexed_timestamp_1 AS ts FROM inv_rel
+      WHERE unindexed_text_1 = {{text}}
+      ORDER BY unindexed_timestamp_1, id
+      LIMIT {{limit}} OFFSET {{offset}}$q$,
+    'hybrid_indexed', $q$SELECT id, indexed_timestamp_1 AS ts FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}
+      ORDER BY indexed_timestamp_1, id
+      LIMIT {{limit}} OFFSET {{offset}}$q$),
+  p_params      => jsonb_build_object('text', 'A', 'limit', l.page_size, 'page', 1, 'offset', 0),
+  p_description => format('Pages of %s rows by LIMIT/OFFSET; deep pages skip (page - 1) x %s rows.',
+                          l.page_size, l.page_size),
+  p_ord         => 180 + l.pos * 4,
+  p_sweep       => (SELECT jsonb_agg(jsonb_build_object('point', 'page' || p, 'page', p) ORDER BY p)
+                    FROM unnest(ARRAY[2, 3, 4, 5, 6, 7, 8, 9, 10, 25, 50, 100, 250]) AS p))
+FROM (VALUES (1, 20), (2, 100)) AS l(pos, page_size);
+
+SELECT bench.register_scenario(
+  format('L%s_keyset_%s', l.pos, l.page_size), 'L' || l.pos,
+  format('Pagination: keyset, %s rows per page', l.page_size),
+  jsonb_build_object(
+    'jsonb_indexed', $q$SELECT id, payload->>'indexed_timestamp_1' AS ts FROM inv_jsonb
+      WHERE (payload->>'indexed_text_1') = {{text}}
+        AND (payload->>'indexed_timestamp_1', id) > ({{after_ts}}, {{after_id}})
+      ORDER BY payload->>'indexed_timestamp_1', id
+      LIMIT {{limit}}$q$,
+    'jsonb_unindexed', $q$SELECT id, payload->>'unindexed_timestamp_1' AS ts FROM inv_jsonb
+      WHERE (payload->>'unindexed_text_1') = {{text}}
+        AND (payload->>'unindexed_timestamp_1', id) > ({{after_ts}}, {{after_id}})
+      ORDER BY payload->>'unindexed_timestamp_1', id
+      LIMIT {{limit}}$q$,
+    'rel_indexed', $q$SELECT id, indexed_timestamp_1 AS ts FROM inv_rel
+      WHERE indexed_text_1 = {{text}}
+        AND (indexed_timestamp_1, id) > ({{after_ts}}::timestamptz, {{after_id}})
+      ORDER BY indexed_timestamp_1, id
+      LIMIT {{limit}}$q$,
+    'rel_unindexed', $q$SELECT id, unindexed_timestamp_1 AS ts FROM inv_rel
+      WHERE unindexed_text_1 = {{text}}
+        AND (unindexed_timestamp_1, id) > ({{after_ts}}::timestamptz, {{after_id}})
+      ORDER BY unindexed_timestamp_1, id
+      LIMIT {{limit}}$q$,
+    'hybrid_indexed', $q$SELECT id, indexed_timestamp_1 AS ts FROM inv_hybrid
+      WHERE indexed_text_1 = {{text}}
+        AND (indexed_timestamp_1, id) > ({{after_ts}}::timestamptz, {{after_id}})
+      ORDER BY indexed_timestamp_1, id
+      LIMIT {{limit}}$q$),
+  -- page 1 starts before every seeded timestamp (as text and as timestamptz)
+  p_params      => jsonb_build_object('text', 'A', 'limit', l.page_size, 'page', 1,
+                                      'after_ts', '0001-01-01T00:00:00.000Z', 'after_id', 0),
+  p_description => format('Pages of %s rows continuing after the (ts, id) of the previous page.',
+                          l.page_size),
+  p_ord         => 180 + l.pos * 4,
+  p_sweep       => (SELECT jsonb_agg(jsonb_build_object('point', 'page' || p, 'page', p) ORDER BY p)
+                    FROM unnest(ARRAY[2, 3, 4, 5, 6, 7, 8, 9, 10, 25, 50, 100, 250]) AS p))
+FROM (VALUES (3, 20), (4, 100)) AS l(pos, page_size);
 
-/* ============================================================================
-   S8) Multi-key AND (three keys: text + boolean + number)
-   Purpose: higher selectivity with three fields.
 
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE payload @> '{"indexed_text_1":"A","indexed_boolean_1":true,"indexed_number_1":100}';
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_1 = 'A' AND indexed_boolean_1 = true AND indexed_number_1 = 100;
+/* =============================================================================
+   Joins to relational dimension tables (J1-J3): the rows joined to
+   dim_customer_<c> (03_schema_dimensions.sql, bench.seed_dimensions) on the
+   invoice key, d.key = indexed_text_2 (payload->>'indexed_text_2' on the
+   JSONB labels), for c = 1k, 100k and 1m customers; only dataset rows
+   n <= c find their customer:
+     J1  lookup  a few rows (text_1 = {{text}} AND number_1 > {{num}}, ~38 per
+                 1M), each probing the customer primary key: nested loop
+     J2  group   the whole text_1 = {{text}} group (~1/26 of N) against the
+                 dimension: hash join while the dimension is small
+     J3  full    every row, matches counted per region: hash or merge join
+                 (both keys have a btree, the dimension PK and the text_2 index)
+   On the JSONB labels the join key is an expression; its statistics come
+   from the expression index (jsonb_indexed) or are defaults
+   (jsonb_unindexed). bench.joins reads the join type the planner chose from
+   the run's plan shape (bench.plan_shapes via shape_hash) and the estimated
+   vs actual rows of every node from its node_actuals (bench.node_metric).
    ========================================================================== */
 
--- cannot be used without indexes, as it cannot use GIN(jsonb_path_ops)
--- SELECT bench.run('jsonb_indexed','S8_and3',
--- $$SELECT id FROM inv_jsonb
--- WHERE payload @> '{"indexed_text_1":"A","indexed_boolean_1":true,"indexed_number_1":100}'$$);
-
-SELECT bench.run('jsonb_indexed','S8_and3',
-$$SELECT id
-FROM inv_jsonb WHERE (payload->>'indexed_text_1') = 'A' AND ((payload->>'indexed_boolean_1')::boolean) IS TRUE AND ((payload->>'indexed_number_1')::numeric) > 100::numeric;
-$$); 
-
--- cannot be used without indexes, as it cannot use GIN(jsonb_path_ops)
--- SELECT bench.run('jsonb_unindexed','S8_and3',
--- $$SELECT id FROM inv_jsonb
--- WHERE payload @> '{"unindexed_text_1":"A","unindexed_boolean_1":true,"unindexed_number_1":100}'$$);
-
-SELECT bench.run('jsonb_unindexed','S8_and3',
-$$SELECT id
-FROM inv_jsonb
-WHERE (payload->>'unindexed_text_1') = 'A' AND ((payload->>'unindexed_boolean_1')::boolean) IS TRUE AND ((payload->>'unindexed_number_1')::numeric) > 100::numeric;
-$$);
-
-
-SELECT bench.run('rel_indexed','S8_and3',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_1 = 'A' AND indexed_boolean_1 = true AND indexed_number_1 > 100$$);
-
-SELECT bench.run('rel_unindexed','S8_and3',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_1 = 'A' AND unindexed_boolean_1 = true AND unindexed_number_1 > 10$$);
+SELECT bench.register_scenario(
+  format('J1_lookup_%s', d.suffix), 'J1',
+  'Join: Selective Lookup by Key',
+  jsonb_build_object(
+    'jsonb_indexed', format($q$SELECT f.id, d.region FROM inv_jsonb f
+      JOIN %I d ON d.key = f.payload->>'indexed_text_2'
+      WHERE (f.payload->>'indexed_text_1') = {{text}}
+        AND ((f.payload->>'indexed_number_1')::numeric) > {{num}}$q$, d.name),
+    'jsonb_unindexed', format($q$SELECT f.id, d.region FROM inv_jsonb f
+      JOIN %I d ON d.key = f.payload->>'unindexed_text_2'
+      WHERE (f.payload->>'unindexed_text_1') = {{text}}
+        AND ((f.payload->>'unindexed_number_1')::numeric) > {{num}}$q$, d.name),
+    'rel_indexed', format($q$SELECT f.id, d.region FROM inv_rel f
+      JOIN %I d ON d.key = f.indexed_text_2
+      WHERE f.indexed_text_1 = {{text}} AND f.indexed_number_1 > {{num}}$q$, d.name),
+    'rel_unindexed', format($q$SELECT f.id, d.region FROM inv_rel f
+      JOIN %I d ON d.key = f.unindexed_text_2
+      WHERE f.unindexed_text_1 = {{text}} AND f.unindexed_number_1 > {{num}}$q$, d.name),
+    'hybrid_indexed', format($q$SELECT f.id, d.region FROM inv_hybrid f
+      JOIN %I d ON d.key = f.indexed_text_2
+      WHERE f.indexed_text_1 = {{text}} AND f.indexed_number_1 > {{num}}$q$, d.name)),
+  p_params      => jsonb_build_object('text', 'A', 'num', 999000, 'dim_rows', d.rows),
+  p_description => format('S1-style selective rows joined to %s customers by key.', d.rows),
+  p_ord         => 200 + d.pos)
+FROM (SELECT t.name, t.rows, t.pos, substring(t.name FROM '_([^_]+)$') AS suffix
+      FROM bench.dimension_tables() WITH ORDINALITY AS t(name, rows, pos)) d;
+
+SELECT bench.register_scenario(
+  format('J2_group_%s', d.suffix), 'J2',
+  'Join: Group to Dimension',
+  jsonb_build_object(
+    'jsonb_indexed', format($q$SELECT f.id, d.region FROM inv_jsonb f
+      JOIN %I d ON d.key = f.payload->>'indexed_text_2'
+      WHERE (f.payload->>'indexed_text_1') = {{text}}$q$, d.name),
+    'jsonb_unindexed', format($q$SELECT f.id, d.region FROM inv_jsonb f
+      JOIN %I d ON d.key = f.payload->>'unindexed_text_2'
+      WHERE (f.payload->>'unindexed_text_1') = {{text}}$q$, d.name),
+    'rel_indexed', format($q$SELECT f.id, d.region FROM inv_rel f
+      JOIN %I d ON d.key = f.indexed_text_2
+      WHERE f.indexed_text_1 = {{text}}$q$, d.name),
+    'rel_unindexed', format($q$SELECT f.id, d.region FROM inv_rel f
+      JOIN %I d ON d.key = f.unindexed_text_2
+      WHERE f.unindexed_text_1 = {{text}}$q$, d.name),
+    'hybrid_indexed', format($q$SELECT f.id, d.region FROM inv_hybrid f
+      JOIN %I d ON d.key = f.indexed_text_2
+      WHERE f.indexed_text_1 = {{text}}$q$, d.name)),
+  p_params      => jsonb_build_object('text', 'A', 'dim_rows', d.rows),
+  p_description => format('The text_1 group (~1/26 of N) joined to %s customers by key.', d.rows),
+  p_ord         => 203 + d.pos)
+FROM (SELECT t.name, t.rows, t.pos, substring(t.name FROM '_([^_]+)$') AS suffix
+      FROM bench.dimension_tables() WITH ORDINALITY AS t(name, rows, pos)) d;
+
+SELECT bench.register_scenario(
+  format('J3_full_%s', d.suffix), 'J3',
+  'Join: Full Table, Count per Region',
+  jsonb_build_object(
+    'jsonb_indexed', format($q$SELECT d.region, COUNT(*) AS cnt FROM inv_jsonb f
+      JOIN %I d ON d.key = f.payload->>'indexed_text_2'
+      GROUP BY d.region$q$, d.name),
+    'jsonb_unindexed', format($q$SELECT d.region, COUNT(*) AS cnt FROM inv_jsonb f
+      JOIN %I d ON d.key = f.payload->>'unindexed_text_2'
+      GROUP BY d.region$q$, d.name),
+    'rel_indexed', format($q$SELECT d.region, COUNT(*) AS cnt FROM inv_rel f
+      JOIN %I d ON d.key = f.indexed_text_2
+      GROUP BY d.region$q$, d.name),
+    'rel_unindexed', format($q$SELECT d.region, COUNT(*) AS cnt FROM inv_rel f
+      JOIN %I d ON d.key = f.unindexed_text_2
+      GROUP BY d.region$q$, d.name),
+    'hybrid_indexed', format($q$SELECT d.region, COUNT(*) AS cnt FROM inv_hybrid f
+      JOIN %I d ON d.key = f.indexed_text_2
+      GROUP BY d.region$q$, d.name)),
+  p_params      => jsonb_build_object('dim_rows', d.rows),
+  p_description => format('Every row joined to %s customers; matches counted per region.', d.rows),
+  p_ord         => 206 + d.pos)
+FROM (SELECT t.name, t.rows, t.pos, substring(t.name FROM '_([^_]+)$') AS suffix
+      FROM bench.dimension_tables() WITH ORDINALITY AS t(name, rows, pos)) d;
 
 
-/* ============================================================================
-   S9) OR across keys
-   Purpose: broader retrieval via OR of selective predicates.
-
-   Example (manual):
-     -- JSONB (BitmapOr of two @> probes):
-     SELECT id FROM inv_jsonb
-     WHERE payload @> '{"indexed_text_1":"A"}'
-        OR payload @> '{"indexed_boolean_1":true}';
-
-     -- Relational (OR of two indexed columns):
-     SELECT id FROM inv_rel
-     WHERE indexed_text_1 = 'A' OR indexed_boolean_1 = true;
-   ========================================================================== */
-
--- cannot be used without indexes, as it cannot use GIN(jsonb_path_ops)
--- SELECT bench.run('jsonb_indexed','S9_or_keys',
--- $$SELECT id FROM inv_jsonb
---   WHERE payload @> '{"indexed_text_1":"A"}'
---      OR payload @> '{"indexed_boolean_1":true}'$$);
-
-SELECT bench.run('jsonb_indexed','S9_or_keys',
-$$ SELECT id
-FROM inv_jsonb
-WHERE (payload->>'indexed_text_1') = 'A' OR ((payload->>'indexed_boolean_1')::boolean) IS TRUE;
-$$);
-
--- cannot be used without indexes, as it cannot use GIN(jsonb_path_ops)
--- SELECT bench.run('jsonb_unindexed','S9_or_keys',
--- $$SELECT id FROM inv_jsonb
--- WHERE payload @> '{"unindexed_text_1":"A"}' OR payload @> '{"unindexed_boolean_1":true}'$$);
-
--- S9_or_keys : unindexed fields (functionally same; will still scan without indexes)
-SELECT bench.run('jsonb_unindexed','S9_or_keys',
-$$ SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_text_1') = 'A' OR ((payload->>'unindexed_boolean_1')::boolean) IS TRUE;
-$$);
-
-SELECT bench.run('rel_indexed','S9_or_keys',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_1 = 'A' OR indexed_boolean_1 = true$$);
-
-SELECT bench.run('rel_unindexed','S9_or_keys',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_1 = 'A' OR unindexed_boolean_1 = true$$);
-
-
-
-/* ============================================================================
-   S10) Top-N ordering within a group
-   Purpose: ORDER BY compatibility and index support.
-
-   Example (manual):
-     -- JSONB:
-     SELECT id FROM inv_jsonb
-     WHERE (payload->>'indexed_text_1') = 'A'
-     ORDER BY (payload->>'indexed_timestamp_1');
-
-     -- Relational:
-     SELECT id FROM inv_rel
-     WHERE indexed_text_1 = 'A'
-     ORDER BY indexed_timestamp_1;
+/* =============================================================================
+   Write scenarios (kind 'write'): run by bench.run_write, each execution
+   rolled back in a subtransaction, so the dataset stays as seeded. Inserts
+   and deletes touch every index of the table, so they only have the
+   *_indexed labels; updates compare changing an indexed vs an unindexed key
+   (jsonb_set rewrites the whole payload either way). The relational
+   inserts copy every column but id (listed from pg_attribute); the hybrid
+   ones copy only the payload, its generated columns are recomputed.
    ========================================================================== */
-SELECT bench.run('jsonb_indexed','S10_topn_order',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'indexed_text_1') = 'A'
-ORDER BY (payload->>'indexed_timestamp_1')$$);
-
-SELECT bench.run('jsonb_unindexed','S10_topn_order',
-$$SELECT id FROM inv_jsonb
-WHERE (payload->>'unindexed_text_1') = 'A'
-ORDER BY (payload->>'unindexed_timestamp_1')$$);
-
-SELECT bench.run('rel_indexed','S10_topn_order',
-$$SELECT id FROM inv_rel
-WHERE indexed_text_1 = 'A'
-ORDER BY indexed_timestamp_1$$);
-
-SELECT bench.run('rel_unindexed','S10_topn_order',
-$$SELECT id FROM inv_rel
-WHERE unindexed_text_1 = 'A'
-ORDER BY unindexed_timestamp_1$$);
 
+/* W1) Single-row INSERT (copy of row {{id}}) */
+SELECT bench.register_scenario(
+  'W1_insert_single', 'W1', 'Single-row INSERT',
+  jsonb_build_object(
+    'jsonb_indexed', $q$INSERT INTO inv_jsonb (payload)
+      SELECT payload FROM inv_jsonb WHERE id = {{id}}$q$,
+    'rel_indexed', format($q$INSERT INTO inv_rel (%1$s)
+      SELECT %1$s FROM inv_rel WHERE id = {{id}}$q$, c.cols),
+    'hybrid_indexed', $q$INSERT INTO inv_hybrid (payload)
+      SELECT payload FROM inv_hybrid WHERE id = {{id}}$q$,
+    'jsonb_gin_containment', $q$INSERT INTO inv_jsonb_gin (payload)
+      SELECT payload FROM inv_jsonb_gin WHERE id = {{id}}$q$),
+  p_params      => '{"id": 1}',
+  p_description => 'One row per statement; maintains every index of the table.',
+  p_ord         => 210,
+  p_kind        => 'write')
+FROM (SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) AS cols
+      FROM pg_attribute
+      WHERE attrelid = 'inv_rel'::regclass AND attnum > 0
+        AND NOT attisdropped AND attname <> 'id') c;
+
+/* W2) Batched INSERT ({{batch}} rows per statement) */
+SELECT bench.register_scenario(
+  'W2_insert_batch', 'W2', 'Batched INSERT',
+  jsonb_build_object(
+    'jsonb_indexed', $q$INSERT INTO inv_jsonb (payload)
+      SELECT payload FROM inv_jsonb WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'rel_indexed', format($q$INSERT INTO inv_rel (%1$s)
+      SELECT %1$s FROM inv_rel WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$, c.cols),
+    'hybrid_indexed', $q$INSERT INTO inv_hybrid (payload)
+      SELECT payload FROM inv_hybrid WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'jsonb_gin_containment', $q$INSERT INTO inv_jsonb_gin (payload)
+      SELECT payload FROM inv_jsonb_gin WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$),
+  p_params      => '{"id": 1, "batch": 1000}',
+  p_description => 'INSERT ... SELECT of a 1000-row id range.',
+  p_ord         => 220,
+  p_kind        => 'write')
+FROM (SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) AS cols
+      FROM pg_attribute
+      WHERE attrelid = 'inv_rel'::regclass AND attnum > 0
+        AND NOT attisdropped AND attname <> 'id') c;
+
+/* W3) Single-key UPDATE of one row
+   Purpose: jsonb_set (new payload, new entries in every payload index)
+   vs one relational column (HOT when the column is unindexed and the
+   page has room). */
+SELECT bench.register_scenario(
+  'W3_update_key', 'W3', 'Single-key UPDATE (one row)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$UPDATE inv_jsonb
+      SET payload = jsonb_set(payload, '{indexed_number_1}',
+                              to_jsonb((payload->>'indexed_number_1')::numeric + 1))
+      WHERE id = {{id}}$q$,
+    'jsonb_unindexed', $q$UPDATE inv_jsonb
+      SET payload = jsonb_set(payload, '{unindexed_number_1}',
+                              to_jsonb((payload->>'unindexed_number_1')::numeric + 1))
+      WHERE id = {{id}}$q$,
+    'rel_indexed', $q$UPDATE inv_rel SET indexed_number_1 = indexed_number_1 + 1
+      WHERE id = {{id}}$q$,
+    'rel_unindexed', $q$UPDATE inv_rel SET unindexed_number_1 = unindexed_number_1 + 1
+      WHERE id = {{id}}$q$,
+    'hybrid_indexed', $q$UPDATE inv_hybrid
+      SET payload = jsonb_set(payload, '{indexed_number_1}',
+                              to_jsonb((payload->>'indexed_number_1')::numeric + 1))
+      WHERE id = {{id}}$q$,
+    'jsonb_gin_containment', $q$UPDATE inv_jsonb_gin
+      SET payload = jsonb_set(payload, '{indexed_number_1}',
+                              to_jsonb((payload->>'indexed_number_1')::numeric + 1))
+      WHERE id = {{id}}$q$),
+  p_params      => '{"id": 1}',
+  p_description => 'jsonb_set single-key update vs relational single-column update.',
+  p_ord         => 230,
+  p_kind        => 'write');
+
+/* W4) Single-key UPDATE of {{batch}} rows */
+SELECT bench.register_scenario(
+  'W4_update_batch', 'W4', 'Single-key UPDATE (batch)',
+  jsonb_build_object(
+    'jsonb_indexed', $q$UPDATE inv_jsonb
+      SET payload = jsonb_set(payload, '{indexed_number_1}',
+                              to_jsonb((payload->>'indexed_number_1')::numeric + 1))
+      WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'jsonb_unindexed', $q$UPDATE inv_jsonb
+      SET payload = jsonb_set(payload, '{unindexed_number_1}',
+                              to_jsonb((payload->>'unindexed_number_1')::numeric + 1))
+      WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'rel_indexed', $q$UPDATE inv_rel SET indexed_number_1 = indexed_number_1 + 1
+      WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'rel_unindexed', $q$UPDATE inv_rel SET unindexed_number_1 = unindexed_number_1 + 1
+      WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'hybrid_indexed', $q$UPDATE inv_hybrid
+      SET payload = jsonb_set(payload, '{indexed_number_1}',
+                              to_jsonb((payload->>'indexed_number_1')::numeric + 1))
+      WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'jsonb_gin_containment', $q$UPDATE inv_jsonb_gin
+      SET payload = jsonb_set(payload, '{indexed_number_1}',
+                              to_jsonb((payload->>'indexed_number_1')::numeric + 1))
+      WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$),
+  p_params      => '{"id": 1, "batch": 1000}',
+  p_description => 'Same updates over a 1000-row id range.',
+  p_ord         => 240,
+  p_kind        => 'write');
+
+/* W5) Single-row DELETE */
+SELECT bench.register_scenario(
+  'W5_delete_single', 'W5', 'Single-row DELETE',
+  jsonb_build_object(
+    'jsonb_indexed', $q$DELETE FROM inv_jsonb WHERE id = {{id}}$q$,
+    'rel_indexed',   $q$DELETE FROM inv_rel WHERE id = {{id}}$q$,
+    'hybrid_indexed', $q$DELETE FROM inv_hybrid WHERE id = {{id}}$q$,
+    'jsonb_gin_containment', $q$DELETE FROM inv_jsonb_gin WHERE id = {{id}}$q$),
+  p_params      => '{"id": 1}',
+  p_description => 'Delete by primary key.',
+  p_ord         => 250,
+  p_kind        => 'write');
+
+/* W6) Batched DELETE */
+SELECT bench.register_scenario(
+  'W6_delete_batch', 'W6', 'Batched DELETE',
+  jsonb_build_object(
+    'jsonb_indexed', $q$DELETE FROM inv_jsonb WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'rel_indexed',   $q$DELETE FROM inv_rel WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'hybrid_indexed', $q$DELETE FROM inv_hybrid WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$,
+    'jsonb_gin_containment', $q$DELETE FROM inv_jsonb_gin WHERE id BETWEEN {{id}} AND {{id}} + {{batch}} - 1$q$),
+  p_params      => '{"id": 1, "batch": 1000}',
+  p_description => 'Delete a 1000-row id range.',
+  p_ord         => 260,
+  p_kind        => 'write');
 
 /* =============================================================================
-   After running this file:
-     SELECT * FROM bench.summary
-     WHERE label IN ('jsonb_indexed','jsonb_unindexed','rel_indexed','rel_unindexed')
-     ORDER BY label, variant;
-
-   To inspect plans for one scenario:
-     SELECT run_no, execution_ms, jsonb_pretty(plan_json)
-     FROM bench.results
-     WHERE label='jsonb_indexed' AND variant='S7_and2'
-     ORDER BY run_no;
-
-   To re-run cleanly later:
-     SELECT bench.clear('jsonb_indexed');
-     SELECT bench.clear('jsonb_unindexed');
-     SELECT bench.clear('rel_indexed');
-     SELECT bench.clear('rel_unindexed');
+   After editing this file, re-apply it to a running database:
+     psql -f db/initdb.d/06_queries_bench.sql
+   Rendered SQL of one scenario/label:
+     SELECT bench.render_sql(queries->>'rel_indexed', params)
+     FROM bench.scenarios WHERE variant = 'S1_expr_eq_num';
+   Plans for every scenario on the loaded dataset:
+     psql -f query_plans.sql
 ============================================================================= */
@@ -1,22 +1,100 @@
 \set ON_ERROR_STOP on
 
 -- =========================================================
--- Seeds inv_rel + inv_jsonb with identical values
--- Uses a per-batch TEMP TABLE so both inserts share the same rows
+-- Seeds inv_rel + inv_jsonb + inv_jsonb_gin + inv_hybrid with identical values
+-- Uses a per-batch TEMP TABLE so all inserts share the same rows
+-- (inv_jsonb_gin and inv_hybrid get the inv_jsonb payloads; the
+-- inv_hybrid columns are generated)
+--   p_seed: NULL = timestamps/numbers from random() (differs per seeding)
+--           k    = every column derived from (row number, k) via
+--                  bench.hash_u31; same (p_rows, k) => identical data,
+--                  identical to seed_copy.py --seed k
+-- ids are the row numbers 1..p_rows in both tables.
+--   p_append: true = grow the current dataset instead of rebuilding it:
+--             only rows (current N, p_rows] are generated and inserted,
+--             indexes are maintained in place. With a seed the result is
+--             row-for-row the same as a fresh seeding of p_rows.
+--   p_doc_kb: large documents: every payload gets an "extra" key with
+--             about p_doc_kb KiB of nested objects, arrays and text
+--             (bench.doc_extra); the 30 benchmark keys and inv_rel are
+--             unchanged, so every scenario runs as before
+--   p_compression: 'pglz' | 'lz4' = default_toast_compression for the
+--             seeding (compressed values keep their method when copied
+--             into inv_jsonb_gin / inv_hybrid); NULL = server default
 -- =========================================================
-CREATE OR REPLACE PROCEDURE bench.seed_both(p_rows BIGINT,
-                                            p_batch BIGINT DEFAULT 1000000)
+SELECT bench.drop_routines('seed_both');
+
+CREATE OR REPLACE PROCEDURE bench.seed_both(p_rows   BIGINT,
+                                            p_batch  BIGINT  DEFAULT 1000000,
+                                            p_seed   BIGINT  DEFAULT NULL,
+                                            p_append BOOLEAN DEFAULT false,
+                                            p_doc_kb INT     DEFAULT 0,
+                                            p_compression TEXT DEFAULT NULL)
 LANGUAGE plpgsql AS $proc$
 DECLARE
   batch_start BIGINT := 1;
   batch_end   BIGINT;
+  h_seed      BIGINT := COALESCE(p_seed, 0);
+  v_cur_rel   BIGINT;
+  v_cur_json  BIGINT;
+  v_cur_hyb   BIGINT;
+  v_cur_gin   BIGINT;
+  v_cur_seed  BIGINT;
+  v_cur_doc   bench.dataset%ROWTYPE;
 BEGIN
+  IF p_doc_kb IS NULL OR p_doc_kb < 0 THEN
+    RAISE EXCEPTION 'bench.seed_both: p_doc_kb must be >= 0';
+  END IF;
+  IF p_compression IS NOT NULL THEN
+    IF p_compression NOT IN ('pglz', 'lz4') THEN
+      RAISE EXCEPTION 'bench.seed_both: unknown TOAST compression % (expected pglz|lz4)', p_compression;
+    END IF;
+    PERFORM set_config('default_toast_compression', p_compression, true);
+  END IF;
   PERFORM set_config('synchronous_commit','off', true);
   PERFORM set_config('jit','off', true);
   PERFORM set_config('maintenance_work_mem','2GB', true);
   PERFORM set_config('work_mem','128MB', true);
 
-  TRUNCATE inv_rel, inv_jsonb RESTART IDENTITY;
+  IF p_append THEN
+    SELECT COALESCE(max(id), 0) INTO v_cur_rel  FROM inv_rel;
+    SELECT COALESCE(max(id), 0) INTO v_cur_json FROM inv_jsonb;
+    SELECT COALESCE(max(id), 0) INTO v_cur_hyb  FROM inv_hybrid;
+    SELECT COALESCE(max(id), 0) INTO v_cur_gin  FROM inv_jsonb_gin;
+    SELECT seed INTO v_cur_seed FROM bench.dataset;
+    SELECT * INTO v_cur_doc FROM bench.dataset;
+
+    IF v_cur_rel <> v_cur_json THEN
+      RAISE EXCEPTION 'bench.seed_both: cannot append, inv_rel has % rows but inv_jsonb has %',
+        v_cur_rel, v_cur_json;
+    END IF;
+    IF v_cur_rel <> v_cur_hyb THEN
+      RAISE EXCEPTION 'bench.seed_both: cannot append, inv_rel has % rows but inv_hybrid has %',
+        v_cur_rel, v_cur_hyb;
+    END IF;
+    IF v_cur_rel <> v_cur_gin THEN
+      RAISE EXCEPTION 'bench.seed_both: cannot append, inv_rel has % rows but inv_jsonb_gin has %',
+        v_cur_rel, v_cur_gin;
+    END IF;
+    IF v_cur_rel > p_rows THEN
+      RAISE EXCEPTION 'bench.seed_both: cannot append, current N=% is larger than %',
+        v_cur_rel, p_rows;
+    END IF;
+    IF v_cur_rel > 0 AND v_cur_seed IS DISTINCT FROM p_seed THEN
+      RAISE EXCEPTION 'bench.seed_both: cannot append with seed %, current dataset has seed %',
+        COALESCE(p_seed::text, 'NULL'), COALESCE(v_cur_seed::text, 'NULL');
+    END IF;
+    IF v_cur_rel > 0 AND (v_cur_doc.doc_kb IS DISTINCT FROM p_doc_kb
+                          OR v_cur_doc.toast_compression IS DISTINCT FROM p_compression) THEN
+      RAISE EXCEPTION 'bench.seed_both: cannot append with doc_kb=% / compression=%, current dataset has %/%',
+        p_doc_kb, COALESCE(p_compression, 'default'),
+        v_cur_doc.doc_kb, COALESCE(v_cur_doc.toast_compression, 'default');
+    END IF;
+
+    batch_start := v_cur_rel + 1;
+  ELSE
+    TRUNCATE inv_rel, inv_jsonb, inv_jsonb_gin, inv_hybrid RESTART IDENTITY;
+  END IF;
 
   WHILE batch_start <= p_rows LOOP
     batch_end := LEAST(batch_start + p_batch - 1, p_rows);
@@ -29,33 +107,53 @@ BEGIN
              [ ((g % 6)::int) + 1 ]                                AS t3,
 
            -- FIXED timestamp generation (no text->interval cast)
-           (now() - (interval '1 day' * (random()*365))) AS ts1,
-           (now() - (interval '1 day' * (random()*365))) AS ts2,
-           (now() - (interval '1 day' * (random()*365))) AS ts3,
-
-           round((random()*1000000)::numeric, 2)          AS num1,
-           round((random()*1000000)::numeric, 2)          AS num2,
-           round((random()*1000000)::numeric, 2)          AS num3,
+           -- seeded: whole seconds within the year before 2025-10-01 UTC (streams 1..3)
+           CASE WHEN p_seed IS NULL THEN now() - (interval '1 day' * (random()*365))
+                ELSE timestamptz '2025-10-01 00:00:00+00'
+                     - make_interval(secs => bench.hash_u31(h_seed, g, 1) % 31536000) END AS ts1,
+           CASE WHEN p_seed IS NULL THEN now() - (interval '1 day' * (random()*365))
+                ELSE timestamptz '2025-10-01 00:00:00+00'
+                     - make_interval(secs => bench.hash_u31(h_seed, g, 2) % 31536000) END AS ts2,
+           CASE WHEN p_seed IS NULL THEN now() - (interval '1 day' * (random()*365))
+                ELSE timestamptz '2025-10-01 00:00:00+00'
+                     - make_interval(secs => bench.hash_u31(h_seed, g, 3) % 31536000) END AS ts3,
+
+           -- seeded: cents in [0, 1e8) (streams 4..6)
+           CASE WHEN p_seed IS NULL THEN round((random()*1000000)::numeric, 2)
+                ELSE round((bench.hash_u31(h_seed, g, 4) % 100000000)::numeric / 100, 2) END AS num1,
+           CASE WHEN p_seed IS NULL THEN round((random()*1000000)::numeric, 2)
+                ELSE round((bench.hash_u31(h_seed, g, 5) % 100000000)::numeric / 100, 2) END AS num2,
+           CASE WHEN p_seed IS NULL THEN round((random()*1000000)::numeric, 2)
+                ELSE round((bench.hash_u31(h_seed, g, 6) % 100000000)::numeric / 100, 2) END AS num3,
 
            (g % 2 = 0) AS b1,
            (g % 3 = 0) AS b2,
            (g % 5 = 0) AS b3,
 
+           -- array membership via bench.hash_u31 (streams 10+k / 20+k / 30+k),
+           -- mirrored by seed_copy.py
            (SELECT ARRAY(
-              SELECT t FROM unnest(ARRAY['kyc','aml','custody','onboard','priority','tax']) t
-              WHERE (abs(hashtext(t||g::text)) % 100) < 35
+              SELECT t FROM unnest(ARRAY['kyc','aml','custody','onboard','priority','tax'])
+                            WITH ORDINALITY AS u(t, k)
+              WHERE bench.hash_u31(h_seed, g, 10 + k) % 100 < 35
+              ORDER BY k
             )) AS arr1,
            (SELECT ARRAY(
-              SELECT t FROM unnest(ARRAY['grpA','grpB','grpC','grpD']) t
-              WHERE (abs(hashtext(t||g::text)) % 100) < 50
+              SELECT t FROM unnest(ARRAY['grpA','grpB','grpC','grpD'])
+                            WITH ORDINALITY AS u(t, k)
+              WHERE bench.hash_u31(h_seed, g, 20 + k) % 100 < 50
+              ORDER BY k
             )) AS arr2,
            (SELECT ARRAY(
-              SELECT t FROM unnest(ARRAY['X','Y','Z']) t
-              WHERE (abs(hashtext(t||g::text)) % 100) < 50
+              SELECT t FROM unnest(ARRAY['X','Y','Z'])
+                            WITH ORDINALITY AS u(t, k)
+              WHERE bench.hash_u31(h_seed, g, 30 + k) % 100 < 50
+              ORDER BY k
             )) AS arr3
     FROM generate_series(batch_start, batch_end) AS g;
 
     INSERT INTO inv_rel(
+      id,
       indexed_text_1, indexed_text_2, indexed_text_3,
       unindexed_text_1, unindexed_text_2, unindexed_text_3,
       indexed_timestamp_1, indexed_timestamp_2, indexed_timestamp_3,
@@ -68,6 +166,7 @@ BEGIN
       unindexed_boolean_1, unindexed_boolean_2, unindexed_boolean_3
     )
     SELECT
+      n,
       t1, t2, t3,
       t1, t2, t3,
       ts1, ts2, ts3,
@@ -80,8 +179,8 @@ BEGIN
       b1, b2, b3
     FROM _gen_tmp;
 
-    INSERT INTO inv_jsonb(payload)
-    SELECT jsonb_build_object(
+    INSERT INTO inv_jsonb(id, payload)
+    SELECT n, jsonb_build_object(
       'indexed_text_1', t1,
       'indexed_text_2', t2,
       'indexed_text_3', t3,
@@ -116,284 +215,418 @@ BEGIN
       'unindexed_boolean_1', b1,
       'unindexed_boolean_2', b2,
       'unindexed_boolean_3', b3
-    )
+    ) || CASE WHEN p_doc_kb > 0
+              THEN jsonb_build_object('extra', bench.doc_extra(h_seed, n, p_doc_kb))
+              ELSE '{}'::jsonb END
     FROM _gen_tmp;
 
+    INSERT INTO inv_jsonb_gin(id, payload)
+    SELECT id, payload FROM inv_jsonb WHERE id BETWEEN batch_start AND batch_end;
+
+    INSERT INTO inv_hybrid(id, payload)
+    SELECT id, payload FROM inv_jsonb WHERE id BETWEEN batch_start AND batch_end;
+
     DROP TABLE IF EXISTS _gen_tmp;
     batch_start := batch_end + 1;
   END LOOP;
 
+  PERFORM setval(pg_get_serial_sequence('inv_rel', 'id'),   GREATEST(p_rows, 1));
+  PERFORM setval(pg_get_serial_sequence('inv_jsonb', 'id'), GREATEST(p_rows, 1));
+  PERFORM setval(pg_get_serial_sequence('inv_jsonb_gin', 'id'), GREATEST(p_rows, 1));
+  PERFORM setval(pg_get_serial_sequence('inv_hybrid', 'id'), GREATEST(p_rows, 1));
+  PERFORM bench.record_dataset(p_rows, p_seed, 'seed_both', p_doc_kb, p_compression);
+
   ANALYZE inv_rel;
   ANALYZE inv_jsonb;
+  ANALYZE inv_jsonb_gin;
+  ANALYZE inv_hybrid;
 END;
 $proc$;
 
 -- =========================================================
--- Driver: seed to N and run S1..S10 for all groups
+-- bench.seed_dimensions()
+-- Fills the dimension tables of the join scenarios
+-- (bench.dimension_tables): dim_customer_<c> holds keys 'INV' +
+-- 7 digits of k = 1..c with name / region (8) / tier (1-5)
+-- derived from bench.hash_u31(0, k, ...). They do not depend on
+-- N or the dataset seed, so only a table whose row count is off
+-- is (re)filled; run_suite_for_size calls it.
+-- =========================================================
+CREATE OR REPLACE FUNCTION bench.seed_dimensions() RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  d     RECORD;
+  v_cnt BIGINT;
+BEGIN
+  FOR d IN SELECT * FROM bench.dimension_tables() LOOP
+    EXECUTE format('SELECT count(*) FROM %I', d.name) INTO v_cnt;
+    CONTINUE WHEN v_cnt = d.rows;
+    EXECUTE format('TRUNCATE %I', d.name);
+    EXECUTE format($sql$
+      INSERT INTO %I (key, name, region, tier)
+      SELECT 'INV' || to_char(k, 'FM0000000'),
+             'customer-' || left(md5(k::text), 12),
+             (ARRAY['north','south','east','west','central','coastal','alpine','metro'])
+               [bench.hash_u31(0, k, 50) %% 8 + 1],
+             1 + bench.hash_u31(0, k, 51) %% 5
+      FROM generate_series(1, %s) AS k$sql$, d.name, d.rows);
+    EXECUTE format('ANALYZE %I', d.name);
+    RAISE NOTICE 'seed_dimensions: % filled with % rows', d.name, d.rows;
+  END LOOP;
+END;
+$$;
+
+-- =========================================================
+-- Dataset snapshots, one schema per (N, seed)
+--
+-- A snapshot is the seeded + indexed dataset tables parked
+-- in schema snap_n<N>_s<seed>. Tables are moved with
+-- ALTER TABLE ... SET SCHEMA, so parking and restoring only touch
+-- the catalog and take seconds at any N (statistics, visibility
+-- map and indexes move with the tables). Only seeded datasets are
+-- parked. A restored dataset is the active one (bench.dataset)
+-- until it is parked again.
+--
+--   bench.snapshot_park()             active dataset -> its snapshot,
+--                                     leaves empty tables behind
+--   bench.snapshot_restore(N, seed)   snapshot -> active (parks the
+--                                     current one first); false if none
+--   bench.snapshot_use(N, seed)       true if (N, seed) is active now,
+--                                     restoring it if needed
+--   bench.snapshot_drop(N, seed)      delete a snapshot
+-- =========================================================
+CREATE OR REPLACE FUNCTION bench.dataset_tables() RETURNS TEXT[]
+LANGUAGE sql IMMUTABLE AS
+$$ SELECT ARRAY['inv_rel', 'inv_jsonb', 'inv_jsonb_gin', 'inv_hybrid'] $$;
+
+CREATE OR REPLACE FUNCTION bench.snapshot_schema(p_rows BIGINT, p_seed BIGINT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS
+$$ SELECT format('snap_n%s_s%s', p_rows, replace(p_seed::text, '-', 'm')) $$;
+
+-- Empty public.<table> shaped like <schema>.<table>: same columns,
+-- defaults, constraints and index names, with a new id sequence.
+CREATE OR REPLACE FUNCTION bench.clone_empty_table(p_schema TEXT, p_table TEXT) RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  r RECORD;
+BEGIN
+  EXECUTE format('CREATE TABLE public.%I (LIKE %I.%I INCLUDING ALL EXCLUDING INDEXES)',
+                 p_table, p_schema, p_table);
+  EXECUTE format('CREATE SEQUENCE public.%I OWNED BY public.%I.id', p_table || '_id_seq', p_table);
+  EXECUTE format('ALTER TABLE public.%I ALTER COLUMN id SET DEFAULT nextval(%L::regclass)',
+                 p_table, format('public.%I', p_table || '_id_seq'));
+
+  FOR r IN
+    SELECT x.indexrelid, c.oid AS conoid, c.conname
+    FROM pg_index x
+    LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid
+    WHERE x.indrelid = format('%I.%I', p_schema, p_table)::regclass
+  LOOP
+    IF r.conoid IS NOT NULL THEN
+      EXECUTE format('ALTER TABLE public.%I ADD CONSTRAINT %I %s',
+                     p_table, r.conname, pg_get_constraintdef(r.conoid));
+    ELSE
+      EXECUTE replace(pg_get_indexdef(r.indexrelid),
+                      ' ON ' || quote_ident(p_schema) || '.', ' ON public.');
+    END IF;
+  END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.snapshot_park() RETURNS TEXT
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  d   bench.dataset%ROWTYPE;
+  s   TEXT;
+  t   TEXT;
+  cur BIGINT;
+BEGIN
+  SELECT * INTO d FROM bench.dataset;
+  IF NOT FOUND OR d.seed IS NULL THEN
+    RETURN NULL;                                  -- nothing reproducible to keep
+  END IF;
+  IF d.doc_kb <> 0 OR d.toast_compression IS NOT NULL THEN
+    RETURN NULL;                                  -- snapshots are keyed by (N, seed): default shape only
+  END IF;
+
+  SELECT COALESCE(max(id), 0) INTO cur FROM inv_rel;
+  IF cur <> d.rows THEN
+    RAISE NOTICE 'bench.snapshot_park: inv_rel has % rows, bench.dataset says %; not parked', cur, d.rows;
+    RETURN NULL;
+  END IF;
+  IF EXISTS (SELECT 1 FROM bench.snapshots WHERE rows = d.rows AND seed = d.seed) THEN
+    RETURN NULL;                                  -- already have this one
+  END IF;
+
+  s := bench.snapshot_schema(d.rows, d.seed);
+  EXECUTE format('CREATE SCHEMA %I', s);
+  FOREACH t IN ARRAY bench.dataset_tables() LOOP
+    EXECUTE format('ALTER TABLE public.%I SET SCHEMA %I', t, s);
+    PERFORM bench.clone_empty_table(s, t);
+  END LOOP;
+
+  INSERT INTO bench.snapshots (rows, seed, schema_name, generator, fingerprint, seeded_at)
+  VALUES (d.rows, d.seed, s, d.generator, d.fingerprint, d.seeded_at);
+  DELETE FROM bench.dataset;
+  RETURN s;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.snapshot_restore(p_rows BIGINT, p_seed BIGINT) RETURNS BOOLEAN
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  sn bench.snapshots%ROWTYPE;
+  t  TEXT;
+BEGIN
+  SELECT * INTO sn FROM bench.snapshots WHERE rows = p_rows AND seed = p_seed;
+  IF NOT FOUND THEN
+    RETURN false;
+  END IF;
+
+  PERFORM bench.snapshot_park();
+  FOREACH t IN ARRAY bench.dataset_tables() LOOP
+    EXECUTE format('DROP TABLE public.%I', t);
+    EXECUTE format('ALTER TABLE %I.%I SET SCHEMA public', sn.schema_name, t);
+  END LOOP;
+  EXECUTE format('DROP SCHEMA %I', sn.schema_name);
+  DELETE FROM bench.snapshots WHERE rows = p_rows AND seed = p_seed;
+
+  INSERT INTO bench.dataset (singleton, rows, seed, generator, fingerprint, seeded_at)
+  VALUES (true, sn.rows, sn.seed, sn.generator, sn.fingerprint, sn.seeded_at)
+  ON CONFLICT (singleton) DO UPDATE
+    SET rows = EXCLUDED.rows, seed = EXCLUDED.seed, generator = EXCLUDED.generator,
+        fingerprint = EXCLUDED.fingerprint, seeded_at = EXCLUDED.seeded_at;
+  RETURN true;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.snapshot_use(p_rows BIGINT, p_seed BIGINT) RETURNS BOOLEAN
+LANGUAGE plpgsql AS
+$$
+BEGIN
+  IF p_seed IS NULL THEN
+    RETURN false;
+  END IF;
+  IF EXISTS (SELECT 1 FROM bench.dataset WHERE rows = p_rows AND seed = p_seed
+                                           AND doc_kb = 0 AND toast_compression IS NULL)
+     AND (SELECT COALESCE(max(id), 0) FROM inv_rel) = p_rows THEN
+    RETURN true;                                  -- already loaded
+  END IF;
+  RETURN bench.snapshot_restore(p_rows, p_seed);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION bench.snapshot_drop(p_rows BIGINT, p_seed BIGINT) RETURNS VOID
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  s TEXT;
+BEGIN
+  DELETE FROM bench.snapshots WHERE rows = p_rows AND seed = p_seed
+  RETURNING schema_name INTO s;
+  IF s IS NOT NULL THEN
+    EXECUTE format('DROP SCHEMA %I CASCADE', s);
+  END IF;
+END;
+$$;
+
+-- =========================================================
+-- bench.evict_buffers()  RETURNS bigint
+--
+-- Evicts every shared buffer of the dataset tables (bench.dataset_tables),
+-- their TOAST tables and all their indexes (pg_buffercache_evict, PG17+;
+-- dirty pages are written first). Returns the number evicted. The OS page
+-- cache is not touched: see cold_cache.py for OS-cold runs.
 -- =========================================================
+CREATE OR REPLACE FUNCTION bench.evict_buffers() RETURNS BIGINT
+LANGUAGE plpgsql AS
+$$
+DECLARE
+  v_evicted BIGINT;
+BEGIN
+  WITH tabs AS (
+    SELECT c.oid, c.reltoastrelid
+    FROM unnest(bench.dataset_tables()) AS t(name)
+    JOIN pg_class c ON c.oid = to_regclass(format('public.%I', t.name))
+  ), rels AS (
+    SELECT oid FROM tabs
+    UNION SELECT reltoastrelid FROM tabs WHERE reltoastrelid <> 0
+    UNION SELECT i.indexrelid FROM pg_index i
+          WHERE i.indrelid IN (SELECT oid FROM tabs UNION SELECT reltoastrelid FROM tabs)
+  )
+  SELECT count(*) FILTER (WHERE pg_buffercache_evict(b.bufferid))
+  INTO v_evicted
+  FROM pg_buffercache b
+  WHERE b.reldatabase = (SELECT oid FROM pg_database WHERE datname = current_database())
+    AND b.relfilenode IN (SELECT pg_relation_filenode(oid) FROM rels);
+  RETURN v_evicted;
+END;
+$$;
+
 -- =========================================================
--- Driver: seed to N and run S1..S10 for all groups
+-- Driver: seed to N and run every enabled scenario of the
+-- catalog (bench.scenarios, registered in 06_queries_bench.sql)
+-- for each label it defines, labelled 'N=<N> <label key>'
+--   p_timing: 'explain' | 'both' (see bench.run)
+--   p_reseed: false = keep the current dataset (e.g. loaded by seed_copy.py)
+--   p_seed:   passed to bench.seed_both (NULL = random values)
+--   p_grow:   true = append rows up to N to the current dataset
+--             (bench.seed_both p_append) instead of reseeding from scratch
+--   p_snapshot: true = reuse the (N, p_seed) snapshot if one exists
+--             (or is already loaded) instead of seeding; otherwise park
+--             the current seeded dataset before seeding a new one
+--   p_variants: run only these scenarios (NULL = all enabled)
+--   p_sweep:  true = after the default params, run each point of the
+--             scenario's sweep too (bench.results.sweep_point); for the
+--             pagination scenarios the points are pages 2.. of the
+--             sequence (bench.page_params resolves offset / cursor)
+--   p_plan_modes: prepared-statement modes run after the simple one,
+--             e.g. ARRAY['custom','generic'] (bench.run p_plan_mode)
+--   p_cache_modes: cache regimes run after the hot one, e.g.
+--             ARRAY['evicted'] (bench.run p_cache; 'os_cold' needs
+--             cold_cache.py, which drops the OS cache between runs)
+--   p_writes: true = afterwards run the write scenarios (kind 'write')
+--             with bench.run_write; they are rolled back but leave dead
+--             tuples and index growth behind, so run them last
+--   p_doc_kb / p_compression: large-document seeding (bench.seed_both);
+--             not combinable with p_snapshot
 -- =========================================================
+SELECT bench.drop_routines('run_suite_for_size');
+
 CREATE OR REPLACE PROCEDURE bench.run_suite_for_size(
   p_rows   BIGINT,
   p_runs   INT DEFAULT 30,
   p_warmup INT DEFAULT 2,
-  p_clear  BOOLEAN DEFAULT false   -- set true to wipe previous results for these labels
+  p_clear  BOOLEAN DEFAULT false,  -- set true to wipe previous results for these labels
+  p_timing TEXT DEFAULT 'explain',
+  p_reseed BOOLEAN DEFAULT true,
+  p_seed   BIGINT  DEFAULT NULL,
+  p_grow   BOOLEAN DEFAULT false,
+  p_snapshot BOOLEAN DEFAULT false,
+  p_variants TEXT[] DEFAULT NULL,
+  p_sweep  BOOLEAN DEFAULT false,  -- also run every bench.scenarios.sweep point
+  p_plan_modes TEXT[] DEFAULT NULL,
+  p_cache_modes TEXT[] DEFAULT NULL,
+  p_writes BOOLEAN DEFAULT false,
+  p_doc_kb INT     DEFAULT 0,
+  p_compression TEXT DEFAULT NULL
 )
 LANGUAGE plpgsql AS $proc$
 DECLARE
-  lbl_jsonb_idx   TEXT := format('N=%s jsonb_indexed',   p_rows);
-  lbl_jsonb_unidx TEXT := format('N=%s jsonb_unindexed', p_rows);
-  lbl_rel_idx     TEXT := format('N=%s rel_indexed',     p_rows);
-  lbl_rel_unidx   TEXT := format('N=%s rel_unindexed',   p_rows);
+  sc  RECORD;
+  k   TEXT;
+  pt  JSONB;
+  pm  TEXT;
+  cm  TEXT;
+  v_params JSONB;
+  v_prep   RECORD;
 BEGIN
+  IF 'os_cold' = ANY(p_cache_modes) THEN
+    RAISE EXCEPTION 'bench.run_suite_for_size: os_cold needs the OS cache dropped between runs; use cold_cache.py';
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM bench.scenarios WHERE enabled) THEN
+    RAISE EXCEPTION 'bench.run_suite_for_size: no enabled scenarios in bench.scenarios';
+  END IF;
+  IF p_snapshot AND (p_doc_kb <> 0 OR p_compression IS NOT NULL) THEN
+    RAISE EXCEPTION 'bench.run_suite_for_size: snapshots keep default-shape datasets only (p_doc_kb / p_compression)';
+  END IF;
+
   -- 1) Seed to exact size
-  CALL bench.seed_both(p_rows);
+  IF p_reseed THEN
+    IF p_snapshot AND bench.snapshot_use(p_rows, p_seed) THEN
+      RAISE NOTICE 'N=% seed=%: reusing snapshot, seeding skipped', p_rows, p_seed;
+    ELSE
+      IF p_snapshot AND NOT p_grow THEN
+        PERFORM bench.snapshot_park();
+      END IF;
+      CALL bench.seed_both(p_rows, p_seed => p_seed, p_append => p_grow,
+                           p_doc_kb => p_doc_kb, p_compression => p_compression);
+    END IF;
+  END IF;
+
+  -- dimension tables of the join scenarios (no-op once filled)
+  PERFORM bench.seed_dimensions();
+
+  -- TOAST / heap block counters (pg_statio_user_tables) count this run only
+  PERFORM pg_stat_reset_single_table_counters(to_regclass(format('public.%I', t)))
+  FROM unnest(bench.dataset_tables()) AS t;
 
   -- 2) Optional: clear previous results for these labels
   IF p_clear THEN
-    PERFORM bench.clear(lbl_jsonb_idx);
-    PERFORM bench.clear(lbl_jsonb_unidx);
-    PERFORM bench.clear(lbl_rel_idx);
-    PERFORM bench.clear(lbl_rel_unidx);
+    FOR k IN
+      SELECT DISTINCT l FROM bench.scenarios s, bench.scenario_labels(s.queries) l
+      WHERE s.enabled
+    LOOP
+      PERFORM bench.clear(format('N=%s %s', p_rows, k));
+    END LOOP;
   END IF;
 
-  -- =============== S1) Equality text + numeric inequality ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S1_expr_eq_num',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_1') = 'A'
-        AND ((payload->>'indexed_number_1')::numeric) > 100$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S1_expr_eq_num',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_1') = 'A'
-        AND ((payload->>'unindexed_number_1')::numeric) > 100$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S1_expr_eq_num',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_1 = 'A' AND indexed_number_1 > 100$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S1_expr_eq_num',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_1 = 'A' AND unindexed_number_1 > 100$$,
-    p_runs, p_warmup);
-
-  -- =============== S2) LIKE prefix (left-anchored) ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S2_like_prefix',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_2') LIKE 'INV00012%'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S2_like_prefix',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_2') LIKE 'INV00012%'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S2_like_prefix',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_2 LIKE 'INV00012%'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S2_like_prefix',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_2 LIKE 'INV00012%'$$,
-    p_runs, p_warmup);
-
-  -- =============== S3) Substring contains (ILIKE '%…%') / trigram ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S3_trgm_contains',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_3') ILIKE '%priority%'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S3_trgm_contains',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_3') ILIKE '%priority%'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S3_trgm_contains',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_3 ILIKE '%priority%'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S3_trgm_contains',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_3 ILIKE '%priority%'$$,
-    p_runs, p_warmup);
-
-  -- =============== S4) Timestamp range ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S4_ts_range',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_timestamp_1') >= '2025-01-01T00:00:00.000Z'
-        AND (payload->>'indexed_timestamp_1') <  '2025-02-01T00:00:00.000Z'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S4_ts_range',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_timestamp_1') >= '2025-01-01T00:00:00.000Z'
-        AND (payload->>'unindexed_timestamp_1') <  '2025-02-01T00:00:00.000Z'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S4_ts_range',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_timestamp_1 >= '2025-01-01 00:00:00+00'
-        AND indexed_timestamp_1 <  '2025-02-01 00:00:00+00'$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S4_ts_range',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_timestamp_1 >= '2025-01-01 00:00:00+00'
-        AND unindexed_timestamp_1 <  '2025-02-01 00:00:00+00'$$,
-    p_runs, p_warmup);
-
-  -- =============== S5) Array AND (contain BOTH) ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S5_array_and',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->'indexed_text_array_1') @> '["aml","priority"]'::jsonb$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S5_array_and',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->'unindexed_text_array_1') @> '["aml","priority"]'::jsonb$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S5_array_and',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_array_1 @> ARRAY['aml','priority']::text[]$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S5_array_and',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_array_1 @> ARRAY['aml','priority']::text[]$$,
-    p_runs, p_warmup);
-
-  -- =============== S6) Array OR (any overlap) ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S6_array_or',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->'indexed_text_array_1') @> '["aml"]'::jsonb
-         OR (payload->'indexed_text_array_1') @> '["priority"]'::jsonb$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S6_array_or',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->'unindexed_text_array_1') @> '["aml"]'::jsonb
-         OR (payload->'unindexed_text_array_1') @> '["priority"]'::jsonb$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx, 'S6_array_or',
-  $$SELECT id FROM inv_rel
-    WHERE 'aml' = ANY(indexed_text_array_1)
-       OR 'priority' = ANY(indexed_text_array_1)$$,
-  p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx, 'S6_array_or',
-    $$SELECT id FROM inv_rel
-      WHERE 'aml' = ANY(unindexed_text_array_1)
-        OR 'priority' = ANY(unindexed_text_array_1)$$,
-    p_runs, p_warmup);
-
-  -- =============== S7) Multi-key AND (2 keys) ===============
-  -- JSONB containment form commented out when GIN(jsonb_path_ops) isn’t available.
-  PERFORM bench.run(lbl_jsonb_idx,'S7_and2',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_1') = 'A'
-        AND ((payload->>'indexed_boolean_1')::boolean) IS TRUE$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S7_and2',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_1') = 'A'
-        AND ((payload->>'unindexed_boolean_1')::boolean) IS TRUE$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S7_and2',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_1 = 'A' AND indexed_boolean_1 = true$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S7_and2',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_1 = 'A' AND unindexed_boolean_1 = true$$,
-    p_runs, p_warmup);
-
-  -- =============== S8) Multi-key AND (3 keys) ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S8_and3',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_1') = 'A'
-        AND ((payload->>'indexed_boolean_1')::boolean) IS TRUE
-        AND ((payload->>'indexed_number_1')::numeric) > 100::numeric$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S8_and3',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_1') = 'A'
-        AND ((payload->>'unindexed_boolean_1')::boolean) IS TRUE
-        AND ((payload->>'unindexed_number_1')::numeric) > 100::numeric$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S8_and3',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_1 = 'A' AND indexed_boolean_1 = true AND indexed_number_1 > 100$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S8_and3',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_1 = 'A' AND unindexed_boolean_1 = true AND unindexed_number_1 > 100$$,
-    p_runs, p_warmup);
-
-  -- =============== S9) OR across keys ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S9_or_keys',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_1') = 'A'
-         OR ((payload->>'indexed_boolean_1')::boolean) IS TRUE$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S9_or_keys',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_1') = 'A'
-         OR ((payload->>'unindexed_boolean_1')::boolean) IS TRUE$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S9_or_keys',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_1 = 'A' OR indexed_boolean_1 = true$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S9_or_keys',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_1 = 'A' OR unindexed_boolean_1 = true$$,
-    p_runs, p_warmup);
-
-  -- =============== S10) Top-N ordering within a group ===============
-  PERFORM bench.run(lbl_jsonb_idx,'S10_topn_order',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'indexed_text_1') = 'A'
-      ORDER BY (payload->>'indexed_timestamp_1')$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_jsonb_unidx,'S10_topn_order',
-    $$SELECT id FROM inv_jsonb
-      WHERE (payload->>'unindexed_text_1') = 'A'
-      ORDER BY (payload->>'unindexed_timestamp_1')$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_idx,'S10_topn_order',
-    $$SELECT id FROM inv_rel
-      WHERE indexed_text_1 = 'A'
-      ORDER BY indexed_timestamp_1$$,
-    p_runs, p_warmup);
-
-  PERFORM bench.run(lbl_rel_unidx,'S10_topn_order',
-    $$SELECT id FROM inv_rel
-      WHERE unindexed_text_1 = 'A'
-      ORDER BY unindexed_timestamp_1$$,
-    p_runs, p_warmup);
+  -- 3) Every scenario, every label it defines (jsonb_indexed, jsonb_unindexed,
+  --    rel_indexed, rel_unindexed first, in that order); with p_sweep, the
+  --    default params are followed by each sweep point (params || point);
+  --    "page" params get their offset / keyset cursor per label
+  FOR sc IN
+    SELECT * FROM bench.scenarios
+    WHERE enabled AND kind = 'read' AND (p_variants IS NULL OR variant = ANY(p_variants))
+    ORDER BY ord, variant
+  LOOP
+    FOR pt IN
+      SELECT e FROM (
+        SELECT NULL::jsonb AS e, 0::bigint AS pos
+        UNION ALL
+        SELECT e, pos
+        FROM jsonb_array_elements(CASE WHEN p_sweep THEN sc.sweep ELSE '[]'::jsonb END)
+             WITH ORDINALITY AS x(e, pos)
+      ) points
+      ORDER BY pos
+    LOOP
+      FOR k IN SELECT l FROM bench.scenario_labels(sc.queries) l LOOP
+        v_params := bench.page_params(sc.queries->>k,
+                                      sc.params || COALESCE(pt - 'point', '{}'::jsonb));
+        PERFORM bench.run(format('N=%s %s', p_rows, k), sc.variant,
+                          bench.render_sql(sc.queries->>k, v_params),
+                          p_runs, p_warmup, p_timing => p_timing,
+                          p_params => v_params, p_point => pt->>'point');
+        FOREACH pm IN ARRAY COALESCE(p_plan_modes, '{}'::text[]) LOOP
+          v_prep := bench.prepare_sql(sc.queries->>k, v_params);
+          PERFORM bench.run(format('N=%s %s', p_rows, k), sc.variant, v_prep.sql,
+                            p_runs, p_warmup, p_timing => p_timing,
+                            p_params => v_params, p_point => pt->>'point',
+                            p_plan_mode => pm, p_args => v_prep.args);
+        END LOOP;
+        FOREACH cm IN ARRAY COALESCE(p_cache_modes, '{}'::text[]) LOOP
+          PERFORM bench.run(format('N=%s %s', p_rows, k), sc.variant,
+                            bench.render_sql(sc.queries->>k, v_params),
+                            p_runs, p_warmup, p_timing => p_timing,
+                            p_params => v_params, p_point => pt->>'point',
+                            p_cache => cm);
+        END LOOP;
+      END LOOP;
+    END LOOP;
+  END LOOP;
+
+  -- 4) Optional: write scenarios (default params, rolled back per run)
+  IF p_writes THEN
+    FOR sc IN
+      SELECT * FROM bench.scenarios
+      WHERE enabled AND kind = 'write' AND (p_variants IS NULL OR variant = ANY(p_variants))
+      ORDER BY ord, variant
+    LOOP
+      FOR k IN SELECT l FROM bench.scenario_labels(sc.queries) l LOOP
+        PERFORM bench.run_write(format('N=%s %s', p_rows, k), sc.variant,
+                                bench.render_sql(sc.queries->>k, sc.params),
+                                p_runs, p_warmup, sc.params);
+      END LOOP;
+    END LOOP;
+  END IF;
 
+  -- 5) Per-node rows of this size's plans (bench.plan_nodes)
+  PERFORM bench.extract_plan_nodes(format('N=%s %%', p_rows));
 END;
 $proc$;
 
-
-
-DO $$ BEGIN RAISE NOTICE 'bench procedures created/updated: seed_both, run_suite_for_size'; END $$;
+DO $$ BEGIN RAISE NOTICE 'bench procedures created/updated: seed_both, seed_dimensions, evict_buffers, run_suite_for_size'; END $$;
@@ -9,5 +9,648 @@ SELECT
   SUM(shared_reads) AS sum_shared_reads,
   SUM(shared_hits)  AS sum_shared_hits
 FROM bench.results
+WHERE execution_ms IS NOT NULL   -- skip client-timed rows
+  AND sweep_point IS NULL        -- default params only (sweeps: bench.selectivity_curve)
+  AND plan_mode = 'simple'       -- prepared modes: bench.plan_modes
+  AND cache_mode = 'hot'         -- cold regimes: bench.cache_modes
 GROUP BY label, variant
 ORDER BY label, variant;
+
+-- Latency vs actual selectivity, per (label, variant, sweep point).
+-- The scenario defaults appear as point NULL; bench.run_suite_for_size
+-- (..., p_sweep => true) adds one row per bench.scenarios.sweep point.
+CREATE OR REPLACE VIEW bench.selectivity_curve AS
+SELECT
+  label,
+  variant,
+  sweep_point,
+  (array_agg(params ORDER BY id))[1] AS params,
+  COUNT(*) AS runs,
+  ROUND(AVG(actual_rows)::numeric, 1) AS avg_rows,
+  ROUND(AVG(selectivity)::numeric, 6) AS selectivity,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p50_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p95_ms,
+  ROUND(AVG(execution_ms)::numeric, 3) AS avg_ms,
+  SUM(shared_reads) AS sum_shared_reads,
+  SUM(shared_hits)  AS sum_shared_hits
+FROM bench.results
+WHERE execution_ms IS NOT NULL
+  AND plan_mode = 'simple'
+  AND cache_mode = 'hot'
+GROUP BY label, variant, sweep_point
+ORDER BY label, variant, selectivity;
+
+-- Observer effect of EXPLAIN ANALYZE per-node timing, per (label, variant):
+--   explain   = EXPLAIN (ANALYZE, BUFFERS)          (bench.run, any mode)
+--   timing_off= EXPLAIN (ANALYZE, TIMING OFF)       (bench.run p_timing='both')
+--   wall      = raw query, server clock_timestamp() (bench.run p_timing='both')
+--   client    = raw query + fetch, client clock     (client_timing.py)
+-- explain_overhead = p50 explain / p50 timing_off (1.0 = no observer effect).
+CREATE OR REPLACE VIEW bench.observer_effect AS
+SELECT
+  label,
+  variant,
+  COUNT(execution_ms) AS explain_runs,
+  COUNT(timing_off_ms) AS timing_off_runs,
+  COUNT(client_ms) AS client_runs,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3)  AS p50_explain_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY timing_off_ms)::numeric, 3) AS p50_timing_off_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY wall_ms)::numeric, 3)       AS p50_wall_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY client_ms)::numeric, 3)     AS p50_client_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3)  AS p95_explain_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY timing_off_ms)::numeric, 3) AS p95_timing_off_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY wall_ms)::numeric, 3)       AS p95_wall_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY client_ms)::numeric, 3)     AS p95_client_ms,
+  ROUND((PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)
+         / NULLIF(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY timing_off_ms), 0))::numeric, 3)
+    AS explain_overhead
+FROM bench.results
+WHERE sweep_point IS NULL
+  AND plan_mode = 'simple'
+  AND cache_mode = 'hot'
+GROUP BY label, variant
+ORDER BY label, variant;
+
+-- Planning vs execution per plan mode (default params):
+--   simple  = dynamic SQL, planned on every run
+--   custom  = prepared, plan_cache_mode = force_custom_plan
+--   generic = prepared, plan_cache_mode = force_generic_plan
+-- bench.run_suite_for_size(..., p_plan_modes => ARRAY['custom','generic'])
+-- for the server-side numbers, client_timing.py --plan-mode for p50_client_ms.
+-- index_used: fraction of recorded plans that scan an index.
+CREATE OR REPLACE VIEW bench.plan_modes AS
+SELECT
+  label,
+  variant,
+  plan_mode,
+  COUNT(execution_ms) AS runs,
+  COUNT(client_ms) AS client_runs,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY planning_ms)::numeric, 3)  AS p50_planning_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p50_execution_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY planning_ms + execution_ms)::numeric, 3) AS p50_total_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY planning_ms + execution_ms)::numeric, 3) AS p95_total_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY client_ms)::numeric, 3)    AS p50_client_ms,
+  ROUND(AVG((cardinality(ps.indexes) > 0)::int)::numeric, 2) AS index_used
+FROM bench.results r
+LEFT JOIN bench.plan_shapes ps ON ps.shape_hash = r.shape_hash
+WHERE sweep_point IS NULL
+  AND cache_mode = 'hot'
+GROUP BY label, variant, plan_mode
+ORDER BY label, variant, plan_mode;
+
+-- Latency and I/O per cache regime (default params, simple plans):
+--   hot     = after warmups (the normal runs)
+--   evicted = dataset relations evicted from shared_buffers before each run
+--   os_cold = evicted + OS page cache dropped before each run (cold_cache.py)
+-- io_read_ms needs track_io_timing = on (docker-compose.yml).
+CREATE OR REPLACE VIEW bench.cache_modes AS
+SELECT
+  label,
+  variant,
+  cache_mode,
+  COUNT(*) AS runs,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p50_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p95_ms,
+  ROUND(AVG(execution_ms)::numeric, 3) AS avg_ms,
+  ROUND(AVG(shared_reads)::numeric, 1) AS avg_shared_reads,
+  ROUND(AVG(shared_hits)::numeric, 1)  AS avg_shared_hits,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY io_read_ms)::numeric, 3) AS p50_io_read_ms
+FROM bench.results
+WHERE execution_ms IS NOT NULL
+  AND sweep_point IS NULL
+  AND plan_mode = 'simple'
+GROUP BY label, variant, cache_mode
+ORDER BY label, variant, cache_mode;
+
+-- Write scenarios (bench.run_write), per (label, variant):
+--   stmt_per_s     = statements per second at the mean execution time
+--   rows_per_s     = rows written per second
+--   wal_per_row    = WAL bytes per written row
+--   hot_ratio      = HOT updates / rows written (updates only)
+--   index_growth   = total index growth over all recorded runs
+CREATE OR REPLACE VIEW bench.write_summary AS
+SELECT
+  label,
+  variant,
+  COUNT(*) AS runs,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p50_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p95_ms,
+  ROUND(1000 / NULLIF(AVG(execution_ms), 0), 1) AS stmt_per_s,
+  ROUND(1000 * SUM(rows_written) / NULLIF(SUM(execution_ms), 0), 1) AS rows_per_s,
+  ROUND(AVG(rows_written)::numeric, 1) AS avg_rows_written,
+  ROUND(AVG(wal_bytes)::numeric, 0) AS avg_wal_bytes,
+  ROUND(SUM(wal_bytes)::numeric / NULLIF(SUM(rows_written), 0), 1) AS wal_per_row,
+  ROUND(AVG(wal_fpi)::numeric, 1) AS avg_wal_fpi,
+  ROUND(SUM(hot_updates)::numeric / NULLIF(SUM(rows_written), 0), 3) AS hot_ratio,
+  pg_size_pretty(SUM(index_growth_bytes)) AS index_growth
+FROM bench.results
+WHERE wal_bytes IS NOT NULL
+GROUP BY label, variant
+ORDER BY label, variant;
+
+-- Parked datasets with their on-disk size (tables + indexes + TOAST).
+CREATE OR REPLACE VIEW bench.snapshot_list AS
+SELECT
+  s.rows,
+  s.seed,
+  s.schema_name,
+  s.fingerprint,
+  s.generator,
+  s.seeded_at,
+  s.parked_at,
+  pg_size_pretty(SUM(pg_total_relation_size(c.oid))) AS total_size
+FROM bench.snapshots s
+LEFT JOIN pg_class c
+  ON c.relnamespace = to_regnamespace(s.schema_name)
+ AND c.relkind = 'r'
+GROUP BY s.rows, s.seed, s.schema_name, s.fingerprint, s.generator, s.seeded_at, s.parked_at
+ORDER BY s.rows, s.seed;
+
+-- On-disk size of each loaded dataset table (bench.dataset_tables):
+-- heap, TOAST and all indexes, plus bytes per row, so the three designs
+-- (inv_jsonb, inv_rel, inv_hybrid) can be compared on storage.
+-- doc_kb / toast_compression describe the loaded documents (bench.dataset);
+-- toast_blks_read / _hit are the TOAST blocks read since the last
+-- bench.run_suite_for_size reset the table's counters, i.e. detoasting.
+CREATE OR REPLACE VIEW bench.storage AS
+SELECT
+  t.name AS table_name,
+  (SELECT rows FROM bench.dataset) AS rows,
+  (SELECT doc_kb FROM bench.dataset) AS doc_kb,
+  (SELECT toast_compression FROM bench.dataset) AS toast_compression,
+  pg_relation_size(c.oid) AS heap_bytes,
+  COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0) AS toast_bytes,
+  pg_indexes_size(c.oid) AS index_bytes,
+  pg_total_relation_size(c.oid) AS total_bytes,
+  (SELECT count(*) FROM pg_index x WHERE x.indrelid = c.oid) AS indexes,
+  ROUND(pg_table_size(c.oid)::numeric / NULLIF((SELECT rows FROM bench.dataset), 0), 1) AS table_bytes_per_row,
+  ROUND(pg_total_relation_size(c.oid)::numeric / NULLIF((SELECT rows FROM bench.dataset), 0), 1) AS total_bytes_per_row,
+  ROUND(COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0)::numeric
+        / NULLIF((SELECT rows FROM bench.dataset), 0), 1) AS toast_bytes_per_row,
+  io.heap_blks_read,
+  io.heap_blks_hit,
+  io.toast_blks_read,
+  io.toast_blks_hit,
+  pg_size_pretty(pg_total_relation_size(c.oid)) AS total_size
+FROM unnest(bench.dataset_tables()) WITH ORDINALITY AS t(name, pos)
+JOIN pg_class c ON c.oid = to_regclass(format('public.%I', t.name))
+LEFT JOIN pg_statio_user_tables io ON io.relid = c.oid
+ORDER BY t.pos;
+
+-- Plan shape per (label, variant), default params and simple plans:
+-- index_used = fraction of recorded plans that scan an index
+-- (bench.plan_indexes), indexes = every index any of them scanned.
+-- Shows which query syntaxes (->>, @>, jsonpath @? / @@, JSON_TABLE)
+-- an index can serve at all.
+CREATE OR REPLACE VIEW bench.index_usage AS
+WITH r AS (
+  SELECT r.label, r.variant, r.execution_ms, ps.indexes AS idx
+  FROM bench.results r
+  JOIN bench.plan_shapes ps ON ps.shape_hash = r.shape_hash
+  WHERE wal_bytes IS NULL          -- reads only
+    AND sweep_point IS NULL
+    AND plan_mode = 'simple'
+    AND cache_mode = 'hot'
+)
+SELECT
+  label,
+  variant,
+  COUNT(*) AS runs,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p50_ms,
+  ROUND(AVG((cardinality(idx) > 0)::int)::numeric, 2) AS index_used,
+  (SELECT string_agg(DISTINCT i, ', ' ORDER BY i)
+   FROM r r2, unnest(r2.idx) AS i
+   WHERE r2.label = r.label AND r2.variant = r.variant) AS indexes
+FROM r
+GROUP BY label, variant
+ORDER BY label, variant;
+
+-- Aggregating reads (every recorded plan with an Aggregate node, e.g. the
+-- A1-A4 scenarios), default params and simple plans, per (label, variant):
+--   strategy          Aggregate strategies in the plan (Hashed | Sorted | Plain | Mixed)
+--   avg_groups        result rows (one per group)
+--   avg_rows_in       rows the table scans returned, i.e. fed into the aggregate
+--   us_per_row        p50 execution time per input row (the JSONB labels pay
+--                     payload detoast + parsing here; rel / hybrid read columns)
+--   buffers_per_krow  shared blocks (hit + read, TOAST included) per 1000 input rows
+--   avg_temp_blocks   sort / hash spill (temp blocks read + written)
+CREATE OR REPLACE VIEW bench.aggregates AS
+WITH r AS (
+  SELECT
+    label, variant, execution_ms, timing_off_ms, actual_rows, temp_reads + temp_writes AS temp_blocks,
+    shared_hits + shared_reads AS buffers,
+    (SELECT SUM(bench.node_metric(r.node_actuals, n.node_no, 'Actual Rows')
+                * COALESCE(bench.node_metric(r.node_actuals, n.node_no, 'Actual Loops'), 1))
+     FROM bench.plan_node_list(ps.shape) AS n
+     WHERE n.node ? 'Relation Name') AS rows_in,
+    (SELECT string_agg(DISTINCT s #>> '{}', ', ')
+     FROM jsonb_path_query(ps.shape, 'strict $.**? (@."Node Type" == "Aggregate")."Strategy"') AS s) AS strategy
+  FROM bench.results r
+  JOIN bench.plan_shapes ps ON ps.shape_hash = r.shape_hash
+  WHERE wal_bytes IS NULL          -- reads only
+    AND sweep_point IS NULL
+    AND plan_mode = 'simple'
+    AND cache_mode = 'hot'
+)
+SELECT
+  label,
+  variant,
+  COUNT(*) AS runs,
+  MIN(strategy) AS strategy,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3)  AS p50_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY timing_off_ms)::numeric, 3) AS p50_timing_off_ms,
+  ROUND(AVG(actual_rows)::numeric, 1) AS avg_groups,
+  ROUND(AVG(rows_in), 1) AS avg_rows_in,
+  ROUND((1000 * PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)
+         / NULLIF(AVG(rows_in), 0))::numeric, 3) AS us_per_row,
+  ROUND(1000 * AVG(buffers) / NULLIF(AVG(rows_in), 0), 1) AS buffers_per_krow,
+  ROUND(AVG(temp_blocks)::numeric, 1) AS avg_temp_blocks
+FROM r
+WHERE strategy IS NOT NULL
+GROUP BY label, variant
+ORDER BY label, variant;
+
+-- Projection width (P1..P30 scenarios), default params and simple plans,
+-- per (label, variant): the same rows returned with more attributes.
+--   serialize_ms      EXPLAIN (SERIALIZE) time to produce the output rows
+--                     (detoasting a projected payload happens here)
+--   output_kb         output volume per execution
+--   blocks_per_krow   shared blocks (plan + serialization) per 1000 rows
+--   us_per_row        p50 execution time per returned row
+CREATE OR REPLACE VIEW bench.projection AS
+SELECT
+  r.label,
+  r.variant,
+  substring(s.family FROM 2)::int AS width,
+  COUNT(*) AS runs,
+  ROUND(AVG(r.actual_rows)::numeric, 1) AS avg_rows,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY r.execution_ms)::numeric, 3) AS p50_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY r.execution_ms)::numeric, 3) AS p95_ms,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY r.serialize_ms)::numeric, 3) AS p50_serialize_ms,
+  ROUND(AVG(r.output_kb)::numeric, 1) AS output_kb,
+  ROUND(1000 * AVG(r.shared_hits + r.shared_reads + COALESCE(r.serialize_blocks, 0))
+        / NULLIF(AVG(r.actual_rows), 0), 1) AS blocks_per_krow,
+  ROUND((1000 * PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY r.execution_ms)
+         / NULLIF(AVG(r.actual_rows), 0))::numeric, 3) AS us_per_row
+FROM bench.results r
+JOIN bench.scenarios s ON s.variant = r.variant AND s.family ~ '^P[0-9]+$'
+WHERE r.execution_ms IS NOT NULL
+  AND r.sweep_point IS NULL
+  AND r.plan_mode = 'simple'
+  AND r.cache_mode = 'hot'
+GROUP BY r.label, r.variant, s.family
+ORDER BY r.label, width;
+
+-- Pagination (L1..L4 scenarios), simple plans and hot cache, one row per
+-- (label, variant, page): the default params are page 1, the sweep points
+-- (p_sweep => true) pages 2.. of the sequence.
+--   method        offset (LIMIT/OFFSET) | keyset ((ts, id) > cursor)
+--   rows_skipped  rows an OFFSET page reads and discards ((page - 1) * limit)
+--   cv_pct        run-to-run stddev / mean of the page, in percent
+--   p50_vs_page1  p50 of the page / p50 of page 1 (1.0 = flat across pages)
+--   avg_buffers   shared blocks per page
+CREATE OR REPLACE VIEW bench.pagination AS
+WITH r AS (
+  SELECT
+    r.label, r.variant, r.execution_ms, r.actual_rows, r.shared_hits + r.shared_reads AS buffers,
+    CASE WHEN r.params ? 'after_ts' THEN 'keyset' ELSE 'offset' END AS method,
+    (r.params->>'limit')::int AS page_size,
+    (r.params->>'page')::int AS page
+  FROM bench.results r
+  JOIN bench.scenarios s ON s.variant = r.variant AND s.family ~ '^L[0-9]+$'
+  WHERE r.execution_ms IS NOT NULL
+    AND r.params ? 'page'
+    AND r.plan_mode = 'simple'
+    AND r.cache_mode = 'hot'
+), p AS (
+  SELECT
+    label, variant, method, page_size, page,
+    COUNT(*) AS runs,
+    AVG(actual_rows) AS avg_rows,
+    PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms) AS p50,
+    PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY execution_ms) AS p95,
+    STDDEV_SAMP(execution_ms) / NULLIF(AVG(execution_ms), 0) AS cv,
+    AVG(buffers) AS buffers
+  FROM r
+  GROUP BY label, variant, method, page_size, page
+)
+SELECT
+  label,
+  variant,
+  method,
+  page_size,
+  page,
+  CASE WHEN method = 'offset' THEN (page - 1) * page_size ELSE 0 END AS rows_skipped,
+  runs,
+  ROUND(avg_rows, 1) AS avg_rows,
+  ROUND(p50::numeric, 3) AS p50_ms,
+  ROUND(p95::numeric, 3) AS p95_ms,
+  ROUND((100 * cv)::numeric, 1) AS cv_pct,
+  ROUND((p50 / NULLIF(FIRST_VALUE(p50) OVER (PARTITION BY label, variant ORDER BY page), 0))::numeric, 2)
+    AS p50_vs_page1,
+  ROUND(buffers, 1) AS avg_buffers
+FROM p
+ORDER BY label, variant, page;
+
+-- Join scenarios (J1..J3), default params and simple plans, per (label, variant):
+--   dim_rows          customers in the joined dimension table
+--   join_types        join nodes the planner chose, outermost first
+--                     (bench.plan_joins); plan_shapes > 1 = it changed between runs
+--   join_est_rows     estimated rows of the outermost join node ("Plan Rows")
+--   join_actual_rows  its actual rows (per loop)
+--   join_q_error      max(est/actual, actual/est) of that node (bench.q_error)
+--   max_q_error       worst q-error of any executed node, scans included, i.e.
+--                     where the expression key estimates go wrong
+CREATE OR REPLACE VIEW bench.joins AS
+WITH r AS (
+  SELECT
+    r.label, r.variant, r.execution_ms, r.actual_rows,
+    (r.params->>'dim_rows')::bigint AS dim_rows,
+    array_to_string(ps.joins, ' > ') AS join_types,
+    bench.node_metric(r.node_actuals, j.node_no, 'Plan Rows') AS join_est,
+    bench.node_metric(r.node_actuals, j.node_no, 'Actual Rows') AS join_act,
+    (SELECT MAX(bench.q_error(bench.node_metric(r.node_actuals, k, 'Plan Rows'),
+                              bench.node_metric(r.node_actuals, k, 'Actual Rows')))
+     FROM generate_series(1, ps.node_count) AS k
+     WHERE bench.node_metric(r.node_actuals, k, 'Actual Rows') IS NOT NULL
+       AND COALESCE(bench.node_metric(r.node_actuals, k, 'Actual Loops'), 1) > 0) AS max_q_error
+  FROM bench.results r
+  JOIN bench.scenarios s ON s.variant = r.variant AND s.family ~ '^J[0-9]+$'
+  JOIN bench.plan_shapes ps ON ps.shape_hash = r.shape_hash
+  LEFT JOIN LATERAL (
+    SELECT MIN(n.node_no) AS node_no
+    FROM bench.plan_node_list(ps.shape) AS n
+    WHERE n.node->>'Node Type' IN ('Nested Loop', 'Hash Join', 'Merge Join')
+  ) j ON true
+  WHERE r.sweep_point IS NULL
+    AND r.plan_mode = 'simple'
+    AND r.cache_mode = 'hot'
+)
+SELECT
+  label,
+  variant,
+  MIN(dim_rows) AS dim_rows,
+  COUNT(*) AS runs,
+  MODE() WITHIN GROUP (ORDER BY join_types) AS join_types,
+  COUNT(DISTINCT join_types) AS plan_shapes,
+  ROUND(PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p50_ms,
+  ROUND(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY execution_ms)::numeric, 3) AS p95_ms,
+  ROUND(AVG(actual_rows)::numeric, 1) AS avg_rows,
+  ROUND(AVG(join_est), 1) AS join_est_rows,
+  ROUND(AVG(join_act), 1) AS join_actual_rows,
+  ROUND(AVG(bench.q_error(join_est, join_act)), 2) AS join_q_error,
+  ROUND(MAX(max_q_error), 2) AS max_q_error
+FROM r
+GROUP BY label, variant
+ORDER BY label, variant;
+
+-- Plan shape per (label, variant) and size, default params and simple plans,
+-- compared by hash (bench.plan_shapes), so it costs no plan parsing:
+--   run_shapes     distinct shapes among the runs of this N (> 1 = the plan
+--                  flipped between runs)
+--   shape_hash     the most common shape, node_types its nodes depth-first
+--   changed_at_n   the shape differs from the one at the next smaller N
+--   sizes_shapes   distinct shapes of this (label key, variant) across all N
+CREATE OR REPLACE VIEW bench.plan_stability AS
+WITH r AS (
+  SELECT
+    label, variant, shape_hash,
+    substring(label FROM '^N=(\d+)')::bigint AS n,
+    substring(label FROM ' (.*)$') AS label_key
+  FROM bench.results
+  WHERE shape_hash IS NOT NULL
+    AND sweep_point IS NULL
+    AND plan_mode = 'simple'
+    AND cache_mode = 'hot'
+), per_n AS (
+  SELECT
+    label, label_key, variant, n,
+    COUNT(*) AS runs,
+    COUNT(DISTINCT shape_hash) AS run_shapes,
+    MODE() WITHIN GROUP (ORDER BY shape_hash) AS shape_hash
+  FROM r
+  GROUP BY label, label_key, variant, n
+), across AS (
+  SELECT label_key, variant, COUNT(DISTINCT shape_hash) AS sizes_shapes
+  FROM r
+  GROUP BY label_key, variant
+)
+SELECT
+  p.label,
+  p.variant,
+  p.n,
+  p.runs,
+  p.run_shapes,
+  p.shape_hash,
+  ps.node_types,
+  COALESCE(p.shape_hash <> LAG(p.shape_hash) OVER (PARTITION BY p.label_key, p.variant ORDER BY p.n),
+           false) AS changed_at_n,
+  a.sizes_shapes
+FROM per_n p
+JOIN across a USING (label_key, variant)
+JOIN bench.plan_shapes ps ON ps.shape_hash = p.shape_hash
+ORDER BY p.label, p.variant;
+
+-- Where execution time goes inside the plan, per (label, variant), default
+-- params, simple plans, reads only (bench.plan_nodes). One row per node kind:
+-- node type + the index or relation it reads ("Bitmap Heap Scan" on inv_rel,
+-- "Bitmap Index Scan" on inv_rel_idx_text_1, "Sort", ...), nodes of the same
+-- kind in one plan summed:
+--   node_order     position of its first node in the plan (depth-first)
+--   p50_self_ms    p50 over runs of the time spent in the node itself
+--   share_pct      its share of the summed p50_self_ms of the plan
+--   avg_self_blocks  shared blocks hit + read by the node itself
+--   avg_exact_heap_blocks / avg_lossy_heap_blocks  bitmap heap pages
+--                  (lossy = the bitmap overflowed work_mem, rows rechecked)
+CREATE OR REPLACE VIEW bench.node_breakdown AS
+WITH per_run AS (
+  SELECT
+    n.label, n.variant, n.result_id, n.node_type,
+    COALESCE(n.index_name, n.relation_name) AS object,
+    MIN(n.node_no) AS node_order,
+    SUM(n.self_ms) AS self_ms,
+    SUM(n.self_shared_hits + n.self_shared_reads) AS self_blocks,
+    SUM(n.actual_rows * n.loops) AS rows_out,
+    SUM(n.exact_heap_blocks) AS exact_heap_blocks,
+    SUM(n.lossy_heap_blocks) AS lossy_heap_blocks
+  FROM bench.plan_nodes n
+  JOIN bench.results r ON r.id = n.result_id
+  WHERE r.wal_bytes IS NULL          -- reads only
+    AND r.sweep_point IS NULL
+    AND r.plan_mode = 'simple'
+    AND r.cache_mode = 'hot'
+  GROUP BY n.label, n.variant, n.result_id, n.node_type, COALESCE(n.index_name, n.relation_name)
+), k AS (
+  SELECT
+    label, variant, node_type, object,
+    MIN(node_order) AS node_order,
+    COUNT(*) AS runs,
+    PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY self_ms) AS p50_self_ms,
+    AVG(self_blocks) AS self_blocks,
+    AVG(rows_out) AS rows_out,
+    AVG(exact_heap_blocks) AS exact_heap_blocks,
+    AVG(lossy_heap_blocks) AS lossy_heap_blocks
+  FROM per_run
+  GROUP BY label, variant, node_type, object
+)
+SELECT
+  label,
+  variant,
+  node_order,
+  node_type,
+  object,
+  runs,
+  ROUND(p50_self_ms::numeric, 3) AS p50_self_ms,
+  ROUND((100 * p50_self_ms / NULLIF(SUM(p50_self_ms) OVER (PARTITION BY label, variant), 0))::numeric, 1)
+    AS share_pct,
+  ROUND(self_blocks, 1) AS avg_self_blocks,
+  ROUND(rows_out, 1) AS avg_rows_out,
+  ROUND(exact_heap_blocks, 1) AS avg_exact_heap_blocks,
+  ROUND(lossy_heap_blocks, 1) AS avg_lossy_heap_blocks
+FROM k
+ORDER BY label, variant, node_order;
+
+-- Server-side counters per (label, variant): bench.run_stats summed over the
+-- suite calls (source run / run_write; default params, simple plans, hot) or
+-- per load_bench.py phase (source load, with its arrival mode and clients).
+--   calls, *_per_call     pg_stat_statements of the scenario statement
+--                         (warmups included), per execution
+--   heap_/idx_/toast_*    pg_statio blocks of the dataset + dimension tables
+--   io_*                  pg_stat_io of all processes; for suite calls these
+--                         are the other processes (the runner's own I/O is
+--                         reported when its CALL ends), for load phases all
+--   samples, *_pct        bench.wait_samples: share of the sampled time the
+--                         backends were on CPU or waiting on I/O, LWLocks,
+--                         heavyweight locks or anything else; top_wait = the
+--                         most sampled wait event
+CREATE OR REPLACE VIEW bench.server_stats AS
+WITH s AS (
+  SELECT
+    rs.*,
+    lr.arrival_mode,
+    lr.clients,
+    lr.target_qps
+  FROM bench.run_stats rs
+  LEFT JOIN bench.load_results lr ON lr.stat_id = rs.id
+  WHERE rs.sweep_point IS NULL
+    AND COALESCE(rs.plan_mode, 'simple') = 'simple'
+    AND COALESCE(rs.cache_mode, 'hot') = 'hot'
+), w AS (
+  SELECT
+    s.label, s.variant, s.source, s.arrival_mode, s.clients, s.target_qps,
+    ws.wait_event_type, ws.wait_event, SUM(ws.samples) AS samples
+  FROM s
+  JOIN bench.wait_samples ws ON ws.stat_id = s.id
+  GROUP BY 1, 2, 3, 4, 5, 6, 7, 8
+), wt AS (
+  SELECT
+    label, variant, source, arrival_mode, clients, target_qps,
+    SUM(samples) AS samples,
+    SUM(samples) FILTER (WHERE wait_event_type = 'CPU') AS cpu,
+    SUM(samples) FILTER (WHERE wait_event_type = 'IO') AS io,
+    SUM(samples) FILTER (WHERE wait_event_type = 'LWLock') AS lwlock,
+    SUM(samples) FILTER (WHERE wait_event_type = 'Lock') AS lock,
+    (ARRAY_AGG(wait_event_type || ':' || wait_event ORDER BY samples DESC)
+       FILTER (WHERE wait_event_type <> 'CPU'))[1] AS top_wait
+  FROM w
+  GROUP BY 1, 2, 3, 4, 5, 6
+), agg AS (
+  SELECT
+    label, variant, source, arrival_mode, clients, target_qps,
+    COUNT(*) AS steps,
+    SUM(elapsed_ms) AS elapsed_ms,
+    SUM(stmt_calls) AS calls,
+    SUM(stmt_rows) AS rows,
+    SUM(stmt_exec_ms) AS exec_ms,
+    SUM(shared_blks_hit) AS shared_blks_hit,
+    SUM(shared_blks_read) AS shared_blks_read,
+    SUM(shared_blks_dirtied) AS shared_blks_dirtied,
+    SUM(shared_blks_written) AS shared_blks_written,
+    SUM(shared_blk_read_ms) AS shared_blk_read_ms,
+    SUM(temp_blks_read + temp_blks_written) AS temp_blks,
+    SUM(wal_bytes) AS wal_bytes,
+    SUM(heap_blks_read) AS heap_blks_read,
+    SUM(heap_blks_hit) AS heap_blks_hit,
+    SUM(idx_blks_read) AS idx_blks_read,
+    SUM(idx_blks_hit) AS idx_blks_hit,
+    SUM(toast_blks_read) AS toast_blks_read,
+    SUM(toast_blks_hit) AS toast_blks_hit,
+    SUM(io_reads) AS io_reads,
+    SUM(io_read_ms) AS io_read_ms,
+    SUM(io_writes) AS io_writes,
+    SUM(io_write_ms) AS io_write_ms,
+    SUM(io_fsyncs) AS io_fsyncs
+  FROM s
+  GROUP BY 1, 2, 3, 4, 5, 6
+)
+SELECT
+  a.label,
+  a.variant,
+  a.source,
+  a.arrival_mode,
+  a.clients,
+  a.target_qps,
+  a.steps,
+  ROUND(a.elapsed_ms, 1) AS elapsed_ms,
+  a.calls,
+  ROUND(a.rows::numeric / NULLIF(a.calls, 0), 1) AS rows_per_call,
+  ROUND(a.exec_ms / NULLIF(a.calls, 0), 3) AS exec_ms_per_call,
+  ROUND(a.shared_blks_hit::numeric / NULLIF(a.calls, 0), 1) AS shared_hit_per_call,
+  ROUND(a.shared_blks_read::numeric / NULLIF(a.calls, 0), 1) AS shared_read_per_call,
+  ROUND(a.shared_blk_read_ms / NULLIF(a.calls, 0), 3) AS read_ms_per_call,
+  a.shared_blks_dirtied,
+  a.shared_blks_written,
+  a.temp_blks,
+  ROUND(a.wal_bytes / NULLIF(a.calls, 0), 1) AS wal_bytes_per_call,
+  a.heap_blks_read,
+  a.heap_blks_hit,
+  a.idx_blks_read,
+  a.idx_blks_hit,
+  a.toast_blks_read,
+  a.toast_blks_hit,
+  a.io_reads,
+  ROUND(a.io_read_ms, 3) AS io_read_ms,
+  a.io_writes,
+  ROUND(a.io_write_ms, 3) AS io_write_ms,
+  a.io_fsyncs,
+  wt.samples,
+  ROUND(100.0 * wt.cpu / NULLIF(wt.samples, 0), 1) AS cpu_pct,
+  ROUND(100.0 * wt.io / NULLIF(wt.samples, 0), 1) AS io_wait_pct,
+  ROUND(100.0 * wt.lwlock / NULLIF(wt.samples, 0), 1) AS lwlock_pct,
+  ROUND(100.0 * wt.lock / NULLIF(wt.samples, 0), 1) AS lock_pct,
+  ROUND(100.0 * (wt.samples - COALESCE(wt.cpu, 0) - COALESCE(wt.io, 0) - COALESCE(wt.lwlock, 0)
+                 - COALESCE(wt.lock, 0)) / NULLIF(wt.samples, 0), 1) AS other_wait_pct,
+  wt.top_wait
+FROM agg a
+LEFT JOIN wt ON wt.label = a.label AND wt.variant = a.variant AND wt.source = a.source
+            AND wt.arrival_mode IS NOT DISTINCT FROM a.arrival_mode
+            AND wt.clients IS NOT DISTINCT FROM a.clients
+            AND wt.target_qps IS NOT DISTINCT FROM a.target_qps
+ORDER BY a.label, a.variant, a.source, a.clients, a.target_qps;
+
+-- Sampled wait events (bench.wait_samples), one row per event and
+-- (label, variant, source / load phase), same filter as bench.server_stats;
+-- pct = share of that step's samples. 'CPU' = active, not waiting.
+CREATE OR REPLACE VIEW bench.wait_events AS
+SELECT
+  s.label,
+  s.variant,
+  s.source,
+  lr.arrival_mode,
+  lr.clients,
+  lr.target_qps,
+  ws.wait_event_type,
+  ws.wait_event,
+  SUM(ws.samples) AS samples,
+  ROUND(100.0 * SUM(ws.samples)
+        / SUM(SUM(ws.samples)) OVER (PARTITION BY s.label, s.variant, s.source,
+                                                  lr.arrival_mode, lr.clients, lr.target_qps), 1) AS pct
+FROM bench.run_stats s
+JOIN bench.wait_samples ws ON ws.stat_id = s.id
+LEFT JOIN bench.load_results lr ON lr.stat_id = s.id
+WHERE s.sweep_point IS NULL
+  AND COALESCE(s.plan_mode, 'simple') = 'simple'
+  AND COALESCE(s.cache_mode, 'hot') = 'hot'
+GROUP BY s.label, s.variant, s.source, lr.arrival_mode, lr.clients, lr.target_qps,
+         ws.wait_event_type, ws.wait_event
+ORDER BY s.label, s.variant, s.source, lr.clients, lr.target_qps, samples DESC;
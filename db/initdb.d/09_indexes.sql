@@ -2,6 +2,15 @@
 CREATE INDEX IF NOT EXISTS bench_results_label_variant_idx
 ON bench.results(label, variant, ts);
 
+CREATE INDEX IF NOT EXISTS bench_load_results_label_variant_idx
+ON bench.load_results(label, variant, clients);
+
+CREATE INDEX IF NOT EXISTS bench_plan_nodes_label_variant_idx
+ON bench.plan_nodes(label, variant);
+
+CREATE INDEX IF NOT EXISTS bench_run_stats_label_variant_idx
+ON bench.run_stats(label, variant);
+
 -- --------------------- inv_rel (relational) ---------------------
 -- Equality / IN / range
 CREATE INDEX IF NOT EXISTS inv_rel_idx_text_1 ON inv_rel(indexed_text_1);
@@ -91,3 +100,51 @@ ON inv_jsonb ((payload->>'indexed_text_1'), ((payload->>'indexed_boolean_1')::bo
 
 CREATE INDEX IF NOT EXISTS inv_jsonb_idx_text1_ts1_str
 ON inv_jsonb ((payload->>'indexed_text_1'), (payload->>'indexed_timestamp_1'));
+
+-- --------------------- inv_hybrid (payload + generated columns) ---------------------
+-- Same index set as inv_rel, on the generated columns
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_1 ON inv_hybrid(indexed_text_1);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_2 ON inv_hybrid(indexed_text_2);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_3 ON inv_hybrid(indexed_text_3);
+
+-- LIKE 'prefix%'
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_1_like ON inv_hybrid(indexed_text_1 text_pattern_ops);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_2_like ON inv_hybrid(indexed_text_2 text_pattern_ops);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_3_like ON inv_hybrid(indexed_text_3 text_pattern_ops);
+
+-- Timestamps (timestamptz, cast from the ISO strings)
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_ts_1 ON inv_hybrid(indexed_timestamp_1);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_ts_2 ON inv_hybrid(indexed_timestamp_2);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_ts_3 ON inv_hybrid(indexed_timestamp_3);
+
+-- Substring contains (trigram)
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_1_trgm ON inv_hybrid USING GIN (indexed_text_1 gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_2_trgm ON inv_hybrid USING GIN (indexed_text_2 gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_3_trgm ON inv_hybrid USING GIN (indexed_text_3 gin_trgm_ops);
+
+-- Numbers
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_num_1 ON inv_hybrid(indexed_number_1);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_num_2 ON inv_hybrid(indexed_number_2);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_num_3 ON inv_hybrid(indexed_number_3);
+
+-- Booleans
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_bool_1 ON inv_hybrid(indexed_boolean_1);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_bool_2 ON inv_hybrid(indexed_boolean_2);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_bool_3 ON inv_hybrid(indexed_boolean_3);
+
+-- Arrays (for && / @>)
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_arr_1 ON inv_hybrid USING GIN (indexed_text_array_1);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_arr_2 ON inv_hybrid USING GIN (indexed_text_array_2);
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text_arr_3 ON inv_hybrid USING GIN (indexed_text_array_3);
+
+-- Composite examples
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text1_bl1_num1
+ON inv_hybrid (indexed_text_1, indexed_boolean_1, indexed_number_1);
+
+CREATE INDEX IF NOT EXISTS inv_hybrid_idx_text1_ts1
+ON inv_hybrid (indexed_text_1, indexed_timestamp_1);
+
+-- --------------------- inv_jsonb_gin (one payload-wide GIN) ---------------------
+-- Every key/value path of the document; serves payload @> {...} only
+CREATE INDEX IF NOT EXISTS inv_jsonb_gin_idx_payload
+ON inv_jsonb_gin USING GIN (payload jsonb_path_ops);
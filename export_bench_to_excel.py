@@ -4,6 +4,11 @@ from datetime import datetime
 import pandas as pd
 from sqlalchemy import create_engine, text
 
+import bench_store
+from bench_store import STORE
+from scenarios import catalog_frame, fetch_catalog
+from server_stats import WaitSampler
+
 # ---- connection config (env or defaults) -------------------------------------
 PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
 PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
@@ -13,6 +18,39 @@ PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
 
 SIZES = [1_000, 10_000, 100_000, 1_000_000]
 OUTDIR = os.getenv("OUTDIR", "exports")
+
+# 'explain' = instrumented runs only; 'both' = also EXPLAIN (TIMING OFF) + raw wall clock
+TIMING = os.getenv("BENCH_TIMING", "explain")
+# also time each scenario client-side (client_timing.py) after the suite
+CLIENT_TIMING = os.getenv("BENCH_CLIENT_TIMING", "0") == "1"
+# 'sql' = bench.seed_both inside the suite; 'copy' = parallel COPY (seed_copy.py) first
+SEEDER = os.getenv("BENCH_SEEDER", "sql")
+SEED_WORKERS = int(os.getenv("BENCH_SEED_WORKERS", str(os.cpu_count() or 4)))
+# generator seed: unset = random() values (sql seeder); the copy seeder defaults to 0
+SEED = int(os.environ["BENCH_SEED"]) if os.getenv("BENCH_SEED") else None
+# 1 = seed the first size from scratch, then only append rows up to each next size
+GROW = os.getenv("BENCH_GROW", "0") == "1"
+# 1 = reuse/keep per-(N, seed) dataset snapshots (needs BENCH_SEED or the copy seeder)
+SNAPSHOTS = os.getenv("BENCH_SNAPSHOTS", "0") == "1"
+# 1 = also run every scenario sweep point (latency vs selectivity curves)
+SWEEP = os.getenv("BENCH_SWEEP", "0") == "1"
+# prepared-statement modes to run after the simple one, e.g. "custom,generic"
+PLAN_MODES = [m.strip() for m in os.getenv("BENCH_PLAN_MODES", "").split(",") if m.strip()] or None
+# cache regimes to run after the hot one, e.g. "evicted,os_cold" (os_cold via cold_cache.py)
+CACHE_MODES = [m.strip() for m in os.getenv("BENCH_CACHE_MODES", "").split(",") if m.strip()]
+# 1 = also run the write scenarios (rolled back; VACUUM afterwards)
+WRITES = os.getenv("BENCH_WRITES", "0") == "1"
+# 1 = rebuild every secondary index after the suite (index_build.py: build time, size, spill)
+INDEX_BUILDS = os.getenv("BENCH_INDEX_BUILDS", "0") == "1"
+# large documents: ~KiB of extra payload per row (bench.doc_extra), and the TOAST
+# compression used while seeding ('pglz' | 'lz4'; unset = server default)
+DOC_KB = int(os.getenv("BENCH_DOC_KB", "0"))
+TOAST_COMPRESSION = os.getenv("BENCH_TOAST_COMPRESSION") or None
+# results land in the columnar store (BENCH_STORE, default <OUTDIR>/store) after each size;
+# 1 = also render performance_run_<N>.xlsx / query_planner_<N>.xlsx from it (store_to_excel.py)
+EXCEL = os.getenv("BENCH_EXCEL", "0") == "1"
+# runs fetched per round trip when streaming bench.results into the store
+EXPORT_CHUNK = int(os.getenv("BENCH_EXPORT_CHUNK", "5000"))
 os.makedirs(OUTDIR, exist_ok=True)
 
 # SQLAlchemy engine (psycopg v3 driver)
@@ -21,13 +59,44 @@ ENGINE = create_engine(
     pool_pre_ping=True,
 )
 
-def run_suite(n: int, runs: int = 30, warm: int = 2, clear: bool = True):
-    print(f"\n▶ Running suite for N={n:,} ...")
-    with ENGINE.begin() as conn:
-        conn.execute(
-            text("CALL bench.run_suite_for_size(:n, :runs, :warm, :clr)"),
-            {"n": n, "runs": runs, "warm": warm, "clr": clear},
-        )
+def run_suite(n: int, runs: int = 30, warm: int = 2, clear: bool = True, grow: bool = False):
+    if SEEDER == "copy":
+        from seed_copy import seed
+        print(f"\n▶ COPY-seeding N={n:,}{' (grow)' if grow else ''} ...")
+        seed(n, SEED_WORKERS, 1_000_000, SEED or 0, keep_indexes=grow, grow=grow, snapshot=SNAPSHOTS,
+             doc_kb=DOC_KB, compression=TOAST_COMPRESSION)
+    print(f"\n▶ Running suite for N={n:,} (timing={TIMING}{', grow' if grow else ''}{', sweep' if SWEEP else ''}) ...")
+    # wait events of the bench.run backends ('bench:<run_stats id>'), see server_stats.py
+    with WaitSampler():
+        with ENGINE.begin() as conn:
+            conn.execute(
+                text("CALL bench.run_suite_for_size(:n, :runs, :warm, :clr, :timing, :reseed, :seed, :grow, :snap, "
+                     "p_sweep => :sweep, p_plan_modes => CAST(:pm AS text[]), "
+                     "p_cache_modes => CAST(:cm AS text[]), p_writes => :writes, "
+                     "p_doc_kb => :doc_kb, p_compression => :comp)"),
+                {"n": n, "runs": runs, "warm": warm, "clr": clear, "timing": TIMING,
+                 "reseed": SEEDER != "copy", "seed": SEED, "grow": grow, "snap": SNAPSHOTS,
+                 "sweep": SWEEP, "pm": PLAN_MODES,
+                 "cm": [m for m in CACHE_MODES if m != "os_cold"] or None, "writes": WRITES,
+                 "doc_kb": DOC_KB, "comp": TOAST_COMPRESSION},
+            )
+        if WRITES:
+            # rolled-back writes leave dead tuples behind; clean up before the next size
+            with ENGINE.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                tables = conn.execute(text("SELECT bench.dataset_tables()")).scalar()
+                conn.execute(text(f"VACUUM (ANALYZE) {', '.join(tables)}"))
+        if CLIENT_TIMING:
+            from client_timing import record_client_runs
+            record_client_runs(n, runs, warm, sweep=SWEEP)
+        if "os_cold" in CACHE_MODES:
+            from cold_cache import record_cache_runs
+            record_cache_runs(n, runs, warm, regimes=["os_cold"])
+            # the suite flattened its own plans; add the cold runs to bench.plan_nodes
+            with ENGINE.begin() as conn:
+                conn.execute(text("SELECT bench.extract_plan_nodes(:lbl)"), {"lbl": f"N={n} %"})
+    if INDEX_BUILDS:
+        from index_build import build_all
+        build_all()
     print("   ...done")
 
 def fetch_summary(n: int) -> pd.DataFrame:
@@ -39,46 +108,262 @@ def fetch_summary(n: int) -> pd.DataFrame:
     """)
     return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
 
-def fetch_results(n: int) -> pd.DataFrame:
+def fetch_observer_effect(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.observer_effect
+        WHERE label LIKE :lbl
+        ORDER BY label, variant
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_writes(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.write_summary
+        WHERE label LIKE :lbl
+        ORDER BY label, variant
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_storage() -> pd.DataFrame:
+    """Size of each dataset table as loaded right now (heap, TOAST, indexes)."""
+    return pd.read_sql(text("SELECT * FROM bench.storage"), ENGINE)
+
+def fetch_index_builds(n: int) -> pd.DataFrame:
+    """Latest build per (index, build mode) at this N."""
+    sql = text("""
+        SELECT DISTINCT ON (table_name, index_name, build_mode)
+               rows, table_name, index_name, index_method, build_mode, maintenance_work_mem,
+               build_ms, size_bytes, temp_files, temp_bytes, dataset_fp, index_def
+        FROM bench.index_builds
+        WHERE rows = :n
+        ORDER BY table_name, index_name, build_mode, ts DESC
+    """)
+    return pd.read_sql(sql, ENGINE, params={"n": n})
+
+def fetch_index_usage(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.index_usage
+        WHERE label LIKE :lbl
+        ORDER BY variant, label
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_aggregates(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.aggregates
+        WHERE label LIKE :lbl
+        ORDER BY variant, label
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_projection(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.projection
+        WHERE label LIKE :lbl
+        ORDER BY label, width
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_pagination(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.pagination
+        WHERE label LIKE :lbl
+        ORDER BY label, variant, page
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_joins(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.joins
+        WHERE label LIKE :lbl
+        ORDER BY variant, label
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_plan_stability(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.plan_stability
+        WHERE label LIKE :lbl
+        ORDER BY label, variant
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_node_breakdown(n: int) -> pd.DataFrame:
     sql = text("""
-        SELECT
-          label, variant, run_no, ts,
-          execution_ms, shared_reads, shared_hits,
-          jsonb_pretty(plan_json) AS plan_text
-        FROM bench.results
+        SELECT *
+        FROM bench.node_breakdown
         WHERE label LIKE :lbl
-        ORDER BY variant, run_no
+        ORDER BY label, variant, node_order
     """)
-    df = pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
-    # Excel can't handle tz-aware datetimes: normalize to UTC and drop tz
-    if "ts" in df.columns:
-        s = pd.to_datetime(df["ts"], utc=True, errors="coerce")
-        df["ts"] = s.dt.tz_convert(None)
-    return df
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
 
-def write_excels(n: int, df_summary: pd.DataFrame, df_results: pd.DataFrame):
-    perf_path = os.path.join(OUTDIR, f"performance_run_{n}.xlsx")
-    plan_path = os.path.join(OUTDIR, f"query_planner_{n}.xlsx")
+def fetch_server_stats(n: int) -> pd.DataFrame:
+    # suite calls only; load_bench.py exports its own phases
+    sql = text("""
+        SELECT *
+        FROM bench.server_stats
+        WHERE label LIKE :lbl AND source <> 'load'
+        ORDER BY label, variant, source
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"}) \
+        .drop(columns=["arrival_mode", "clients", "target_qps"])
 
-    with pd.ExcelWriter(perf_path, engine="openpyxl") as xw:
-        df_summary.to_excel(xw, index=False, sheet_name="summary")
+def fetch_wait_events(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT label, variant, source, wait_event_type, wait_event, samples, pct
+        FROM bench.wait_events
+        WHERE label LIKE :lbl AND source <> 'load'
+        ORDER BY label, variant, source, samples DESC
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_plan_shapes() -> pd.DataFrame:
+    """Every distinct plan shape recorded so far (small: one row per shape, not per run)."""
+    return pd.read_sql(text("""
+        SELECT shape_hash, node_count, node_types, array_to_string(indexes, ', ') AS indexes,
+               array_to_string(joins, ' > ') AS joins, shape::text AS shape,
+               first_seen AT TIME ZONE 'UTC' AS first_seen
+        FROM bench.plan_shapes
+        ORDER BY first_seen
+    """), ENGINE)
+
+def fetch_cache_modes(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.cache_modes
+        WHERE label LIKE :lbl
+        ORDER BY label, variant, cache_mode
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_plan_modes(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT *
+        FROM bench.plan_modes
+        WHERE label LIKE :lbl
+        ORDER BY label, variant, plan_mode
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+def fetch_selectivity(n: int) -> pd.DataFrame:
+    sql = text("""
+        SELECT label, variant, sweep_point, params::text AS params, runs, avg_rows,
+               selectivity, p50_ms, p95_ms, avg_ms, sum_shared_reads, sum_shared_hits
+        FROM bench.selectivity_curve
+        WHERE label LIKE :lbl
+        ORDER BY label, variant, selectivity
+    """)
+    return pd.read_sql(sql, ENGINE, params={"lbl": f"N={n} %"})
+
+RESULTS_SQL = """
+    SELECT
+      label, variant, run_no, ts, timing_mode, plan_mode, cache_mode, dataset_fp, sweep_point,
+      selectivity, planning_ms, execution_ms, timing_off_ms, wall_ms, client_ms,
+      shared_reads, shared_hits, temp_reads, temp_writes, io_read_ms,
+      serialize_ms, output_kb,
+      wal_bytes, rows_written, hot_updates, index_growth_bytes,
+      shape_hash, node_actuals::text AS node_actuals
+    FROM bench.results
+    WHERE label LIKE %(lbl)s
+    ORDER BY label, variant, run_no
+"""
+
+PLAN_NODES_SQL = """
+    SELECT
+      n.label, n.variant, n.run_no, r.plan_mode, r.cache_mode, r.sweep_point,
+      n.node_no, n.parent_no, n.depth, n.node_type, n.relation_name, n.index_name,
+      n.est_rows, n.actual_rows, n.loops, n.total_ms, n.self_ms,
+      n.shared_hits, n.shared_reads, n.self_shared_hits, n.self_shared_reads, n.temp_blocks,
+      n.exact_heap_blocks, n.lossy_heap_blocks, n.rows_removed_by_filter, n.rows_removed_by_recheck
+    FROM bench.plan_nodes n
+    JOIN bench.results r ON r.id = n.result_id
+    WHERE n.label LIKE %(lbl)s
+    ORDER BY n.label, n.variant, n.run_no, n.node_no
+"""
+
+def export_runs(n: int, name: str = bench_store.RESULTS, sql: str = RESULTS_SQL,
+                chunk: int = EXPORT_CHUNK) -> int:
+    """Page through per-run rows of size n with a server-side cursor, each chunk straight to the store.
+
+    Client memory is bounded by one chunk, whatever the number of recorded runs.
+    """
+    bench_store.clear_results(STORE, n, name)
+    raw = ENGINE.raw_connection()
+    total = 0
+    try:
+        # a named cursor is a server-side DECLARE ... CURSOR; it needs the open transaction
+        with raw.driver_connection.cursor(name=f"export_{name}") as cur:
+            cur.itersize = chunk
+            cur.execute(sql, {"lbl": f"N={n} %"})
+            part = 0
+            while rows := cur.fetchmany(chunk):
+                df = pd.DataFrame(rows, columns=[d.name for d in cur.description])
+                if "ts" in df.columns:
+                    df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
+                bench_store.append_results(STORE, n, df, part, name)
+                total += len(df)
+                part += 1
+    finally:
+        raw.close()
+    return total
+
+def fetch_scenarios() -> pd.DataFrame:
+    """Catalog with rendered SQL per label (read by the visualizers)."""
+    raw = ENGINE.raw_connection()
+    try:
+        return catalog_frame(fetch_catalog(raw.driver_connection, kind=None))
+    finally:
+        raw.close()
 
-    with pd.ExcelWriter(plan_path, engine="openpyxl") as xw:
-        df_results[["label","variant","run_no","ts","execution_ms","shared_reads","shared_hits"]] \
-            .to_excel(xw, index=False, sheet_name="runs")
-        df_results[["label","variant","run_no","plan_text"]] \
-            .to_excel(xw, index=False, sheet_name="plans")
+def fetch_sheets(n: int) -> dict[str, pd.DataFrame]:
+    """Every per-size dataset, keyed by its store / sheet name (bench_store.SHEETS)."""
+    return {
+        "summary": fetch_summary(n),
+        "observer_effect": fetch_observer_effect(n),
+        "selectivity": fetch_selectivity(n),
+        "plan_modes": fetch_plan_modes(n),
+        "cache_modes": fetch_cache_modes(n),
+        "writes": fetch_writes(n),
+        "aggregates": fetch_aggregates(n),
+        "projection": fetch_projection(n),
+        "pagination": fetch_pagination(n),
+        "joins": fetch_joins(n),
+        "plan_stability": fetch_plan_stability(n),
+        "node_breakdown": fetch_node_breakdown(n),
+        "server_stats": fetch_server_stats(n),
+        "wait_events": fetch_wait_events(n),
+        "index_usage": fetch_index_usage(n),
+        "storage": fetch_storage(),
+        "index_builds": fetch_index_builds(n),
+    }
 
-    print(f"   ✔ Wrote {perf_path}")
-    print(f"   ✔ Wrote {plan_path}")
+def write_store(n: int, sheets: dict[str, pd.DataFrame], df_scenarios: pd.DataFrame | None = None):
+    """Replace size n in the columnar store (other sizes are left as they are)."""
+    runs = export_runs(n)
+    nodes = export_runs(n, bench_store.PLAN_NODES, PLAN_NODES_SQL)
+    for name, df in sheets.items():
+        bench_store.write_sheet(STORE, name, n, df)
+    if df_scenarios is not None:
+        bench_store.write_scenarios(STORE, df_scenarios)
+    bench_store.write_table(STORE, bench_store.PLAN_SHAPES, fetch_plan_shapes())
+    print(f"   ✔ Wrote {STORE} (N={n:,}: {runs:,} runs, {nodes:,} plan nodes)")
 
 def main():
     try:
-        for n in SIZES:
-            run_suite(n)
-            df_summary = fetch_summary(n)
-            df_results = fetch_results(n)
-            write_excels(n, df_summary, df_results)
+        for i, n in enumerate(sorted(SIZES) if GROW else SIZES):
+            run_suite(n, grow=GROW and i > 0)
+            write_store(n, fetch_sheets(n), fetch_scenarios())
+            if EXCEL:
+                from store_to_excel import render
+                render(n, STORE, OUTDIR)
     except Exception as e:
         print("ERROR:", e)
         sys.exit(1)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# index_build.py
+# Build cost and size of every secondary index of the dataset tables
+# (bench.dataset_tables(): inv_rel, inv_jsonb, inv_jsonb_gin, inv_hybrid; the
+# indexes of db/initdb.d/09_indexes.sql) at the loaded N.
+#
+# Each index is dropped and rebuilt on its own, once with CREATE INDEX and once
+# with CREATE INDEX CONCURRENTLY (which cannot run inside a transaction, hence a
+# client-side driver). Per build we record into bench.index_builds:
+#   build_ms     client wall clock of the CREATE INDEX statement
+#   size_bytes   pg_relation_size of the new index
+#   temp_files / temp_bytes
+#                temp-file spill while building (pg_stat_database deltas), i.e.
+#                sort runs that did not fit in maintenance_work_mem (btree);
+#                GIN builds flush their accumulator into the index instead
+# Every index exists again afterwards, with its original definition.
+#
+# Example:
+#   python index_build.py
+#   python index_build.py --modes plain --maintenance-work-mem 64MB
+#   python index_build.py --tables inv_jsonb --indexes inv_jsonb_idx_text_1_trgm inv_jsonb_idx_num_1
+
+import argparse
+import os
+import re
+import time
+
+import psycopg
+
+# ---- connection config (env or defaults) -------------------------------------
+PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
+PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
+PGDATABASE = os.getenv("POSTGRES_DB", "ledgerdb")
+PGUSER     = os.getenv("POSTGRES_USER", "postgres")
+PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+
+BUILD_MODES = ["plain", "concurrent"]
+
+
+def connect():
+    conn = psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE,
+        user=PGUSER, password=PGPASSWORD,
+        autocommit=True, prepare_threshold=None,
+    )
+    # read pg_stat_database fresh on every query (no snapshot caching)
+    conn.execute("SET stats_fetch_consistency = none")
+    return conn
+
+
+def dataset_indexes(conn, tables: list[str] | None = None) -> list[dict]:
+    """Non-constraint indexes of the dataset tables (bench.dataset_tables)."""
+    rows = conn.execute(
+        """
+        SELECT t.relname, i.relname, am.amname, pg_get_indexdef(x.indexrelid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_class t ON t.oid = x.indrelid
+        JOIN pg_am am   ON am.oid = i.relam
+        WHERE t.relnamespace = 'public'::regnamespace
+          AND t.relname = ANY(COALESCE(%s, bench.dataset_tables()))
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        ORDER BY t.relname, i.relname
+        """,
+        (tables,),
+    ).fetchall()
+    return [{"table": t, "name": i, "method": am, "ddl": ddl} for t, i, am, ddl in rows]
+
+
+def concurrently(ddl: str) -> str:
+    return re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX CONCURRENTLY ", ddl, count=1)
+
+
+def temp_counters(conn) -> tuple[int, int]:
+    # pending temp-file stats of this backend are flushed when it goes idle
+    conn.execute("SELECT pg_stat_force_next_flush()")
+    return conn.execute(
+        "SELECT temp_files, temp_bytes FROM pg_stat_database WHERE datname = current_database()"
+    ).fetchone()
+
+
+def build_once(conn, idx: dict, mode: str) -> dict:
+    conn.execute(f'DROP INDEX IF EXISTS public."{idx["name"]}"')
+    ddl = idx["ddl"] if mode == "plain" else concurrently(idx["ddl"])
+    files0, bytes0 = temp_counters(conn)
+    t0 = time.perf_counter()
+    conn.execute(ddl)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    files1, bytes1 = temp_counters(conn)
+    size = conn.execute("SELECT pg_relation_size(%s::regclass)", (f'public."{idx["name"]}"',)).fetchone()[0]
+    return {"table_name": idx["table"], "index_name": idx["name"], "index_method": idx["method"],
+            "build_mode": mode, "build_ms": round(build_ms, 3), "size_bytes": size,
+            "temp_files": files1 - files0, "temp_bytes": bytes1 - bytes0, "index_def": idx["ddl"]}
+
+
+def build_all(tables: list[str] | None = None, names: list[str] | None = None,
+              modes: list[str] | None = None, mwm: str | None = None) -> list[dict]:
+    """Rebuild each index per mode, store the rows in bench.index_builds and return them."""
+    modes = modes or BUILD_MODES
+    out = []
+    with connect() as conn:
+        if mwm:
+            conn.execute(f"SET maintenance_work_mem = '{mwm}'")
+        mwm_now = conn.execute("SHOW maintenance_work_mem").fetchone()[0]
+        n, fp = conn.execute("SELECT rows, fingerprint FROM bench.dataset").fetchone() or (None, None)
+        if n is None:
+            n = conn.execute("SELECT count(*) FROM inv_rel").fetchone()[0]
+        indexes = [i for i in dataset_indexes(conn, tables) if not names or i["name"] in names]
+        if names and len(indexes) < len(names):
+            missing = sorted(set(names) - {i["name"] for i in indexes})
+            raise SystemExit(f"Not a secondary index of the dataset tables: {missing}")
+
+        print(f"\n▶ Index builds on N={n:,}: {len(indexes)} indexes × {', '.join(modes)} "
+              f"(maintenance_work_mem={mwm_now})")
+        for idx in indexes:
+            for mode in modes:
+                try:
+                    row = build_once(conn, idx, mode)
+                except Exception:
+                    # never leave the dataset without one of its indexes
+                    conn.execute(f'DROP INDEX IF EXISTS public."{idx["name"]}"')
+                    conn.execute(idx["ddl"])
+                    raise
+                row.update({"rows": n, "dataset_fp": fp, "maintenance_work_mem": mwm_now})
+                out.append(row)
+                print(f"   {idx['table']:<10} {idx['name']:<36} {mode:<10} "
+                      f"{row['build_ms']:>10.1f} ms  {row['size_bytes'] / 2**20:>9.1f} MiB"
+                      + (f"  spill={row['temp_bytes'] / 2**20:.1f} MiB" if row["temp_bytes"] else ""))
+        conn.execute(f"ANALYZE {', '.join(sorted({i['table'] for i in indexes}))}")
+
+        with conn.cursor() as cur:
+            cur.executemany(
+                """
+                INSERT INTO bench.index_builds (
+                  rows, dataset_fp, table_name, index_name, index_method, build_mode,
+                  maintenance_work_mem, build_ms, size_bytes, temp_files, temp_bytes, index_def
+                ) VALUES (
+                  %(rows)s, %(dataset_fp)s, %(table_name)s, %(index_name)s, %(index_method)s,
+                  %(build_mode)s, %(maintenance_work_mem)s, %(build_ms)s, %(size_bytes)s,
+                  %(temp_files)s, %(temp_bytes)s, %(index_def)s
+                )
+                """,
+                out,
+            )
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-index build time, size and sort spill at the loaded N.")
+    ap.add_argument("--tables", nargs="+", default=None, help="Dataset tables (default: bench.dataset_tables())")
+    ap.add_argument("--indexes", nargs="+", default=[], help="Only these index names (default: all)")
+    ap.add_argument("--modes", nargs="+", choices=BUILD_MODES, default=BUILD_MODES,
+                    help="CREATE INDEX and/or CREATE INDEX CONCURRENTLY (default both)")
+    ap.add_argument("--maintenance-work-mem", default=None,
+                    help="Session maintenance_work_mem for the builds (default: server setting)")
+    args = ap.parse_args()
+
+    build_all(args.tables, args.indexes or None, args.modes, args.maintenance_work_mem)
+    print("   ...done (see bench.index_builds)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# load_bench.py
+# Concurrent multi-client load driver for the catalog scenarios (bench.scenarios).
+#
+# bench.run measures one query at a time inside one backend. This driver runs
+# the same SQL (scenarios.py) from N concurrent client connections so we can
+# see where each design saturates under contention.
+#
+# Arrival modes:
+#   closed - every client issues its next request as soon as the previous one
+#            returns (throughput-bound; latency = service time + contention)
+#   open   - requests arrive at a fixed target rate (Poisson) regardless of
+#            completions and are served by the client pool. Latency is measured
+#            from the *scheduled* arrival, so queueing delay shows up once a
+#            design saturates (no coordinated omission). Arrivals still queued
+#            at the end of the phase are served for up to --drain seconds, so
+#            the slowest requests stay in the tail; only what is left after
+#            that is reported as dropped.
+#
+# Transient errors (serialization / deadlock, statement timeout) are counted
+# and the client goes on; any other error (lost connection, bad SQL) is
+# counted and ends that client for the phase. The first error is printed.
+#
+# One phase = (clients, [rate], label, variant). Per phase we record a latency
+# histogram and QPS into bench.load_results and exports/load_run_<N>.xlsx, plus
+# the server-side counters of the phase (bench.run_stats, warmups included as
+# in bench.run: pg_stat_statements, pg_statio_*, pg_stat_io) and the wait events of its
+# client backends sampled meanwhile (bench.wait_samples; server_stats.py).
+#
+# Example:
+#   python load_bench.py --clients 1 8 32 128 --duration 15 \
+#       --labels jsonb_indexed rel_indexed --variants S1_expr_eq_num S2_like_prefix
+#   python load_bench.py --mode open --clients 64 --rate 200 500 1000
+
+import argparse
+import json
+import math
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+import pandas as pd
+import psycopg
+
+from scenarios import BASE_LABEL_KEYS, fetch_catalog, scenario_sql
+from server_stats import WaitSampler, finish_step, start_step
+
+# ---- connection config (env or defaults) -------------------------------------
+PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
+PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
+PGDATABASE = os.getenv("POSTGRES_DB", "ledgerdb")
+PGUSER     = os.getenv("POSTGRES_USER", "postgres")
+PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+
+OUTDIR = os.getenv("OUTDIR", "exports")
+
+MAX_CLIENTS = 256
+
+# bench.run_stats columns copied into the phase rows (summary sheet)
+STAT_COLUMNS = ["shared_blks_hit", "shared_blks_read", "shared_blk_read_ms", "temp_blks_written",
+                "wal_bytes", "heap_blks_read", "idx_blks_read", "toast_blks_read",
+                "io_reads", "io_read_ms", "io_writes", "io_fsyncs"]
+
+
+def connect():
+    # prepare_threshold=None: plain (re-planned) execution, same as bench.run
+    return psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE,
+        user=PGUSER, password=PGPASSWORD,
+        autocommit=True, prepare_threshold=None,
+    )
+
+# ----------------------- Latency histogram -----------------------
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (~2% relative error), mergeable across clients."""
+
+    BASE_MS = 0.001   # bucket 0 starts at 1 µs
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def bucket(self, ms: float) -> int:
+        return max(0, int(math.log(max(ms, self.BASE_MS) / self.BASE_MS, self.GROWTH)))
+
+    def upper_ms(self, b: int) -> float:
+        return self.BASE_MS * self.GROWTH ** (b + 1)
+
+    def record(self, ms: float):
+        b = self.bucket(ms)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.n += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other: "LatencyHistogram"):
+        for b, c in other.counts.items():
+            self.counts[b] = self.counts.get(b, 0) + c
+        self.n += other.n
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-quantile (q in 0..1)."""
+        if not self.n:
+            return float("nan")
+        rank = max(1, math.ceil(q * self.n))
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                return min(self.upper_ms(b), self.max_ms)
+        return self.max_ms
+
+    def mean(self) -> float:
+        return self.total_ms / self.n if self.n else float("nan")
+
+    def to_dict(self) -> dict:
+        """{bucket upper edge in ms: count}, ascending."""
+        return {f"{self.upper_ms(b):.4f}": self.counts[b] for b in sorted(self.counts)}
+
+# ----------------------- Phase runners -----------------------
+
+class PhaseErrors:
+    """Error count of one phase across its clients, and the first error seen."""
+
+    TRANSIENT = (psycopg.errors.TransactionRollbackError, psycopg.errors.QueryCanceled)
+
+    def __init__(self):
+        self.count = 0
+        self.first: psycopg.Error | None = None
+        self._lock = threading.Lock()
+
+    def record(self, e: psycopg.Error) -> bool:
+        """Count e; True if the client may go on (transient error)."""
+        with self._lock:
+            self.count += 1
+            if self.first is None:
+                self.first = e
+                print(f"   [warn] {type(e).__name__}: {str(e).strip()}")
+        return isinstance(e, self.TRANSIENT)
+
+
+def _execute(cur, sql: str):
+    cur.execute(sql)
+    cur.fetchall()
+
+
+def _warm(conns, sql: str, warmup: int):
+    for conn in conns:
+        with conn.cursor() as cur:
+            for _ in range(warmup):
+                _execute(cur, sql)
+
+
+def run_closed(conns, sql: str, duration: float):
+    hists = [LatencyHistogram() for _ in conns]
+    errors = PhaseErrors()
+    start = threading.Barrier(len(conns) + 1)
+    deadline = [0.0]
+
+    def client(i: int):
+        with conns[i].cursor() as cur:
+            start.wait()
+            while time.perf_counter() < deadline[0]:
+                t0 = time.perf_counter()
+                try:
+                    _execute(cur, sql)
+                except psycopg.Error as e:
+                    if errors.record(e):
+                        continue
+                    break
+                hists[i].record((time.perf_counter() - t0) * 1000.0)
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(len(conns))]
+    for t in threads:
+        t.start()
+    t_begin = time.perf_counter()
+    deadline[0] = t_begin + duration
+    start.wait()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t_begin
+    return hists, errors.count, 0, elapsed
+
+
+def run_open(conns, sql: str, duration: float, rate: float, drain: float, seed: int | None = None):
+    hists = [LatencyHistogram() for _ in conns]
+    errors = PhaseErrors()
+    arrivals: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    rng = random.Random(seed)
+
+    def client(i: int):
+        with conns[i].cursor() as cur:
+            while not stop.is_set():
+                try:
+                    scheduled = arrivals.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                try:
+                    _execute(cur, sql)
+                except psycopg.Error as e:
+                    if errors.record(e):
+                        continue
+                    break
+                else:
+                    # latency from the scheduled arrival (includes queueing)
+                    hists[i].record((time.perf_counter() - scheduled) * 1000.0)
+                finally:
+                    arrivals.task_done()
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(len(conns))]
+    for t in threads:
+        t.start()
+
+    t_begin = time.perf_counter()
+    deadline = t_begin + duration
+    next_at = t_begin
+    while True:
+        next_at += rng.expovariate(rate)
+        if next_at >= deadline:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        arrivals.put(next_at)
+
+    # let the clients serve the backlog (the longest waits) before stopping them
+    drained = threading.Thread(target=arrivals.join, daemon=True)
+    drained.start()
+    drain_until = time.perf_counter() + drain
+    while drained.is_alive() and any(t.is_alive() for t in threads) and time.perf_counter() < drain_until:
+        drained.join(timeout=0.05)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t_begin
+
+    dropped = 0
+    while True:
+        try:
+            arrivals.get_nowait()
+            dropped += 1
+        except queue.Empty:
+            break
+    return hists, errors.count, dropped, elapsed
+
+
+def run_phase(sql: str, clients: int, mode: str, duration: float, rate: float | None,
+              warmup: int, label: str, variant: str, drain: float = 10.0) -> dict:
+    conns = [connect() for _ in range(clients)]
+    with connect() as sconn:
+        try:
+            # the warmups run inside the step: their pg_statio / pg_stat_io counts
+            # are only reported when the backends go idle or exit, i.e. in the delta
+            step = start_step(sconn, sql)
+            for c in conns:
+                c.execute(f"SET application_name = '{step['tag']}'")
+            _warm(conns, sql, warmup)
+            if mode == "open":
+                hists, errors, dropped, elapsed = run_open(conns, sql, duration, rate, drain)
+            else:
+                hists, errors, dropped, elapsed = run_closed(conns, sql, duration)
+        finally:
+            for c in conns:
+                c.close()
+        stats = finish_step(sconn, step, label, variant)
+
+    h = LatencyHistogram()
+    for x in hists:
+        h.merge(x)
+    return {
+        "completed": h.n,
+        "errors": errors,
+        "dropped": dropped,
+        "duration_s": round(elapsed, 3),
+        "qps": round(h.n / elapsed, 3) if elapsed > 0 else float("nan"),
+        "mean_ms": round(h.mean(), 3),
+        "p50_ms": round(h.percentile(0.50), 3),
+        "p95_ms": round(h.percentile(0.95), 3),
+        "p99_ms": round(h.percentile(0.99), 3),
+        "max_ms": round(h.max_ms, 3),
+        "histogram": h.to_dict(),
+        "stat_id": stats["id"],
+        **{k: stats[k] for k in STAT_COLUMNS},
+    }
+
+# ----------------------- Persistence -----------------------
+
+def dataset_rows() -> int:
+    with connect() as conn:
+        return conn.execute("SELECT count(*) FROM inv_rel").fetchone()[0]
+
+
+def store_results(rows: list[dict]):
+    sql = """
+        INSERT INTO bench.load_results (
+          label, variant, arrival_mode, clients, target_qps, duration_s,
+          completed, errors, dropped, qps,
+          mean_ms, p50_ms, p95_ms, p99_ms, max_ms, histogram, stat_id
+        ) VALUES (
+          %(label)s, %(variant)s, %(mode)s, %(clients)s, %(target_qps)s, %(duration_s)s,
+          %(completed)s, %(errors)s, %(dropped)s, %(qps)s,
+          %(mean_ms)s, %(p50_ms)s, %(p95_ms)s, %(p99_ms)s, %(max_ms)s, %(histogram_json)s::jsonb,
+          %(stat_id)s
+        )
+    """
+    with connect() as conn, conn.cursor() as cur:
+        cur.executemany(sql, [{**r, "histogram_json": json.dumps(r["histogram"])} for r in rows])
+
+
+def fetch_waits(rows: list[dict]) -> pd.DataFrame:
+    """Sampled wait events per phase (bench.wait_samples), with the share of the phase's samples."""
+    with connect() as conn:
+        waits = conn.execute(
+            """
+            SELECT stat_id, wait_event_type, wait_event, samples
+            FROM bench.wait_samples
+            WHERE stat_id = ANY(%s)
+            ORDER BY stat_id, samples DESC
+            """,
+            ([r["stat_id"] for r in rows],),
+        ).fetchall()
+    phases = pd.DataFrame([{k: r[k] for k in ("stat_id", "label", "variant", "mode", "clients", "target_qps")}
+                           for r in rows])
+    df = pd.DataFrame(waits, columns=["stat_id", "wait_event_type", "wait_event", "samples"])
+    df["pct"] = (100.0 * df["samples"] / df.groupby("stat_id")["samples"].transform("sum")).round(1)
+    return phases.merge(df, on="stat_id")
+
+
+def write_excel(n: int, rows: list[dict], waits: pd.DataFrame | None = None):
+    os.makedirs(OUTDIR, exist_ok=True)
+    path = os.path.join(OUTDIR, f"load_run_{n}.xlsx")
+    summary = pd.DataFrame([{k: v for k, v in r.items() if k != "histogram"} for r in rows])
+    hist = pd.DataFrame([
+        {"label": r["label"], "variant": r["variant"], "mode": r["mode"],
+         "clients": r["clients"], "target_qps": r["target_qps"],
+         "bucket_upper_ms": float(edge), "count": cnt}
+        for r in rows for edge, cnt in r["histogram"].items()
+    ])
+    with pd.ExcelWriter(path, engine="openpyxl") as xw:
+        summary.to_excel(xw, index=False, sheet_name="summary")
+        hist.to_excel(xw, index=False, sheet_name="histograms")
+        if waits is not None and not waits.empty:
+            waits.to_excel(xw, index=False, sheet_name="wait_events")
+    print(f"   ✔ Wrote {path}")
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Concurrent multi-client load generator for the catalog scenarios.")
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64],
+                    help=f"Client counts to sweep (1..{MAX_CLIENTS}), default 1 4 16 64")
+    ap.add_argument("--mode", choices=["closed", "open"], default="closed",
+                    help="closed: back-to-back requests per client; open: fixed arrival rate (default closed)")
+    ap.add_argument("--rate", type=float, nargs="+", default=[100.0],
+                    help="Open-loop target arrival rates in QPS (total across clients), default 100")
+    ap.add_argument("--duration", type=float, default=10.0, help="Seconds per phase (default 10)")
+    ap.add_argument("--drain", type=float, default=10.0,
+                    help="Open loop: seconds to serve arrivals still queued at the end of a phase (default 10)")
+    ap.add_argument("--warmup", type=int, default=2, help="Unrecorded warmup executions per client (default 2)")
+    ap.add_argument("--labels", nargs="+", default=BASE_LABEL_KEYS,
+                    help="Label keys to drive (default: the base labels, scenarios.BASE_LABEL_KEYS)")
+    ap.add_argument("--variants", nargs="+", default=[], help="Restrict to these scenarios (default: whole catalog)")
+    ap.add_argument("--rows", type=int, default=None,
+                    help="Dataset size for labels (default: count(*) of inv_rel)")
+    ap.add_argument("--no-store", action="store_true", help="Do not insert into bench.load_results")
+    args = ap.parse_args()
+
+    bad = [c for c in args.clients if not 1 <= c <= MAX_CLIENTS]
+    if bad:
+        raise SystemExit(f"--clients must be within 1..{MAX_CLIENTS}: {bad}")
+    with connect() as conn:
+        catalog = fetch_catalog(conn)
+    unknown = [v for v in args.variants if v not in catalog]
+    if unknown:
+        raise SystemExit(f"Not in bench.scenarios: {unknown}")
+    variants = args.variants or list(catalog)
+    rates = args.rate if args.mode == "open" else [None]
+
+    n = args.rows if args.rows is not None else dataset_rows()
+    print(f"\n▶ Load run on N={n:,} ({args.mode} loop, {args.duration:g}s per phase)")
+
+    rows = []
+    sampler = WaitSampler().start()
+    try:
+        for clients in args.clients:
+            for rate in rates:
+                for key in args.labels:
+                    for variant in variants:
+                        if key not in catalog[variant]["queries"]:
+                            continue
+                        sql = scenario_sql(catalog, variant, key)
+                        label = f"N={n} {key}"
+                        res = run_phase(sql, clients, args.mode, args.duration, rate, args.warmup,
+                                        label, variant, args.drain)
+                        row = {"label": label, "variant": variant, "mode": args.mode,
+                               "clients": clients, "target_qps": rate, **res}
+                        rows.append(row)
+                        print(f"   {row['label']:<26} {variant:<18} c={clients:<4}"
+                              + (f" rate={rate:<7g}" if rate else "")
+                              + f" qps={row['qps']:<10} p95={row['p95_ms']} ms"
+                              + (f" dropped={row['dropped']}" if row["dropped"] else ""))
+    except KeyboardInterrupt:
+        print("\n[warn] interrupted; keeping completed phases")
+    except Exception as e:
+        print("ERROR:", e)
+        sys.exit(1)
+    finally:
+        # finished phases keep their wait samples, whatever happened after them
+        sampler.stop()
+
+    if not rows:
+        raise SystemExit("No phases completed.")
+    if not args.no_store:
+        store_results(rows)
+    write_excel(n, rows, fetch_waits(rows))
+    print("\nAll done.")
+
+
+if __name__ == "__main__":
+    main()
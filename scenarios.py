@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# scenarios.py
+# Access to the scenario catalog, bench.scenarios (registered in
+# db/initdb.d/06_queries_bench.sql). bench.run_suite_for_size, the Python
+# drivers (client_timing.py, load_bench.py, ...) and the exporters all read the
+# scenario SQL from there; the exporter writes it to the "scenarios" sheet, from
+# which the visualizers take titles, families and example SQL.
+#
+# Templates use {{name}} placeholders bound from the scenario params;
+# render() mirrors bench.render_sql.
+
+import json
+import re
+
+# the designs compared in every scenario; the drivers that are expensive per label
+# (load_bench.py, cold_cache.py) default to these
+BASE_LABEL_KEYS = ["jsonb_indexed", "jsonb_unindexed", "rel_indexed", "rel_unindexed", "hybrid_indexed"]
+LABEL_KEYS = BASE_LABEL_KEYS + ["jsonb_gin_containment", "jsonpath_exists", "jsonpath_match", "json_table",
+                                "jsonb_payload"]
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+def label_keys(queries: dict) -> list[str]:
+    """Label keys of a scenario in run order (base labels first, then the rest)."""
+    base = [k for k in LABEL_KEYS if k in queries]
+    return base + sorted(k for k in queries if k not in LABEL_KEYS)
+
+
+def fetch_catalog(conn, enabled_only: bool = True, kind: str | None = "read") -> dict[str, dict]:
+    """{variant: scenario row} in catalog order (psycopg connection).
+
+    kind "read" (default) leaves out the write scenarios, which only
+    bench.run_write may execute; None returns both.
+    """
+    rows = conn.execute(
+        """
+        SELECT variant, ord, kind, family, title, description, queries, params, sweep,
+               expected_selectivity, enabled
+        FROM bench.scenarios
+        WHERE (enabled OR NOT %s) AND kind = COALESCE(%s, kind)
+        ORDER BY ord, variant
+        """,
+        (enabled_only, kind),
+    ).fetchall()
+    cols = ["variant", "ord", "kind", "family", "title", "description", "queries", "params", "sweep",
+            "expected_selectivity", "enabled"]
+    return {r[0]: dict(zip(cols, r)) for r in rows}
+
+
+def sql_literal(value) -> str:
+    """SQL literal for a JSON param value, as bench.render_sql renders it."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    text = value if isinstance(value, str) else json.dumps(value)
+    quoted = "'" + text.replace("'", "''") + "'"
+    if "\\" in text:
+        return "E" + quoted.replace("\\", "\\\\")
+    return quoted
+
+
+def render(template: str, params: dict | None = None) -> str:
+    params = params or {}
+    missing = sorted({m for m in _PLACEHOLDER.findall(template) if m not in params})
+    if missing:
+        raise KeyError(f"Unbound placeholder(s) {missing} in: {template}")
+    return _PLACEHOLDER.sub(lambda m: sql_literal(params[m.group(1)]), template)
+
+
+def parameterize(template: str, params: dict | None = None) -> tuple[str, list]:
+    """(sql with %s placeholders, values) for driver-side parameters (psycopg)."""
+    params = params or {}
+    values = []
+
+    def bind(m):
+        if m.group(1) not in params:
+            raise KeyError(f"Unbound placeholder {m.group(1)!r} in: {template}")
+        v = params[m.group(1)]
+        values.append(json.dumps(v) if isinstance(v, (dict, list)) else v)
+        return "%s"
+
+    return _PLACEHOLDER.sub(bind, template.replace("%", "%%")), values
+
+
+def variants(catalog: dict[str, dict]) -> list[str]:
+    """Scenario names in catalog order."""
+    return list(catalog.keys())
+
+
+def scenario_sql(catalog: dict[str, dict], variant: str, label_key: str,
+                 params: dict | None = None) -> str:
+    """Rendered SQL of (variant, label); params override the scenario defaults."""
+    try:
+        sc = catalog[variant]
+        template = sc["queries"][label_key]
+    except KeyError:
+        raise KeyError(f"No SQL for scenario {variant!r} / label {label_key!r}") from None
+    return render(template, {**(sc["params"] or {}), **(params or {})})
+
+
+def sweep_points(scenario: dict) -> list[tuple[str | None, dict]]:
+    """[(point, params)]: the defaults (point None), then each sweep point layered over them."""
+    base = scenario["params"] or {}
+    out = [(None, dict(base))]
+    for p in scenario.get("sweep") or []:
+        out.append((p["point"], {**base, **{k: v for k, v in p.items() if k != "point"}}))
+    return out
+
+
+def page_params(conn, template: str, params: dict) -> dict:
+    """Params of one page of a pagination scenario (offset / keyset cursor via bench.page_params).
+
+    Params without "page" come back unchanged.
+    """
+    if "page" not in params:
+        return params
+    return conn.execute("SELECT bench.page_params(%s, %s::jsonb)",
+                        (template, json.dumps(params))).fetchone()[0]
+
+
+def catalog_frame(catalog: dict[str, dict]):
+    """One row per scenario with rendered SQL per label (the "scenarios" sheet)."""
+    import pandas as pd
+
+    rows = []
+    for v, sc in catalog.items():
+        row = {k: sc[k] for k in ("variant", "ord", "kind", "family", "title", "expected_selectivity",
+                                  "description")}
+        row["params"] = json.dumps(sc["params"] or {})
+        row["sweep"] = json.dumps(sc.get("sweep") or [])
+        for key in label_keys(sc["queries"]):
+            row[f"sql_{key}"] = scenario_sql(catalog, v, key)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def load_scenario_sheet(xlsx_path: str) -> dict[str, dict]:
+    """{variant: row} from the "scenarios" sheet of an export ({} for older files)."""
+    import pandas as pd
+
+    try:
+        df = pd.read_excel(xlsx_path, sheet_name="scenarios")
+    except ValueError:          # sheet missing
+        return {}
+    df = df.where(pd.notna(df), None)
+    return {r["variant"]: r for r in df.to_dict("records")}
+
+
+def family_titles(meta: dict[str, dict]) -> dict[str, str]:
+    """{family: title of its first scenario} from load_scenario_sheet() rows."""
+    out = {}
+    for r in sorted(meta.values(), key=lambda r: (r.get("ord") or 0)):
+        if r.get("family") and r["family"] not in out:
+            out[r["family"]] = r.get("title") or ""
+    return out
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# seed_copy.py
+# Parallel COPY-based seeder for the dataset tables (large N).
+#
+# bench.seed_both builds every batch in one backend and inserts it twice while
+# ~40 indexes are maintained row by row. This seeder instead:
+#   1. saves and drops the secondary indexes of the dataset tables, TRUNCATEs them
+#   2. splits 1..N into key ranges (--chunk rows each) and hands them to
+#      --workers processes; each generates its rows once and streams them into
+#      all tables with COPY FROM STDIN (FORMAT BINARY), one connection per table
+#      (inv_jsonb_gin and inv_hybrid get the inv_jsonb payload; the inv_hybrid
+#      columns are generated)
+#   3. rebuilds the saved indexes in parallel (one CREATE INDEX per connection),
+#      resets the id sequences and ANALYZEs
+# If the load fails or is interrupted, the saved indexes are rebuilt on the
+# partial load before exiting (their DDL is printed if that fails too).
+# and reports rows/sec for the load and the index build.
+#
+# Rows are identical to CALL bench.seed_both(N, p_seed => --seed): id = n and
+# every column derived from (n, seed) via bench.hash_u31, so the dataset is
+# recorded in bench.dataset with the same fingerprint.
+#
+# Example:
+#   python seed_copy.py --rows 100000000 --workers 8
+#   python seed_copy.py --rows 1000000 --seed 42 --keep-indexes
+#   python seed_copy.py --rows 10000000 --seed 42 --grow     # append 1M..10M
+#   python seed_copy.py --rows 100000 --seed 42 --doc-kb 32 --compression lz4
+#
+# --grow appends only rows (current N, --rows] and keeps the indexes in place
+# (maintained row by row, like the sequence of fresh seedings it replaces);
+# the current dataset must have the same seed.
+#
+# --doc-kb K adds an "extra" key of about K KiB to every payload (bench.doc_extra:
+# nested objects, a long array of line objects, free text), --compression sets
+# default_toast_compression (pglz | lz4) on the loading connections. Both are
+# recorded in bench.dataset and in the fingerprint; such datasets are not parked
+# as snapshots.
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from multiprocessing import Pool
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+# ---- connection config (env or defaults) -------------------------------------
+PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
+PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
+PGDATABASE = os.getenv("POSTGRES_DB", "ledgerdb")
+PGUSER     = os.getenv("POSTGRES_USER", "postgres")
+PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+
+DATASET_TABLES = ["inv_rel", "inv_jsonb", "inv_jsonb_gin", "inv_hybrid"]
+PAYLOAD_TABLES = ["inv_jsonb", "inv_jsonb_gin", "inv_hybrid"]   # (id, payload) copies
+
+# ----------------------- Deterministic row generator -----------------------
+# Must stay in sync with bench.hash_u31 / bench.seed_both.
+
+P31 = 2_147_483_647
+
+ARR1 = ["kyc", "aml", "custody", "onboard", "priority", "tax"]
+ARR2 = ["grpA", "grpB", "grpC", "grpD"]
+ARR3 = ["X", "Y", "Z"]
+T3 = ["priority", "kyc", "aml", "onboard", "custody", "tax"]
+
+NOTE_WORDS = ["invoice", "payment", "overdue", "settled", "customer", "account",
+              "review", "pending", "approved", "rejected", "transfer", "balance",
+              "credit", "debit", "refund", "ledger"]
+TOAST_COMPRESSIONS = ["pglz", "lz4"]
+
+TS_BASE = datetime(2025, 10, 1, tzinfo=timezone.utc)
+TS_SPAN_S = 365 * 86400
+
+
+def _mix31(x: int) -> int:
+    return ((x ^ (x >> 16)) * 48271 + 12345) % P31
+
+
+def hash_u31(seed: int, n: int, stream: int) -> int:
+    """Python twin of bench.hash_u31(seed, n, stream)."""
+    x = ((n % P31) * 1000003 + (stream % P31) * 7919 + seed % P31) % P31
+    return _mix31(_mix31(_mix31(x)))
+
+
+def row_values(n: int, seed: int = 0) -> dict:
+    """Logical column values for row number n (1-based)."""
+    ts = [TS_BASE - timedelta(seconds=hash_u31(seed, n, s) % TS_SPAN_S) for s in (1, 2, 3)]
+    cents = [hash_u31(seed, n, s) % 100_000_000 for s in (4, 5, 6)]
+    return {
+        "t1": chr(65 + n % 26),
+        "t2": f"INV{n % 10_000_000:07d}",
+        "t3": T3[n % 6],
+        "ts": ts,
+        "cents": cents,
+        "b": [n % 2 == 0, n % 3 == 0, n % 5 == 0],
+        "arr": [
+            [t for k, t in enumerate(ARR1, start=1) if hash_u31(seed, n, 10 + k) % 100 < 35],
+            [t for k, t in enumerate(ARR2, start=1) if hash_u31(seed, n, 20 + k) % 100 < 50],
+            [t for k, t in enumerate(ARR3, start=1) if hash_u31(seed, n, 30 + k) % 100 < 50],
+        ],
+    }
+
+
+def _iso(ts: datetime) -> str:
+    # same text as to_char(ts AT TIME ZONE 'UTC','YYYY-MM-DD"T"HH24:MI:SS.MS"Z"')
+    return ts.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ts.microsecond // 1000:03d}Z"
+
+
+def _num_text(cents: int) -> str:
+    # numeric(18,2) text form, e.g. 1234.50 (scale kept, as jsonb_build_object does)
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def _json_str(s: str) -> str:
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _md5(s: str) -> str:
+    return hashlib.md5(s.encode()).hexdigest()
+
+
+def doc_extra_text(n: int, seed: int, kb: int) -> str:
+    """JSON text of bench.doc_extra(seed, n, kb): the large-document bulk of row n."""
+    lines = []
+    for i in range(1, kb * 6 + 1):
+        h = hash_u31(seed, n, 100 + i)
+        lines.append(f'{{"line":{i},"sku":"SKU{h % 100_000:05d}","qty":{1 + h % 50},'
+                     f'"memo":"{_md5(f"{seed}:{n}:l{i}")}"}}')
+    notes = " ".join(NOTE_WORDS[hash_u31(seed, n, 1_000_000 + i) % 16] for i in range(1, kb * 64 + 1))
+    return (f'{{"customer":{{"id":"C{hash_u31(seed, n, 40) % 1_000_000:06d}",'
+            f'"address":{{"street":"{_md5(f"{seed}:{n}:street")}","zip":"{hash_u31(seed, n, 41) % 100_000:05d}"}}}},'
+            f'"lines":[{",".join(lines)}],"notes":"{notes}"}}')
+
+
+def payload_text(v: dict, extra: str | None = None) -> str:
+    """JSON text of the inv_jsonb payload (key order is irrelevant for jsonb)."""
+    parts = []
+    for prefix in ("indexed", "unindexed"):
+        for i in range(3):
+            parts.append(f'"{prefix}_text_{i + 1}":{_json_str((v["t1"], v["t2"], v["t3"])[i])}')
+            parts.append(f'"{prefix}_timestamp_{i + 1}":"{_iso(v["ts"][i])}"')
+            parts.append(f'"{prefix}_number_{i + 1}":{_num_text(v["cents"][i])}')
+            parts.append(f'"{prefix}_text_array_{i + 1}":[' + ",".join(_json_str(t) for t in v["arr"][i]) + "]")
+            parts.append(f'"{prefix}_boolean_{i + 1}":{"true" if v["b"][i] else "false"}')
+    if extra is not None:
+        parts.append(f'"extra":{extra}')
+    return "{" + ",".join(parts) + "}"
+
+
+def rel_row(n: int, v: dict) -> tuple:
+    texts = (v["t1"], v["t2"], v["t3"])
+    nums = tuple(Decimal(c).scaleb(-2) for c in v["cents"])
+    return (n, *texts, *texts, *v["ts"], *v["ts"], *nums, *nums,
+            *v["arr"], *v["arr"], *v["b"], *v["b"])
+
+
+REL_COLUMNS = (
+    "id, indexed_text_1, indexed_text_2, indexed_text_3, "
+    "unindexed_text_1, unindexed_text_2, unindexed_text_3, "
+    "indexed_timestamp_1, indexed_timestamp_2, indexed_timestamp_3, "
+    "unindexed_timestamp_1, unindexed_timestamp_2, unindexed_timestamp_3, "
+    "indexed_number_1, indexed_number_2, indexed_number_3, "
+    "unindexed_number_1, unindexed_number_2, unindexed_number_3, "
+    "indexed_text_array_1, indexed_text_array_2, indexed_text_array_3, "
+    "unindexed_text_array_1, unindexed_text_array_2, unindexed_text_array_3, "
+    "indexed_boolean_1, indexed_boolean_2, indexed_boolean_3, "
+    "unindexed_boolean_1, unindexed_boolean_2, unindexed_boolean_3"
+)
+REL_TYPES = (["int8"] + ["text"] * 6 + ["timestamptz"] * 6 + ["numeric"] * 6
+             + ["text[]"] * 6 + ["bool"] * 6)
+
+# ----------------------- DB helpers -----------------------
+
+def connect(autocommit: bool = False):
+    return psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE,
+        user=PGUSER, password=PGPASSWORD, autocommit=autocommit,
+    )
+
+
+def _identity(s: str) -> str:
+    return s
+
+
+def load_range(task: tuple[int, int, int, int, str | None]) -> int:
+    """Worker: COPY rows lo..hi into every dataset table. Returns rows written."""
+    lo, hi, seed, doc_kb, compression = task
+    conns = [connect() for _ in range(1 + len(PAYLOAD_TABLES))]
+    try:
+        for c in conns:
+            c.execute("SET synchronous_commit = off")
+            if compression:
+                c.execute(f"SET default_toast_compression = {compression}")
+        with ExitStack() as stack:
+            cp_rel = stack.enter_context(conns[0].cursor().copy(
+                f"COPY inv_rel ({REL_COLUMNS}) FROM STDIN (FORMAT BINARY)"))
+            cp_rel.set_types(REL_TYPES)
+            cp_payload = []
+            for c, t in zip(conns[1:], PAYLOAD_TABLES):
+                cp = stack.enter_context(c.cursor().copy(f"COPY {t} (id, payload) FROM STDIN (FORMAT BINARY)"))
+                cp.set_types(["int8", "jsonb"])
+                cp_payload.append(cp)
+            for n in range(lo, hi + 1):
+                v = row_values(n, seed)
+                extra = doc_extra_text(n, seed, doc_kb) if doc_kb else None
+                payload = Jsonb(payload_text(v, extra), dumps=_identity)
+                cp_rel.write_row(rel_row(n, v))
+                for cp in cp_payload:
+                    cp.write_row((n, payload))
+        for c in conns:
+            c.commit()
+    finally:
+        for c in conns:
+            c.close()
+    return hi - lo + 1
+
+
+def saved_indexes(conn, tables: list[str]) -> list[tuple[str, str]]:
+    """(index name, CREATE INDEX statement) for non-constraint indexes of tables."""
+    return conn.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(x.indexrelid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_class t ON t.oid = x.indrelid
+        WHERE t.relname = ANY(%s)
+          AND t.relnamespace = 'public'::regnamespace
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        ORDER BY t.relname, i.relname
+        """,
+        (tables,),
+    ).fetchall()
+
+
+def build_index(ddl: str) -> float:
+    """Worker: run one CREATE INDEX, return seconds."""
+    with connect(autocommit=True) as conn:
+        conn.execute("SET maintenance_work_mem = '2GB'")
+        t0 = time.perf_counter()
+        conn.execute(ddl)
+        return time.perf_counter() - t0
+
+def restore_indexes(indexes: list[tuple[str, str]]):
+    """Rebuild saved indexes after a failed load; print the DDL of any that could not be rebuilt."""
+    for i, (name, ddl) in enumerate(indexes):
+        try:
+            build_index(ddl)
+        except Exception as e:
+            print(f"   [error] rebuilding {name} failed: {type(e).__name__}: {str(e).strip()}\n"
+                  f"   run these to restore the remaining indexes:", file=sys.stderr)
+            for _, d in indexes[i:]:
+                print(f"{d};", file=sys.stderr)
+            return
+        print(f"   restored index {name}")
+
+# ----------------------- Main -----------------------
+
+def current_dataset(conn) -> tuple[int, int | None, int, str | None]:
+    """(rows currently loaded, seed, doc_kb, toast_compression recorded in bench.dataset)."""
+    n_rel = conn.execute("SELECT COALESCE(max(id), 0) FROM inv_rel").fetchone()[0]
+    for t in DATASET_TABLES[1:]:
+        n_t = conn.execute(f"SELECT COALESCE(max(id), 0) FROM {t}").fetchone()[0]
+        if n_t != n_rel:
+            raise RuntimeError(f"inv_rel has {n_rel:,} rows but {t} has {n_t:,}")
+    row = conn.execute("SELECT seed, doc_kb, toast_compression FROM bench.dataset").fetchone()
+    return (n_rel, *(row if row else (None, 0, None)))
+
+
+def seed(rows: int, workers: int, chunk: int, seed_value: int = 0, keep_indexes: bool = False,
+         grow: bool = False, snapshot: bool = False, doc_kb: int = 0, compression: str | None = None):
+    """Load rows 1..rows into empty tables, or with grow only (current N, rows].
+
+    With snapshot, an existing (rows, seed_value) snapshot is restored instead
+    of loading, and a fresh load first parks the current seeded dataset.
+    doc_kb / compression select the large-document shape (bench.doc_extra).
+    """
+    if snapshot and (doc_kb or compression):
+        raise RuntimeError("snapshots keep default-shape datasets only (no --doc-kb / --compression)")
+    first = 1
+    with connect(autocommit=True) as conn:
+        if snapshot:
+            if conn.execute("SELECT bench.snapshot_use(%s, %s)", (rows, seed_value)).fetchone()[0]:
+                print(f"   N={rows:,} seed={seed_value}: snapshot restored, nothing to load")
+                return {"rows": 0, "load_s": 0.0, "index_s": 0.0, "fingerprint":
+                        conn.execute("SELECT fingerprint FROM bench.dataset").fetchone()[0]}
+            if not grow:
+                parked = conn.execute("SELECT bench.snapshot_park()").fetchone()[0]
+                if parked:
+                    print(f"   parked current dataset in {parked}")
+        if grow:
+            cur, cur_seed, cur_kb, cur_comp = current_dataset(conn)
+            if cur > rows:
+                raise RuntimeError(f"cannot grow: current N={cur:,} is larger than {rows:,}")
+            if cur > 0 and cur_seed != seed_value:
+                raise RuntimeError(f"cannot grow with seed {seed_value}: current dataset has seed {cur_seed}")
+            if cur > 0 and (cur_kb, cur_comp) != (doc_kb, compression):
+                raise RuntimeError(f"cannot grow with doc_kb={doc_kb}/compression={compression}: "
+                                   f"current dataset has {cur_kb}/{cur_comp}")
+            first = cur + 1
+            print(f"   growing N={cur:,} -> {rows:,}")
+        indexes = [] if keep_indexes else saved_indexes(conn, DATASET_TABLES)
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+        if not grow:
+            conn.execute(f"TRUNCATE {', '.join(DATASET_TABLES)} RESTART IDENTITY")
+    if indexes:
+        print(f"   dropped {len(indexes)} secondary indexes (rebuilt after load)")
+
+    tasks = [(lo, min(lo + chunk - 1, rows), seed_value, doc_kb, compression)
+             for lo in range(first, rows + 1, chunk)]
+    total = rows - first + 1
+    done = 0
+    t0 = time.perf_counter()
+    try:
+        with Pool(processes=workers) as pool:
+            for written in pool.imap_unordered(load_range, tasks):
+                done += written
+                el = time.perf_counter() - t0
+                print(f"   loaded {done:,}/{total:,} rows  ({done / el:,.0f} rows/s)", flush=True)
+    except BaseException:
+        # never leave the dataset without its indexes (a worker failed or Ctrl-C)
+        if indexes:
+            print(f"   load failed after {done:,}/{total:,} rows; rebuilding the {len(indexes)} dropped indexes")
+            restore_indexes(indexes)
+        raise
+    load_s = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    if indexes:
+        with Pool(processes=min(workers, len(indexes))) as pool:
+            for (name, _), secs in zip(indexes, pool.map(build_index, [d for _, d in indexes])):
+                print(f"   index {name:<36} {secs:8.1f}s")
+    index_s = time.perf_counter() - t1
+
+    with connect(autocommit=True) as conn:
+        for t in DATASET_TABLES:
+            conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{t}', 'id'), GREATEST((SELECT max(id) FROM {t}), 1))"
+            )
+            conn.execute(f"ANALYZE {t}")
+        fp = conn.execute("SELECT bench.record_dataset(%s, %s, 'seed_copy', %s, %s)",
+                          (rows, seed_value, doc_kb, compression)).fetchone()[0]
+
+    print(f"   load: {total:,} rows in {load_s:,.1f}s ({total / max(load_s, 1e-9):,.0f} rows/s, all tables)")
+    if indexes:
+        print(f"   indexes: {len(indexes)} built in {index_s:,.1f}s")
+    print(f"   dataset fingerprint: {fp}")
+    return {"rows": total, "load_s": load_s, "index_s": index_s, "fingerprint": fp}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parallel COPY seeder for the dataset tables.")
+    ap.add_argument("--rows", type=int, required=True, help="Dataset size N")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                    help="Loader processes (default: CPU count)")
+    ap.add_argument("--chunk", type=int, default=1_000_000,
+                    help="Rows per key range / COPY transaction (default 1,000,000)")
+    ap.add_argument("--seed", type=int, default=0,
+                    help="Generator seed; same --rows/--seed gives identical data (default 0)")
+    ap.add_argument("--keep-indexes", action="store_true",
+                    help="Load with indexes in place instead of drop + rebuild")
+    ap.add_argument("--grow", action="store_true",
+                    help="Append rows (current N, --rows] to the loaded dataset (implies --keep-indexes)")
+    ap.add_argument("--rebuild-indexes", action="store_true",
+                    help="With --grow: drop + rebuild indexes anyway (faster when growing many-fold)")
+    ap.add_argument("--snapshot", action="store_true",
+                    help="Restore the (--rows, --seed) snapshot if present; else park the current dataset first")
+    ap.add_argument("--doc-kb", type=int, default=0,
+                    help="Add ~K KiB of nested objects/arrays/text to every payload (default 0 = standard shape)")
+    ap.add_argument("--compression", choices=TOAST_COMPRESSIONS, default=None,
+                    help="default_toast_compression while loading (default: server setting)")
+    args = ap.parse_args()
+
+    if args.rows < 1:
+        raise SystemExit("--rows must be >= 1")
+    if args.doc_kb < 0:
+        raise SystemExit("--doc-kb must be >= 0")
+    print(f"\n▶ COPY-seeding N={args.rows:,} (seed={args.seed}) with {args.workers} workers ...")
+    try:
+        keep = args.keep_indexes or (args.grow and not args.rebuild_indexes)
+        seed(args.rows, args.workers, args.chunk, args.seed, keep_indexes=keep, grow=args.grow,
+             snapshot=args.snapshot, doc_kb=args.doc_kb, compression=args.compression)
+    except Exception as e:
+        print("ERROR:", e)
+        sys.exit(1)
+    print("\nAll done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# server_stats.py
+# Server-side counters next to the EXPLAIN numbers of bench.results.
+#
+# Every bench.run / bench.run_write call snapshots pg_stat_statements (its
+# statement's blocks, I/O time, rows, WAL), pg_statio_user_tables/_indexes
+# (dataset + dimension tables) and pg_stat_io (bench.stat_snapshot) before and
+# after, and stores the delta in bench.run_stats; meanwhile its backend runs as
+# application_name 'bench:<run_stats id>'. load_bench.py does the same per
+# phase for its client connections (start_step / finish_step).
+#
+# WaitSampler polls pg_stat_activity from its own connection while the suite
+# (export_bench_to_excel.py) or the load phases run, counts the wait events of
+# every 'bench:<id>' backend ('CPU' = active, not waiting) and stores the
+# counts in bench.wait_samples. Read them in bench.server_stats and
+# bench.wait_events (sheets "server_stats" / "wait_events", viz_server_stats.py).
+#
+# BENCH_WAIT_SAMPLE_MS sets the sampling interval (default 10; 0 = no sampling).
+# The sampler is one extra backend running a catalog query per interval.
+#
+# Example (sample whatever bench runs meanwhile, e.g. a CALL from psql, until Ctrl-C):
+#   python server_stats.py --interval-ms 5
+
+import argparse
+import os
+import threading
+import time
+from collections import Counter
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+# ---- connection config (env or defaults) -------------------------------------
+PGHOST     = os.getenv("POSTGRES_HOST", "127.0.0.1")
+PGPORT     = int(os.getenv("POSTGRES_PORT", "5433"))
+PGDATABASE = os.getenv("POSTGRES_DB", "ledgerdb")
+PGUSER     = os.getenv("POSTGRES_USER", "postgres")
+PGPASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+
+WAIT_SAMPLE_MS = float(os.getenv("BENCH_WAIT_SAMPLE_MS", "10"))
+
+TAG = "bench:"
+
+SAMPLE_SQL = """
+    SELECT substr(application_name, 7)::bigint,
+           COALESCE(wait_event_type, 'CPU'), COALESCE(wait_event, 'CPU')
+    FROM pg_stat_activity
+    WHERE application_name ~ '^bench:[0-9]+$'
+      AND state = 'active'
+      AND pid <> pg_backend_pid()
+"""
+
+STORE_SQL = """
+    INSERT INTO bench.wait_samples (stat_id, wait_event_type, wait_event, samples, interval_ms)
+    SELECT %(id)s, %(type)s, %(event)s, %(samples)s, %(interval_ms)s
+    WHERE EXISTS (SELECT 1 FROM bench.run_stats WHERE id = %(id)s)   -- steps rolled back: dropped
+    ON CONFLICT (stat_id, wait_event_type, wait_event)
+    DO UPDATE SET samples = bench.wait_samples.samples + EXCLUDED.samples
+"""
+
+
+def connect():
+    return psycopg.connect(
+        host=PGHOST, port=PGPORT, dbname=PGDATABASE,
+        user=PGUSER, password=PGPASSWORD,
+        autocommit=True, prepare_threshold=None,
+    )
+
+# ----------------------- Wait-event sampling -----------------------
+
+class WaitSampler:
+    """Samples pg_stat_activity of the tagged backends in a thread; stores the counts on stop().
+
+    Use as a context manager around the work to sample.
+    """
+
+    def __init__(self, interval_ms: float = WAIT_SAMPLE_MS):
+        self.interval_ms = interval_ms
+        self.counts: Counter = Counter()
+        self.ticks = 0
+        self.error: Exception | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            with connect() as conn:
+                next_at = time.perf_counter()
+                while not self._stop.is_set():
+                    for key in conn.execute(SAMPLE_SQL).fetchall():
+                        self.counts[key] += 1
+                    self.ticks += 1
+                    next_at += self.interval_ms / 1000.0
+                    self._stop.wait(max(0.0, next_at - time.perf_counter()))
+        except Exception as e:
+            # keep what was counted so far; stop() stores it and reports the error
+            self.error = e
+
+    def start(self) -> "WaitSampler":
+        if self.interval_ms > 0:
+            self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        """Stop sampling and store the counts; returns the number of (step, event) rows stored.
+
+        Counts taken before the sampler thread died (e.g. its connection dropped) are stored too.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.error is not None:
+            print(f"   [warn] wait sampler stopped early after {self.ticks:,} samples: "
+                  f"{type(self.error).__name__}: {str(self.error).strip()}")
+        rows = [{"id": i, "type": t, "event": e, "samples": c, "interval_ms": self.interval_ms}
+                for (i, t, e), c in self.counts.items()]
+        if rows:
+            with connect() as conn, conn.cursor() as cur:
+                cur.executemany(STORE_SQL, rows)
+        self.counts.clear()
+        return len(rows)
+
+    def __enter__(self) -> "WaitSampler":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+# ----------------------- Steps outside bench.run -----------------------
+
+def start_step(conn, sql: str) -> dict:
+    """Draw a bench.run_stats id and take the first snapshot; tag the step's backends TAG + id."""
+    stat_id = conn.execute("SELECT nextval(pg_get_serial_sequence('bench.run_stats', 'id'))").fetchone()[0]
+    query_id = conn.execute("SELECT bench.query_id(%s)", (sql,)).fetchone()[0]
+    before = conn.execute("SELECT bench.stat_snapshot(%s)", (query_id,)).fetchone()[0]
+    return {"id": stat_id, "tag": f"{TAG}{stat_id}", "query_id": query_id, "before": before,
+            "t0": time.perf_counter()}
+
+
+def finish_step(conn, step: dict, label: str, variant: str, source: str = "load",
+                timeout_s: float = 5.0) -> dict:
+    """Store the step's bench.run_stats row and return it.
+
+    Backends report their pg_stat_io / pg_statio counts when they exit, so the
+    step's connections are closed first; this waits until they are gone.
+    """
+    elapsed_ms = (time.perf_counter() - step["t0"]) * 1000.0
+    deadline = time.perf_counter() + timeout_s
+    while conn.execute("SELECT count(*) FROM pg_stat_activity WHERE application_name = %s",
+                       (step["tag"],)).fetchone()[0] and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    after = conn.execute("SELECT bench.stat_snapshot(%s)", (step["query_id"],)).fetchone()[0]
+    conn.execute("SELECT bench.record_stats(%s, %s, %s, %s, %s, %s, %s, %s)",
+                 (step["id"], source, label, variant, step["query_id"],
+                  Jsonb(step["before"]), Jsonb(after), elapsed_ms))
+    with conn.cursor() as cur:
+        cur.execute("SELECT * FROM bench.run_stats WHERE id = %s", (step["id"],))
+        return dict(zip([d.name for d in cur.description], cur.fetchone()))
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Sample the wait events of bench backends into bench.wait_samples.")
+    ap.add_argument("--interval-ms", type=float, default=WAIT_SAMPLE_MS or 10.0,
+                    help="Sampling interval in ms (BENCH_WAIT_SAMPLE_MS, default 10)")
+    args = ap.parse_args()
+
+    print(f"▶ Sampling bench backends every {args.interval_ms:g} ms (Ctrl-C stops) ...")
+    sampler = WaitSampler(args.interval_ms).start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    stored = sampler.stop()
+    print(f"   ✔ {sampler.ticks:,} samples, {stored:,} (step, wait event) rows in bench.wait_samples")
+
+
+if __name__ == "__main__":
+    main()
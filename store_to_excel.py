@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# store_to_excel.py
+# Render the columnar result store (bench_store.py) as the per-size workbooks:
+#   performance_run_<N>.xlsx  one sheet per dataset (summary, selectivity, ...)
+#   query_planner_<N>.xlsx    "runs" (per-run metrics) + "plans" (EXPLAIN JSON rebuilt from
+#                             the plan shape and the run's node_actuals)
+# export_bench_to_excel.py calls this after each size when BENCH_EXCEL=1.
+#
+# Examples:
+#   python store_to_excel.py                    # every size in the store
+#   python store_to_excel.py --sizes 1000 1000000 --outdir exports
+
+import argparse, json, os
+
+import pandas as pd
+from openpyxl import Workbook
+
+import bench_store
+from bench_store import STORE
+
+RUN_COLUMNS = ["label", "variant", "run_no", "ts", "timing_mode", "plan_mode", "cache_mode", "dataset_fp",
+               "sweep_point", "selectivity", "planning_ms", "execution_ms", "timing_off_ms", "wall_ms",
+               "client_ms", "shared_reads", "shared_hits", "temp_reads", "temp_writes", "io_read_ms",
+               "serialize_ms", "output_kb",
+               "wal_bytes", "rows_written", "hot_updates", "index_growth_bytes"]
+
+def pretty_plan(shape: dict | None, actuals):
+    """Indented EXPLAIN JSON of one run (bench_store.expand_plan), as jsonb_pretty() renders it."""
+    if shape is None or not isinstance(actuals, str):
+        return None
+    return json.dumps([{"Plan": bench_store.expand_plan(shape, json.loads(actuals))}], indent=4)
+
+def cells(df: pd.DataFrame):
+    """Rows of plain Python values (None for NULL/NaN/NaT) for openpyxl."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+def include_sheet(name: str, df: pd.DataFrame) -> bool:
+    if df.empty:
+        return False
+    # the mode comparisons only say something once a second mode has been run
+    if name == "plan_modes":
+        return df["plan_mode"].ne("simple").any()
+    if name == "cache_modes":
+        return df["cache_mode"].ne("hot").any()
+    return True
+
+def render(n: int, store: str = STORE, outdir: str = "exports"):
+    perf_path = os.path.join(outdir, f"performance_run_{n}.xlsx")
+    plan_path = os.path.join(outdir, f"query_planner_{n}.xlsx")
+    os.makedirs(outdir, exist_ok=True)
+
+    scenarios = bench_store.read_sheet(store, bench_store.SCENARIOS)
+    plan_shapes = bench_store.read_sheet(store, bench_store.PLAN_SHAPES)
+    with pd.ExcelWriter(perf_path, engine="openpyxl") as xw:
+        for name in bench_store.SHEETS:
+            df = bench_store.read_sheet(store, name, n)
+            if name == "summary" or include_sheet(name, df):
+                df.drop(columns="n", errors="ignore").to_excel(xw, index=False, sheet_name=name)
+            if name == "observer_effect" and not scenarios.empty:
+                scenarios.to_excel(xw, index=False, sheet_name="scenarios")
+        if not plan_shapes.empty:
+            plan_shapes.drop(columns="shape").to_excel(xw, index=False, sheet_name="plan_shapes")
+
+    # runs and plans are streamed batch by batch into a write-only workbook, so rendering
+    # a size never holds all of its runs (or plans) in memory
+    wb = Workbook(write_only=True)
+    ws_runs, ws_plans = wb.create_sheet("runs"), wb.create_sheet("plans")
+    ws_runs.append(RUN_COLUMNS)
+    ws_plans.append(["label", "variant", "run_no", "plan_text"])
+    shapes = bench_store.shape_lookup(store)
+    for df in bench_store.iter_results(store, n, RUN_COLUMNS + ["shape_hash", "node_actuals"]):
+        # Excel can't handle tz-aware datetimes: normalize to UTC and drop tz
+        df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce").dt.tz_convert(None)
+        df = df.sort_values(["variant", "run_no"])
+        for row in cells(df[RUN_COLUMNS]):
+            ws_runs.append(row)
+        df["plan_text"] = [pretty_plan(shapes.get(h), a) for h, a in zip(df["shape_hash"], df["node_actuals"])]
+        for row in cells(df.loc[df["plan_text"].notna(), ["label", "variant", "run_no", "plan_text"]]):
+            ws_plans.append(row)
+    wb.save(plan_path)
+
+    print(f"   ✔ Wrote {perf_path}")
+    print(f"   ✔ Wrote {plan_path}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Render the columnar result store as performance_run_<N>.xlsx / query_planner_<N>.xlsx.")
+    ap.add_argument("--store", default=STORE, help="Store directory (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--outdir", default=os.getenv("OUTDIR", "exports"), help="Output directory for the workbooks")
+    ap.add_argument("--sizes", nargs="*", type=int, default=[], help="Sizes to render (default: all in the store)")
+    args = ap.parse_args()
+
+    sizes = args.sizes or bench_store.sizes(args.store)
+    if not sizes:
+        raise SystemExit(f"No sizes in {os.path.abspath(args.store)}")
+    for n in sizes:
+        print(f"▶ Rendering N={n:,} ...")
+        render(n, args.store, args.outdir)
+
+if __name__ == "__main__":
+    main()
@@ -93,12 +93,18 @@ def fetch_pairs(engine, label_rel: str, label_jsonb: str) -> pd.DataFrame:
     WITH r AS (
       SELECT variant, run_no, execution_ms AS ms
       FROM bench.results
-      WHERE label = :rel
+      WHERE label = :rel AND execution_ms IS NOT NULL
+        AND sweep_point IS NULL   -- sweep points restart run_no; defaults only (as bench.summary)
+        AND plan_mode = 'simple'  -- prepared modes repeat run_no 1..runs
+        AND cache_mode = 'hot'    -- so do the evicted / os_cold regimes
     ),
     j AS (
       SELECT variant, run_no, execution_ms AS ms
       FROM bench.results
-      WHERE label = :jsonb
+      WHERE label = :jsonb AND execution_ms IS NOT NULL
+        AND sweep_point IS NULL   -- sweep points restart run_no; defaults only (as bench.summary)
+        AND plan_mode = 'simple'  -- prepared modes repeat run_no 1..runs
+        AND cache_mode = 'hot'    -- so do the evicted / os_cold regimes
     )
     SELECT r.variant, r.run_no, r.ms AS rel_ms, j.ms AS jsonb_ms,
            CASE WHEN r.ms > 0 AND j.ms > 0 THEN LN(r.ms / j.ms) END AS log_ratio
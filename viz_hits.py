@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # viz_bench_combo.py
-# Composite chart over S1..S10:
+# Composite chart over the catalog scenarios (S1..S10, ...):
 #   - Bars (primary Y): mean Shared Hit Blocks (JSONB vs REL)
 #   - Lines (secondary Y): p95 latency (ms) — separate lines for JSONB and REL
 # Source: bench_results.csv. Excludes 'unindexed'.
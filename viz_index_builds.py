@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# viz_index_builds.py
+# Index build cost curves from the "index_builds" dataset of the result store
+# (bench_store.py; --glob: the sheet of older performance_run_<N>.xlsx exports)
+# (BENCH_INDEX_BUILDS=1, see index_build.py).
+# One FIGURE PER METRIC (build_ms, size_mib, spill_mib); one subplot per table
+# (inv_hybrid | inv_jsonb | inv_jsonb_gin | inv_rel, or --tables), X-axis = Rows (N),
+# one line per index.
+# Line style = build mode: solid = CREATE INDEX, dashed = CREATE INDEX CONCURRENTLY.
+# Style: grayscale-safe, distinct markers per index, vector export (PDF).
+#
+# Example:
+#   python viz_index_builds.py --scale xylog
+
+import argparse, os
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+
+from bench_store import STORE, sheet_frames
+
+ALL_METRICS = ["build_ms", "size_mib", "spill_mib"]
+
+MODE_STYLE = {
+    "plain":      "-",             # solid
+    "concurrent": (0, (4, 2)),     # dashed
+}
+MARKERS = ["o", "s", "^", "D", "v", "P", "X", "*", "<", ">"]
+GRAYS = ["#000000", "#303030", "#505050", "#707070"]
+
+def apply_style(dpi: int = 300, base_font: int = 9):
+    """Set print-friendly defaults suitable for figures."""
+    mpl.rcParams.update({
+        "font.size": base_font,
+        "axes.titlesize": base_font + 1,
+        "axes.labelsize": base_font,
+        "xtick.labelsize": base_font - 1,
+        "ytick.labelsize": base_font - 1,
+        "legend.fontsize": base_font - 1,
+        "lines.linewidth": 1.2,
+        "axes.grid": True,
+        "grid.alpha": 0.25,
+        "grid.linestyle": (0, (2, 2)),
+        "figure.dpi": dpi,
+        "savefig.dpi": dpi,
+        "savefig.bbox": "tight",
+    })
+
+def metric_label(metric: str) -> str:
+    return {
+        "build_ms": "Build time (ms)",
+        "size_mib": "Index size (MiB)",
+        "spill_mib": "Sort spill to temp files (MiB)",
+    }.get(metric, metric)
+
+# ----------------------- IO -----------------------
+
+def collect(store: str, files_glob: str | None = None) -> pd.DataFrame:
+    frames = [d.assign(size=d["rows"] if "rows" in d.columns else n)
+              for n, d in sheet_frames("index_builds", store, files_glob)]
+    if not frames:
+        raise SystemExit(f"No index_builds data in {files_glob or store}")
+    df = pd.concat(frames, ignore_index=True)
+    df["size_mib"] = pd.to_numeric(df["size_bytes"], errors="coerce") / 2**20
+    df["spill_mib"] = pd.to_numeric(df["temp_bytes"], errors="coerce").fillna(0) / 2**20
+    return df
+
+# ----------------------- Plot -----------------------
+
+def plot_metric(df: pd.DataFrame, metric: str, xlog: bool, ylog: bool, outdir: str,
+                title: str | None, fig_w: float, fig_h: float, dpi: int):
+    tables = sorted(df["table_name"].unique())
+    fig, axes = plt.subplots(1, len(tables), figsize=(fig_w * len(tables), fig_h), squeeze=False)
+
+    for ax, table in zip(axes[0], tables):
+        sub = df[df["table_name"] == table]
+        indexes = sorted(sub["index_name"].unique())
+        handles = []
+        for i, name in enumerate(indexes):
+            color, marker = GRAYS[i % len(GRAYS)], MARKERS[i % len(MARKERS)]
+            for mode, style in MODE_STYLE.items():
+                isub = sub[(sub["index_name"] == name) & (sub["build_mode"] == mode)]
+                if isub.empty:
+                    continue
+                grp = isub.groupby("size", as_index=False)[metric].mean().sort_values("size")
+                if ylog:
+                    grp = grp[grp[metric] > 0]
+                ax.plot(grp["size"], grp[metric], linestyle=style, color=color, marker=marker,
+                        linewidth=1.4, markersize=4.5)
+            method = sub.loc[sub["index_name"] == name, "index_method"].iloc[0]
+            handles.append(Line2D([0], [0], color=color, marker=marker, linewidth=1.4,
+                                  markersize=4.5, label=f"{name} ({method})"))
+
+        ax.set_title(table, pad=4)
+        ax.set_xlabel("Rows (N)")
+        ax.set_ylabel(metric_label(metric))
+        if xlog: ax.set_xscale("log")
+        if ylog: ax.set_yscale("log")
+        ax.grid(True, which="both", alpha=0.25)
+        ax.legend(handles=handles, loc="upper left", frameon=False, fontsize=6)
+
+    modes = [m for m in MODE_STYLE if m in set(df["build_mode"])]
+    fig.legend([Line2D([0], [0], color="#000", linestyle=MODE_STYLE[m], linewidth=1.6) for m in modes],
+               ["CREATE INDEX (solid)" if m == "plain" else "CREATE INDEX CONCURRENTLY (dashed)" for m in modes],
+               loc="lower center", bbox_to_anchor=(0.5, 0.0), ncol=len(modes), frameon=False)
+
+    suptitle = f"Index builds: {metric_label(metric)}"
+    if title:
+        suptitle = f"{title} — {suptitle}"
+    fig.suptitle(suptitle, y=0.98, fontsize=11)
+    fig.tight_layout(rect=[0.02, 0.08, 0.98, 0.94])
+
+    base = os.path.join(outdir, f"index_builds_{metric}")
+    fig.savefig(base + ".pdf")
+    fig.savefig(base + ".png", dpi=max(300, dpi))
+    plt.close(fig)
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-index build time / size / spill vs N from the result store.")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--glob", default=None, help="Read performance_run_<N>.xlsx files instead (older exports)")
+    ap.add_argument("--outdir", default="viz_index_builds", help="Output directory")
+    ap.add_argument("--metrics", nargs="+", choices=ALL_METRICS, default=ALL_METRICS, help="Metrics to plot")
+    ap.add_argument("--tables", nargs="*", default=[], help="Restrict to these tables (default: all)")
+    ap.add_argument("--indexes", nargs="*", default=[], help="Restrict to these index names (default: all)")
+    ap.add_argument("--modes", nargs="+", choices=list(MODE_STYLE), default=list(MODE_STYLE),
+                    help="Build modes to plot (default both)")
+    ap.add_argument("--scale", choices=["xylin", "xlog", "ylog", "xylog"], default="xylog",
+                    help="Axis scale preset (default xylog)")
+    ap.add_argument("--title", default="", help="Optional title prefix")
+    ap.add_argument("--width", type=float, default=3.6, help="Subplot width in inches")
+    ap.add_argument("--height", type=float, default=3.0, help="Figure height in inches")
+    ap.add_argument("--dpi", type=int, default=300, help="Figure DPI (PNG fallback)")
+    args = ap.parse_args()
+
+    apply_style(dpi=args.dpi, base_font=9)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    df = collect(args.store, args.glob)
+    df = df[df["build_mode"].isin(args.modes)]
+    if args.tables:
+        df = df[df["table_name"].isin(args.tables)]
+    if args.indexes:
+        df = df[df["index_name"].isin(args.indexes)]
+    if df.empty:
+        raise SystemExit("Nothing to plot after filtering.")
+
+    xlog = args.scale in ("xlog", "xylog")
+    ylog = args.scale in ("ylog", "xylog")
+    for metric in args.metrics:
+        plot_metric(df, metric, xlog, ylog, args.outdir, args.title or None,
+                    args.width, args.height, args.dpi)
+
+    tidy = df[["size", "table_name", "index_name", "index_method", "build_mode", "maintenance_work_mem",
+               "build_ms", "size_mib", "spill_mib"]].sort_values(["table_name", "index_name", "build_mode", "size"])
+    tidy.to_csv(os.path.join(args.outdir, "index_builds_tidy.csv"), index=False)
+    print(f"Saved figures to: {os.path.abspath(args.outdir)}")
+
+if __name__ == "__main__":
+    main()
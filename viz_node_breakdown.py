@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# viz_node_breakdown.py
+# Where the execution time goes inside each plan: the "node_breakdown" dataset of the
+# result store (bench.node_breakdown, built from bench.plan_nodes; see bench_store.py;
+# --glob: the sheet of performance_run_<N>.xlsx exports).
+# One FIGURE at one N: one horizontal stacked bar per scenario x label, one segment per
+# plan node type (p50 self time, or its share of the plan's total).
+# Style: grayscale-safe, hatched segments, vector export (PDF).
+#
+# Example:
+#   python viz_node_breakdown.py --size 1000000
+#   python viz_node_breakdown.py --metric share_pct --variants S1_expr_eq_num S4_ts_range
+#   python viz_node_breakdown.py --labels jsonb_indexed rel_indexed hybrid_indexed
+
+import argparse, os
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+from bench_store import STORE, sheet_frame
+
+METRICS = ["p50_self_ms", "share_pct"]
+
+GRAYS = ["#000000", "#404040", "#707070", "#a0a0a0", "#d0d0d0", "#ffffff"]
+HATCHES = ["", "///", "", "\\\\\\", "...", "xx"]
+
+def apply_style(dpi: int = 300, base_font: int = 9):
+    """Set print-friendly defaults suitable for figures."""
+    mpl.rcParams.update({
+        "font.size": base_font,
+        "axes.titlesize": base_font + 1,
+        "axes.labelsize": base_font,
+        "xtick.labelsize": base_font - 1,
+        "ytick.labelsize": base_font - 1,
+        "legend.fontsize": base_font - 1,
+        "hatch.linewidth": 0.5,
+        "axes.grid": True,
+        "grid.alpha": 0.25,
+        "grid.linestyle": (0, (2, 2)),
+        "figure.dpi": dpi,
+        "savefig.dpi": dpi,
+        "savefig.bbox": "tight",
+    })
+
+def metric_label(metric: str) -> str:
+    return {
+        "p50_self_ms": "p50 self time per node type (ms)",
+        "share_pct": "Share of plan self time (%)",
+    }.get(metric, metric)
+
+# ----------------------- Plot -----------------------
+
+def plot_breakdown(df: pd.DataFrame, metric: str, labels: list[str], outdir: str,
+                   title: str | None, fig_w: float, row_h: float, dpi: int):
+    n = int(df["size"].iloc[0])
+    # one segment per node type (summed over the objects it touched), in plan order
+    per_type = (df.groupby(["variant", "key", "node_type"], as_index=False)
+                  .agg(value=(metric, "sum"), node_order=("node_order", "min")))
+    types = per_type.groupby("node_type")["node_order"].min().sort_values().index.tolist()
+    wide = per_type.pivot_table(index=["variant", "key"], columns="node_type", values="value",
+                                aggfunc="sum", fill_value=0.0)
+    order = {k: i for i, k in enumerate(labels)}
+    rows = sorted(wide.index, key=lambda vk: (vk[0], order.get(vk[1], len(order)), vk[1]))
+    wide = wide.loc[rows, types]
+
+    fig, ax = plt.subplots(figsize=(fig_w, max(2.0, row_h * len(rows) + 1.0)))
+    y = range(len(rows))
+    left = pd.Series(0.0, index=wide.index)
+    for i, t in enumerate(types):
+        ax.barh(y, wide[t], left=left, height=0.7, color=GRAYS[i % len(GRAYS)],
+                hatch=HATCHES[i % len(HATCHES)], edgecolor="#000000", linewidth=0.4, label=t)
+        left += wide[t]
+
+    ax.set_yticks(list(y))
+    ax.set_yticklabels([f"{v}  {k}" for v, k in rows], fontsize=6)
+    ax.invert_yaxis()
+    ax.set_xlabel(metric_label(metric))
+    ax.grid(True, axis="y", alpha=0)
+    ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.08), ncol=min(4, len(types)),
+              frameon=False, fontsize=6)
+
+    suptitle = f"Per-node breakdown at N={n:,}: {metric_label(metric)}"
+    if title:
+        suptitle = f"{title} — {suptitle}"
+    fig.suptitle(suptitle, y=0.995, fontsize=11)
+    fig.tight_layout()
+
+    base = os.path.join(outdir, f"node_breakdown_{n}_{metric}")
+    fig.savefig(base + ".pdf")
+    fig.savefig(base + ".png", dpi=max(300, dpi))
+    plt.close(fig)
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-plan-node time breakdown (JSONB vs relational) from the result store.")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--glob", default=None, help="Read performance_run_<N>.xlsx files instead (older exports)")
+    ap.add_argument("--outdir", default="viz_node_breakdown", help="Output directory")
+    ap.add_argument("--size", type=int, default=None, help="N to plot (default: the largest found)")
+    ap.add_argument("--metric", choices=METRICS, default="p50_self_ms", help="Segment length")
+    ap.add_argument("--labels", nargs="*", default=["jsonb_indexed", "rel_indexed"],
+                    help="Label keys to compare (default: jsonb_indexed rel_indexed)")
+    ap.add_argument("--variants", nargs="*", default=[], help="Restrict to these scenarios (default: all)")
+    ap.add_argument("--title", default="", help="Optional title prefix")
+    ap.add_argument("--width", type=float, default=6.5, help="Figure width in inches")
+    ap.add_argument("--row-height", type=float, default=0.22, help="Height per bar in inches")
+    ap.add_argument("--dpi", type=int, default=300, help="Figure DPI (PNG fallback)")
+    args = ap.parse_args()
+
+    apply_style(dpi=args.dpi, base_font=9)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    df = sheet_frame("node_breakdown", args.store, args.glob)
+    df = df[df["size"] == (args.size or df["size"].max())]
+    if args.labels:
+        df = df[df["key"].isin(args.labels)]
+    if args.variants:
+        df = df[df["variant"].isin(args.variants)]
+    if df.empty:
+        raise SystemExit("Nothing to plot after filtering.")
+
+    plot_breakdown(df, args.metric, args.labels, args.outdir, args.title or None,
+                   args.width, args.row_height, args.dpi)
+
+    tidy = df[["size", "key", "variant", "node_order", "node_type", "object", "runs", "p50_self_ms",
+               "share_pct", "avg_self_blocks", "avg_rows_out", "avg_exact_heap_blocks",
+               "avg_lossy_heap_blocks"]] \
+        .sort_values(["variant", "key", "node_order"])
+    tidy.to_csv(os.path.join(args.outdir, "node_breakdown_tidy.csv"), index=False)
+    print(f"Saved figures to: {os.path.abspath(args.outdir)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# viz_pagination.py
+# Per-page latency of the pagination scenarios (L1/L2 LIMIT/OFFSET, L3/L4 keyset;
+# see bench.pagination) from the "pagination" dataset of the result store
+# (bench_store.py; --glob: the sheet of older performance_run_<N>.xlsx exports).
+# Pages 2.. exist only for runs with sweep points (BENCH_SWEEP=1).
+# One FIGURE PER METRIC (p50_ms, p50_vs_page1, cv_pct, avg_buffers) at one N;
+# one subplot per scenario, X-axis = page number (log), one line per label.
+# Style: grayscale-safe, distinct markers per label, vector export (PDF).
+#
+# Example:
+#   python viz_pagination.py --size 1000000
+#   python viz_pagination.py --glob "exports/performance_run_*.xlsx" --size 1000000   # older exports
+#   python viz_pagination.py --metrics p50_ms --labels jsonb_indexed rel_indexed hybrid_indexed
+
+import argparse, os
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+from bench_store import STORE, sheet_frame
+
+ALL_METRICS = ["p50_ms", "p50_vs_page1", "cv_pct", "avg_buffers"]
+
+LABEL_STYLE = {
+    # label key: (color, linestyle, marker)
+    "jsonb_indexed":   ("#000000", "-",           "o"),
+    "rel_indexed":     ("#505050", "-",           "s"),
+    "hybrid_indexed":  ("#303030", (0, (4, 2)),   "^"),
+    "jsonb_unindexed": ("#707070", (0, (1, 1.5)), "D"),
+    "rel_unindexed":   ("#909090", (0, (3, 1, 1, 1)), "v"),
+}
+
+def apply_style(dpi: int = 300, base_font: int = 9):
+    """Set print-friendly defaults suitable for figures."""
+    mpl.rcParams.update({
+        "font.size": base_font,
+        "axes.titlesize": base_font + 1,
+        "axes.labelsize": base_font,
+        "xtick.labelsize": base_font - 1,
+        "ytick.labelsize": base_font - 1,
+        "legend.fontsize": base_font - 1,
+        "lines.linewidth": 1.2,
+        "axes.grid": True,
+        "grid.alpha": 0.25,
+        "grid.linestyle": (0, (2, 2)),
+        "figure.dpi": dpi,
+        "savefig.dpi": dpi,
+        "savefig.bbox": "tight",
+    })
+
+def metric_label(metric: str) -> str:
+    return {
+        "p50_ms": "p50 latency per page (ms)",
+        "p50_vs_page1": "p50 relative to page 1",
+        "cv_pct": "Run-to-run variation (CV %)",
+        "avg_buffers": "Shared blocks per page",
+    }.get(metric, metric)
+
+# ----------------------- Plot -----------------------
+
+def plot_metric(df: pd.DataFrame, metric: str, ylog: bool, outdir: str,
+                title: str | None, fig_w: float, fig_h: float, dpi: int):
+    n = int(df["size"].iloc[0])
+    variants = sorted(df["variant"].unique())
+    fig, axes = plt.subplots(1, len(variants), figsize=(fig_w * len(variants), fig_h), squeeze=False)
+
+    for ax, variant in zip(axes[0], variants):
+        sub = df[df["variant"] == variant]
+        for key in [k for k in LABEL_STYLE if k in set(sub["key"])] + \
+                   sorted(set(sub["key"]) - set(LABEL_STYLE)):
+            color, style, marker = LABEL_STYLE.get(key, ("#b0b0b0", (0, (2, 1)), "x"))
+            ksub = sub[sub["key"] == key].sort_values("page")
+            if ylog:
+                ksub = ksub[ksub[metric] > 0]
+            if ksub.empty:
+                continue
+            ax.plot(ksub["page"], ksub[metric], linestyle=style, color=color, marker=marker,
+                    linewidth=1.4, markersize=4.0, label=key)
+
+        ax.set_title(variant, pad=4)
+        ax.set_xlabel("Page")
+        ax.set_ylabel(metric_label(metric))
+        ax.set_xscale("log")
+        if ylog: ax.set_yscale("log")
+        ax.grid(True, which="both", alpha=0.25)
+        ax.legend(loc="upper left", frameon=False, fontsize=6)
+
+    suptitle = f"Pagination at N={n:,}: {metric_label(metric)}"
+    if title:
+        suptitle = f"{title} — {suptitle}"
+    fig.suptitle(suptitle, y=0.98, fontsize=11)
+    fig.tight_layout(rect=[0.02, 0.02, 0.98, 0.94])
+
+    base = os.path.join(outdir, f"pagination_{n}_{metric}")
+    fig.savefig(base + ".pdf")
+    fig.savefig(base + ".png", dpi=max(300, dpi))
+    plt.close(fig)
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-page latency of the pagination scenarios (L1..L4) from the result store.")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--glob", default=None, help="Read performance_run_<N>.xlsx files instead (older exports)")
+    ap.add_argument("--outdir", default="viz_pagination", help="Output directory")
+    ap.add_argument("--size", type=int, default=None, help="N to plot (default: the largest found)")
+    ap.add_argument("--metrics", nargs="+", choices=ALL_METRICS, default=ALL_METRICS, help="Metrics to plot")
+    ap.add_argument("--labels", nargs="*", default=[], help="Restrict to these label keys (default: all)")
+    ap.add_argument("--ylog", action="store_true", help="Log-scale Y axis")
+    ap.add_argument("--title", default="", help="Optional title prefix")
+    ap.add_argument("--width", type=float, default=3.0, help="Subplot width in inches")
+    ap.add_argument("--height", type=float, default=3.0, help="Figure height in inches")
+    ap.add_argument("--dpi", type=int, default=300, help="Figure DPI (PNG fallback)")
+    args = ap.parse_args()
+
+    apply_style(dpi=args.dpi, base_font=9)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    df = sheet_frame("pagination", args.store, args.glob)
+    df = df[df["size"] == (args.size or df["size"].max())]
+    if args.labels:
+        df = df[df["key"].isin(args.labels)]
+    if df.empty:
+        raise SystemExit("Nothing to plot after filtering.")
+
+    for metric in args.metrics:
+        plot_metric(df, metric, args.ylog, args.outdir, args.title or None,
+                    args.width, args.height, args.dpi)
+
+    tidy = df[["size", "key", "variant", "method", "page_size", "page", "rows_skipped", "avg_rows",
+               "p50_ms", "p95_ms", "cv_pct", "p50_vs_page1", "avg_buffers"]] \
+        .sort_values(["key", "variant", "page"])
+    tidy.to_csv(os.path.join(args.outdir, "pagination_tidy.csv"), index=False)
+    print(f"Saved figures to: {os.path.abspath(args.outdir)}")
+
+if __name__ == "__main__":
+    main()
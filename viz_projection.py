@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# viz_projection.py
+# Latency vs projection width from the "projection" dataset of the result store
+# (bench_store.py; --glob: the sheet of older performance_run_<N>.xlsx exports)
+# (scenarios P1, P5, P15, P30; see bench.projection).
+# One FIGURE PER METRIC (p50_ms, us_per_row, p50_serialize_ms, blocks_per_krow);
+# one subplot per N, X-axis = attributes returned per row, one line per label.
+# Style: grayscale-safe, distinct markers per label, vector export (PDF).
+#
+# Example:
+#   python viz_projection.py
+#   python viz_projection.py --glob "exports/performance_run_*.xlsx"   # older exports
+#   python viz_projection.py --metrics us_per_row --labels jsonb_indexed rel_indexed hybrid_indexed
+
+import argparse, os
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+from bench_store import STORE, sheet_frame
+
+ALL_METRICS = ["p50_ms", "us_per_row", "p50_serialize_ms", "blocks_per_krow"]
+WIDTHS = [1, 5, 15, 30]
+
+LABEL_STYLE = {
+    # label key: (color, linestyle, marker)
+    "jsonb_indexed":  ("#000000", "-",           "o"),
+    "rel_indexed":    ("#505050", "-",           "s"),
+    "hybrid_indexed": ("#303030", (0, (4, 2)),   "^"),
+    "jsonb_payload":  ("#707070", (0, (1, 1.5)), "D"),
+}
+
+def apply_style(dpi: int = 300, base_font: int = 9):
+    """Set print-friendly defaults suitable for figures."""
+    mpl.rcParams.update({
+        "font.size": base_font,
+        "axes.titlesize": base_font + 1,
+        "axes.labelsize": base_font,
+        "xtick.labelsize": base_font - 1,
+        "ytick.labelsize": base_font - 1,
+        "legend.fontsize": base_font - 1,
+        "lines.linewidth": 1.2,
+        "axes.grid": True,
+        "grid.alpha": 0.25,
+        "grid.linestyle": (0, (2, 2)),
+        "figure.dpi": dpi,
+        "savefig.dpi": dpi,
+        "savefig.bbox": "tight",
+    })
+
+def metric_label(metric: str) -> str:
+    return {
+        "p50_ms": "p50 latency (ms)",
+        "us_per_row": "p50 time per row (µs)",
+        "p50_serialize_ms": "p50 output serialization (ms)",
+        "blocks_per_krow": "Shared blocks per 1000 rows",
+    }.get(metric, metric)
+
+# ----------------------- Plot -----------------------
+
+def plot_metric(df: pd.DataFrame, metric: str, ylog: bool, outdir: str,
+                title: str | None, fig_w: float, fig_h: float, dpi: int):
+    sizes = sorted(df["size"].dropna().unique())
+    fig, axes = plt.subplots(1, len(sizes), figsize=(fig_w * len(sizes), fig_h), squeeze=False)
+
+    for ax, n in zip(axes[0], sizes):
+        sub = df[df["size"] == n]
+        for key in [k for k in LABEL_STYLE if k in set(sub["key"])] + \
+                   sorted(set(sub["key"]) - set(LABEL_STYLE)):
+            color, style, marker = LABEL_STYLE.get(key, ("#909090", (0, (3, 1, 1, 1)), "v"))
+            ksub = sub[sub["key"] == key].sort_values("width")
+            if ylog:
+                ksub = ksub[ksub[metric] > 0]
+            if ksub.empty:
+                continue
+            ax.plot(ksub["width"], ksub[metric], linestyle=style, color=color, marker=marker,
+                    linewidth=1.4, markersize=4.5, label=key)
+
+        ax.set_title(f"N={int(n):,}", pad=4)
+        ax.set_xlabel("Attributes per row")
+        ax.set_ylabel(metric_label(metric))
+        ax.set_xticks(WIDTHS)
+        if ylog: ax.set_yscale("log")
+        ax.grid(True, which="both", alpha=0.25)
+        ax.legend(loc="upper left", frameon=False, fontsize=6)
+
+    suptitle = f"Projection width: {metric_label(metric)}"
+    if title:
+        suptitle = f"{title} — {suptitle}"
+    fig.suptitle(suptitle, y=0.98, fontsize=11)
+    fig.tight_layout(rect=[0.02, 0.02, 0.98, 0.94])
+
+    base = os.path.join(outdir, f"projection_{metric}")
+    fig.savefig(base + ".pdf")
+    fig.savefig(base + ".png", dpi=max(300, dpi))
+    plt.close(fig)
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Latency vs projection width (P1..P30) from the result store.")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--glob", default=None, help="Read performance_run_<N>.xlsx files instead (older exports)")
+    ap.add_argument("--outdir", default="viz_projection", help="Output directory")
+    ap.add_argument("--metrics", nargs="+", choices=ALL_METRICS, default=ALL_METRICS, help="Metrics to plot")
+    ap.add_argument("--labels", nargs="*", default=[], help="Restrict to these label keys (default: all)")
+    ap.add_argument("--sizes", nargs="*", type=int, default=[], help="Restrict to these N (default: all)")
+    ap.add_argument("--ylog", action="store_true", help="Log-scale Y axis")
+    ap.add_argument("--title", default="", help="Optional title prefix")
+    ap.add_argument("--width", type=float, default=3.0, help="Subplot width in inches")
+    ap.add_argument("--height", type=float, default=3.0, help="Figure height in inches")
+    ap.add_argument("--dpi", type=int, default=300, help="Figure DPI (PNG fallback)")
+    args = ap.parse_args()
+
+    apply_style(dpi=args.dpi, base_font=9)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    df = sheet_frame("projection", args.store, args.glob)
+    if args.labels:
+        df = df[df["key"].isin(args.labels)]
+    if args.sizes:
+        df = df[df["size"].isin(args.sizes)]
+    if df.empty:
+        raise SystemExit("Nothing to plot after filtering.")
+
+    for metric in args.metrics:
+        plot_metric(df, metric, args.ylog, args.outdir, args.title or None,
+                    args.width, args.height, args.dpi)
+
+    tidy = df[["size", "key", "variant", "width", "avg_rows", "p50_ms", "p95_ms", "p50_serialize_ms",
+               "output_kb", "blocks_per_krow", "us_per_row"]].sort_values(["size", "key", "width"])
+    tidy.to_csv(os.path.join(args.outdir, "projection_tidy.csv"), index=False)
+    print(f"Saved figures to: {os.path.abspath(args.outdir)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,35 @@
 #!/usr/bin/env python3
 # viz_scaling.py
 # One FIGURE PER METRIC; inside each figure, small-multiples: one subplot per scenario.
-# Grid: 2 columns × 5 rows (S1..S10).
-# X-axis = Rows (N), lines = series (jsonb/rel × indexed/unindexed).
+# Grid: 2 columns × as many rows as scenario families (S1..S10, ...); titles and
+# family order come from the "scenarios" sheet (scenario catalog) when present.
+# X-axis = Rows (N), lines = series (jsonb/rel × indexed/unindexed, hybrid indexed,
+#   jsonb_gin containment).
+# --x selectivity: X-axis = actual selectivity (rows returned / N) from the
+#   "selectivity" sheet (scenario sweeps, BENCH_SWEEP=1) at one size (--size).
 # Style: grayscale-safe, solid vs dashed lines, distinct markers,
 #        95% CI bands, vector export (PDF), figure-level legend.
+# Input: the result store (bench_store.py); --glob reads older performance_run_<N>.xlsx
+#   exports instead (same sheet names).
 #
 # Defaults:
 #   - y-axis label removed from each subplot (use --ylabel figure or --ylabel per-axis to change)
 #   - double-column width preset unless --ratio is provided
 
-import argparse, os, re, glob
+import argparse, os, re
 import numpy as np
 import pandas as pd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 
+from bench_store import STORE, load_meta, sheet_frames
+from scenarios import family_titles
+
 ALL_METRICS = ["p50_ms", "p95_ms", "avg_ms", "sum_shared_reads", "sum_shared_hits"]
 
-# Grid geometry (fixed)
-COLS, ROWS = 2, 5
+# Grid geometry: fixed columns, rows = ceil(families / COLS)
+COLS = 2
 
 def apply_style(dpi: int = 300, base_font: int = 9):
     """Set print-friendly defaults suitable for figures."""
@@ -47,11 +56,14 @@ def apply_style(dpi: int = 300, base_font: int = 9):
 ENGINE_COLOR = {
     "jsonb": "#303030",  # dark gray
     "rel":   "#000000",  # black
+    "hybrid": "#606060", # mid gray
+    "jsonb_gin": "#303030",  # same gray as jsonb; dash-dot tells them apart
 }
 # Linestyle by indexing (solid vs dashed)
 INDEX_STYLE = {
     "indexed":   "-",             # solid
     "unindexed": (0, (4, 2)),     # dashed
+    "containment": (0, (4, 1, 1, 1)),  # dash-dot
 }
 # Distinct markers
 MARKER = {
@@ -59,13 +71,15 @@ MARKER = {
     ("jsonb", "unindexed"): "o",
     ("rel",   "indexed"):   "s",
     ("rel",   "unindexed"): "s",
+    ("hybrid", "indexed"):  "^",
+    ("jsonb_gin", "containment"): "D",
 }
 
-# ----------------------- Parsing helpers -----------------------
+# Fixed plotting/legend order, keeps lines consistent across subplots
+SERIES_ORDER = ["jsonb_indexed", "rel_indexed", "hybrid_indexed", "jsonb_gin_containment",
+                "jsonb_unindexed", "rel_unindexed"]
 
-def parse_size_from_filename(path: str):
-    m = re.search(r"performance_run_(\d+)\.xlsx$", os.path.basename(path))
-    return int(m.group(1)) if m else None
+# ----------------------- Parsing helpers -----------------------
 
 def parse_size_from_label(label: str):
     if not isinstance(label, str):
@@ -83,23 +97,19 @@ def parse_engine_indexing(label: str):
     if not isinstance(label, str):
         return None, None
     l = label.strip().lower()
-    m = re.search(r"\b(jsonb|rel)_(unindexed|indexed)\b", l)
+    m = re.search(r"\b(jsonb_gin|jsonb|rel|hybrid)_(containment|unindexed|indexed)\b", l)
     if m:
         eng, idx = m.group(1), m.group(2)
         return eng, idx
     # Fallback token-based
     tokens = set(re.split(r"[\s=,]+", l))
-    eng = "jsonb" if "jsonb" in tokens else ("rel" if "rel" in tokens else None)
+    eng = next((e for e in ("jsonb", "rel", "hybrid") if e in tokens), None)
     idx = "unindexed" if "unindexed" in tokens else ("indexed" if "indexed" in tokens else None)
     return eng, idx
 
 # ----------------------- IO -----------------------
 
-def load_one(path: str) -> pd.DataFrame:
-    size = parse_size_from_filename(path)
-    df = pd.read_excel(path, sheet_name="summary")
-    df.columns = [c.strip().lower() for c in df.columns]
-
+def prepare(df: pd.DataFrame, size) -> pd.DataFrame:
     # derive size if missing
     if size is None and "label" in df.columns and len(df):
         size = parse_size_from_label(df["label"].iloc[0])
@@ -115,16 +125,10 @@ def load_one(path: str) -> pd.DataFrame:
     )
     return df
 
-def collect(files_glob: str) -> pd.DataFrame:
-    frames = []
-    for p in sorted(glob.glob(files_glob)):
-        try:
-            d = load_one(p)
-            frames.append(d)
-        except Exception as e:
-            print(f"[warn] skipping {p}: {e}")
+def collect(store: str, files_glob: str | None = None, sheet: str = "summary") -> pd.DataFrame:
+    frames = [prepare(d, n) for n, d in sheet_frames(sheet, store, files_glob)]
     if not frames:
-        raise SystemExit(f"No files matched: {files_glob}")
+        raise SystemExit(f"No {sheet} data in {files_glob or store}")
     out = pd.concat(frames, ignore_index=True)
     # normalize optional IO cols
     for col in ["sum_shared_reads", "sum_shared_hits"]:
@@ -134,37 +138,31 @@ def collect(files_glob: str) -> pd.DataFrame:
 
 # ----------------------- Scenario helpers -----------------------
 
-def scenario_family(variant: str) -> str:
-    if not isinstance(variant, str):
-        return "Other"
-    m = re.match(r"^(S\d+)", variant)
-    return m.group(1) if m else "Other"
-
 def family_sort_key(fam: str):
     m = re.match(r"^S(\d+)$", fam)
     return (0, int(m.group(1))) if m else (1, fam)
 
-def fam_title(fam: str) -> str:
-    names = {
-        "S1":  "Equality + Numeric Inequality",
-        "S2":  "LIKE Prefix Search",
-        "S3":  "Substring Contains (trigram)",
-        "S4":  "Timestamp Range",
-        "S5":  "Array AND (contain both)",
-        "S6":  "Array OR (overlap)",
-        "S7":  "Multi-key AND (2 keys)",
-        "S8":  "Multi-key AND (3 keys)",
-        "S9":  "OR across keys",
-        "S10": "Top-N by timestamp",
-    }
-    return names.get(fam, fam)
+def family_order(fams: set[str], meta: dict) -> list[str]:
+    """Catalog order when scenario sheets are present, else S<n> numeric order."""
+    rank = {}
+    for r in sorted(meta.values(), key=lambda r: (r.get("ord") or 0)):
+        rank.setdefault(r.get("family"), len(rank))
+    return sorted(fams, key=lambda f: (rank.get(f, len(rank)), family_sort_key(f)))
+
+def scenario_family(variant: str, meta: dict | None = None) -> str:
+    if meta and variant in meta and meta[variant].get("family"):
+        return meta[variant]["family"]
+    if not isinstance(variant, str):
+        return "Other"
+    m = re.match(r"^(S\d+)", variant)
+    return m.group(1) if m else "Other"
 
 def choose_series(indexing: str):
     if indexing == "indexed":
-        return ["jsonb_indexed", "rel_indexed"]
+        return ["jsonb_indexed", "rel_indexed", "hybrid_indexed", "jsonb_gin_containment"]
     if indexing == "unindexed":
         return ["jsonb_unindexed", "rel_unindexed"]
-    return ["jsonb_indexed", "rel_indexed", "jsonb_unindexed", "rel_unindexed"]
+    return SERIES_ORDER
 
 def parse_scale(scale: str):
     scale = scale.lower()
@@ -194,15 +192,22 @@ def metric_label(metric: str) -> str:
 
 def plot_metric_grid(df: pd.DataFrame, metric: str, variants: list[str], series_keys: list[str],
                      xlog: bool, ylog: bool, outdir: str, title: str | None,
-                     fig_w: float, fig_h: float, dpi: int, ylabel_mode: str = "none"):
-    fams = sorted({scenario_family(v) for v in variants}, key=family_sort_key)
+                     fig_w: float | None, fig_h: float, dpi: int, ylabel_mode: str = "none",
+                     ratio: float | None = None, meta: dict | None = None, x: str = "size"):
+    meta = meta or {}
+    fams = family_order({scenario_family(v, meta) for v in variants}, meta)
+    titles = family_titles(meta)
+    rows = max(1, -(-len(fams) // COLS))
+    if ratio is not None:
+        # Enforce: TOTAL_WIDTH = ratio * TOTAL_HEIGHT
+        fig_w = ratio * (rows / COLS) * fig_h
 
-    fig, axes = plt.subplots(ROWS, COLS, figsize=(fig_w * COLS, fig_h * ROWS), squeeze=False)
+    fig, axes = plt.subplots(rows, COLS, figsize=(fig_w * COLS, fig_h * rows), squeeze=False)
 
     for i, fam in enumerate(fams):
         r, c = divmod(i, COLS)
         ax = axes[r][c]
-        fam_vars = [v for v in variants if scenario_family(v) == fam]
+        fam_vars = [v for v in variants if scenario_family(v, meta) == fam]
         sub = df[df["variant"].isin(fam_vars)].copy()
 
         if ylog:
@@ -210,11 +215,10 @@ def plot_metric_grid(df: pd.DataFrame, metric: str, variants: list[str], series_
             sub.loc[sub[metric] <= 0, metric] = np.nan
 
         # fixed plotting order to keep lines consistent across subplots
-        order = ["jsonb_indexed", "rel_indexed", "jsonb_unindexed", "rel_unindexed"]
-        for key in order:
+        for key in SERIES_ORDER:
             if key not in series_keys:
                 continue
-            eng, idx = key.split("_", 1)
+            eng, idx = key.rsplit("_", 1)
 
             color  = ENGINE_COLOR.get(eng, "#000000")
             style  = INDEX_STYLE.get(idx, "-")
@@ -224,56 +228,56 @@ def plot_metric_grid(df: pd.DataFrame, metric: str, variants: list[str], series_
             if ksub.empty:
                 continue
 
-            # aggregate mean + CI across identical sizes
-            grp = ci_95_from_grouped(ksub.groupby("size", dropna=True), metric)
-            grp = grp.sort_values("size")
+            # aggregate mean + CI across identical x values
+            grp = ci_95_from_grouped(ksub.groupby(x, dropna=True), metric)
+            grp = grp.sort_values(x)
 
             # line + CI band
-            ax.plot(grp["size"], grp["mean"], linestyle=style, color=color, marker=marker,
+            ax.plot(grp[x], grp["mean"], linestyle=style, color=color, marker=marker,
                     label=f"{eng.upper()} ({idx})", linewidth=1.4, markersize=4.5)
-            ax.fill_between(grp["size"], grp["mean"] - grp["ci"], grp["mean"] + grp["ci"],
+            ax.fill_between(grp[x], grp["mean"] - grp["ci"], grp["mean"] + grp["ci"],
                             color=color, alpha=0.15, linewidth=0)
 
-        ax.set_title(f"{fam} — {fam_title(fam)}", pad=4)
-        ax.set_xlabel("Rows (N)")
+        ax.set_title(f"{fam} — {titles[fam]}" if titles.get(fam) else fam, pad=4)
+        ax.set_xlabel("Rows (N)" if x == "size" else "Selectivity (rows / N)")
         if ylabel_mode == "per-axis":
             ax.set_ylabel(metric_label(metric))
         if xlog: ax.set_xscale("log")
         if ylog: ax.set_yscale("log")
         ax.grid(True, which="both", alpha=0.25)
 
-    # hide empty cells (in case fewer than 10 families)
-    for j in range(len(fams), ROWS * COLS):
+    # hide empty cells (odd number of families)
+    for j in range(len(fams), rows * COLS):
         r, c = divmod(j, COLS)
         axes[r][c].axis("off")
 
     # -------- Figure-level legend (outside, bottom-center) --------
     legend_items, legend_labels = [], []
-    for key in ["jsonb_indexed", "rel_indexed", "jsonb_unindexed", "rel_unindexed"]:
+    for key in SERIES_ORDER:
         if key not in series_keys:
             continue
-        eng, idx = key.split("_", 1)
+        eng, idx = key.rsplit("_", 1)
         proxy = Line2D([0], [0],
                        color=ENGINE_COLOR.get(eng, "#000"),
                        linestyle=INDEX_STYLE.get(idx, "-"),
                        marker=MARKER.get((eng, idx), "o"),
                        linewidth=1.6, markersize=5.0)
         legend_items.append(proxy)
-        style_word = "solid" if INDEX_STYLE.get(idx, "-") == "-" else "dashed"
+        style_word = {"indexed": "solid", "unindexed": "dashed"}.get(idx, "dash-dot")
         legend_labels.append(f"{eng.upper()} ({idx}; {style_word})")
 
     plt.subplots_adjust(top=0.88, bottom=0.20)
     if legend_items:
         fig.legend(legend_items, legend_labels,
                    loc="lower center", bbox_to_anchor=(0.5, 0.02),
-                   ncol=min(4, len(legend_items)), frameon=False)
+                   ncol=min(5, len(legend_items)), frameon=False)
 
     # Optional shared y label
     if ylabel_mode == "figure":
         fig.supylabel(metric_label(metric))
 
     # Title + layout
-    suptitle = f"Scaling: {metric_label(metric)}"
+    suptitle = f"Scaling: {metric_label(metric)}" if x == "size" else f"{metric_label(metric)} vs selectivity"
     if title:
         suptitle = f"{title} — {suptitle}"
     fig.suptitle(suptitle, y=0.965, fontsize=11)
@@ -281,7 +285,7 @@ def plot_metric_grid(df: pd.DataFrame, metric: str, variants: list[str], series_
     fig.tight_layout(rect=[0.02, 0.12, 0.98, 0.90])
 
     # Save vector (PDF) + PNG fallback
-    base = os.path.join(outdir, f"scaling_{metric}")
+    base = os.path.join(outdir, f"{'scaling' if x == 'size' else 'selectivity'}_{metric}")
     fig.savefig(base + ".pdf")
     fig.savefig(base + ".png", dpi=max(300, dpi))      # high-DPI raster fallback
     plt.close(fig)
@@ -289,8 +293,9 @@ def plot_metric_grid(df: pd.DataFrame, metric: str, variants: list[str], series_
 # ----------------------- Main -----------------------
 
 def main():
-    ap = argparse.ArgumentParser(description="style cross-size scaling charts from performance_run_<N>.xlsx files.")
-    ap.add_argument("--glob", default="exports/performance_run_*.xlsx", help="Glob for input Excel files")
+    ap = argparse.ArgumentParser(description="style cross-size scaling charts from the result store.")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--glob", default=None, help="Read performance_run_<N>.xlsx files instead (older exports)")
     ap.add_argument("--outdir", default="viz_scaling", help="Output directory")
 
     # Metric selection
@@ -304,9 +309,13 @@ def main():
                     help="Restrict to these variants (e.g. S1_expr_eq_num S4_ts_range)")
     ap.add_argument("--indexing", choices=["both", "indexed", "unindexed"], default="both",
                     help="Include indexed+unindexed (default), or only one category")
-    ap.add_argument("--scale", choices=["xylin", "xlog", "ylog", "xylog"], default="xylin",
-                    help="Axis scale preset (default linear)")
+    ap.add_argument("--scale", choices=["xylin", "xlog", "ylog", "xylog"], default=None,
+                    help="Axis scale preset (default linear; xlog with --x selectivity)")
     ap.add_argument("--title", default="", help="Optional title prefix")
+    ap.add_argument("--x", choices=["size", "selectivity"], default="size",
+                    help="X-axis: rows N (default) or actual selectivity of the sweep points")
+    ap.add_argument("--size", type=int, default=None,
+                    help="With --x selectivity: dataset size to plot (default: largest found)")
 
     # Y-axis label mode (default 'none' to remove per-subplot labels)
     ap.add_argument("--ylabel", choices=["none", "per-axis", "figure"], default="none",
@@ -330,12 +339,9 @@ def main():
     # Base subplot row height
     fig_h_per_row = args.rowheight
 
-    # Compute per-subplot-column width
+    # Per-subplot-column width (--ratio: computed per figure from its row count)
     if args.ratio is not None:
-        # Enforce: TOTAL_WIDTH = ratio * TOTAL_HEIGHT
-        # TOTAL_WIDTH  = (fig_w_per_subplot_col * COLS)
-        # TOTAL_HEIGHT = (fig_h_per_row * ROWS)
-        fig_w_per_subplot_col = args.ratio * (ROWS / COLS) * fig_h_per_row
+        fig_w_per_subplot_col = None
     else:
         # Use column presets
         if args.column == "single":
@@ -345,10 +351,19 @@ def main():
         fig_w_per_subplot_col = per_col_w
 
     os.makedirs(args.outdir, exist_ok=True)
-    df = collect(args.glob)
+    df = collect(args.store, args.glob, "summary" if args.x == "size" else "selectivity")
+    meta = load_meta(args.store, args.glob)
     if df["size"].isna().any():
-        print("[warn] Some files/labels lacked N; dropping those rows.")
+        print("[warn] Some sheets/labels lacked N; dropping those rows.")
         df = df.dropna(subset=["size"])
+    if args.x == "selectivity":
+        # one curve per series at a single N; latency at different N is not comparable
+        size = args.size if args.size is not None else int(df["size"].max())
+        df = df[(df["size"] == size) & df["selectivity"].notna()]
+        if df.empty:
+            raise SystemExit(f"No selectivity data for N={size}")
+        if args.title == "":
+            args.title = f"N={size:,}"
 
     # Decide metrics
     if args.all:
@@ -364,7 +379,8 @@ def main():
     df["variant"] = df["variant"].astype(str)
     all_variants = sorted(
         df["variant"].unique().tolist(),
-        key=lambda v: (0, int(re.match(r"^S(\d+)", v).group(1))) if re.match(r"^S(\d+)", v) else (1, v)
+        key=lambda v: ((meta[v].get("ord") or 0) if v in meta else float("inf"),
+                       family_sort_key(scenario_family(v)), v)
     )
     variants = args.variants if args.variants else all_variants
 
@@ -372,23 +388,27 @@ def main():
     series_keys = choose_series(args.indexing)
 
     # Axis scales
-    xlog, ylog = parse_scale(args.scale)
+    # (selectivities span several decades)
+    xlog, ylog = parse_scale(args.scale or ("xylin" if args.x == "size" else "xlog"))
 
     for metric in metrics:
         if metric not in df.columns:
             print(f"[warn] metric {metric} not found; skipping.")
             continue
-        sub = df[["size", "label", "variant", "engine", "indexing", "series", metric]].copy()
+        x = args.x
+        sub = df[list(dict.fromkeys(["size", x, "label", "variant", "engine", "indexing", "series", metric]))].copy()
         plot_metric_grid(
             sub, metric, variants, series_keys, xlog, ylog,
             outdir=args.outdir, title=(args.title or None),
             fig_w=fig_w_per_subplot_col, fig_h=fig_h_per_row, dpi=args.dpi,
-            ylabel_mode=args.ylabel
+            ylabel_mode=args.ylabel, ratio=args.ratio, meta=meta, x=x
         )
 
         # Tidy CSV for reference (now with correct series)
-        tidy = sub.copy()[["size", "series", "variant", metric]].sort_values(["variant", "series", "size"])
-        tidy.to_csv(os.path.join(args.outdir, f"scaling_{metric}.csv"), index=False)
+        tidy = sub.copy()[list(dict.fromkeys(["size", x, "series", "variant", metric]))] \
+            .sort_values(["variant", "series", x])
+        prefix = "scaling" if x == "size" else "selectivity"
+        tidy.to_csv(os.path.join(args.outdir, f"{prefix}_{metric}.csv"), index=False)
 
     print(f"Saved charts (PDF + PNG) to {args.outdir}")
 
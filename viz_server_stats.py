@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# viz_server_stats.py
+# Server-side view of the suite runs: the "wait_events" and "server_stats"
+# datasets of the result store (bench.wait_events / bench.server_stats, from
+# bench.run_stats and the sampled bench.wait_samples; see server_stats.py;
+# --glob: the sheets of performance_run_<N>.xlsx exports).
+# At one N, one horizontal stacked bar per scenario x label:
+#   waits   share of the sampled time on CPU / per wait event type (IO, LWLock, ...)
+#   blocks  pg_statio blocks per execution: heap / index / TOAST, hit vs read
+# Style: grayscale-safe, hatched segments, vector export (PDF).
+#
+# Example:
+#   python viz_server_stats.py --size 1000000
+#   python viz_server_stats.py --kinds waits --variants S3_trgm_contains S9_or_keys
+#   python viz_server_stats.py --labels jsonb_indexed rel_indexed hybrid_indexed
+
+import argparse, os
+import pandas as pd
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+from bench_store import STORE, sheet_frame
+
+KINDS = ["waits", "blocks"]
+
+WAIT_TYPES = ["CPU", "IO", "LWLock", "Lock", "BufferPin", "IPC", "Timeout", "Activity", "Client", "Extension"]
+
+BLOCK_SEGMENTS = [
+    # (server_stats column, legend label)
+    ("heap_blks_hit",   "heap hit"),
+    ("heap_blks_read",  "heap read"),
+    ("idx_blks_hit",    "index hit"),
+    ("idx_blks_read",   "index read"),
+    ("toast_blks_hit",  "TOAST hit"),
+    ("toast_blks_read", "TOAST read"),
+]
+
+GRAYS = ["#000000", "#404040", "#707070", "#a0a0a0", "#d0d0d0", "#ffffff"]
+HATCHES = ["", "///", "", "\\\\\\", "...", "xx"]
+
+def apply_style(dpi: int = 300, base_font: int = 9):
+    """Set print-friendly defaults suitable for figures."""
+    mpl.rcParams.update({
+        "font.size": base_font,
+        "axes.titlesize": base_font + 1,
+        "axes.labelsize": base_font,
+        "xtick.labelsize": base_font - 1,
+        "ytick.labelsize": base_font - 1,
+        "legend.fontsize": base_font - 1,
+        "hatch.linewidth": 0.5,
+        "axes.grid": True,
+        "grid.alpha": 0.25,
+        "grid.linestyle": (0, (2, 2)),
+        "figure.dpi": dpi,
+        "savefig.dpi": dpi,
+        "savefig.bbox": "tight",
+    })
+
+def kind_label(kind: str) -> str:
+    return {
+        "waits": "Share of sampled time (%)",
+        "blocks": "pg_statio blocks per execution",
+    }.get(kind, kind)
+
+# ----------------------- IO -----------------------
+
+def wait_shares(df: pd.DataFrame) -> pd.DataFrame:
+    """(variant, key) x wait event type, % of the samples."""
+    wide = df.pivot_table(index=["variant", "key"], columns="wait_event_type", values="samples",
+                          aggfunc="sum", fill_value=0)
+    wide = 100.0 * wide.div(wide.sum(axis=1), axis=0)
+    return wide[[t for t in WAIT_TYPES if t in wide.columns] + sorted(set(wide.columns) - set(WAIT_TYPES))]
+
+def block_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """(variant, key) x heap/index/TOAST hit/read, per execution (pg_stat_statements calls)."""
+    df = df.set_index(["variant", "key"])
+    calls = df["calls"].where(df["calls"] > 0)
+    wide = pd.DataFrame({name: df[col] / calls for col, name in BLOCK_SEGMENTS})
+    return wide.dropna(how="all").fillna(0.0)
+
+# ----------------------- Plot -----------------------
+
+def plot_stacked(wide: pd.DataFrame, n: int, kind: str, labels: list[str], outdir: str,
+                 title: str | None, fig_w: float, row_h: float, dpi: int):
+    order = {k: i for i, k in enumerate(labels)}
+    rows = sorted(wide.index, key=lambda vk: (vk[0], order.get(vk[1], len(order)), vk[1]))
+    wide = wide.loc[rows]
+
+    fig, ax = plt.subplots(figsize=(fig_w, max(2.0, row_h * len(rows) + 1.0)))
+    y = range(len(rows))
+    left = pd.Series(0.0, index=wide.index)
+    for i, seg in enumerate(wide.columns):
+        ax.barh(y, wide[seg], left=left, height=0.7, color=GRAYS[i % len(GRAYS)],
+                hatch=HATCHES[i % len(HATCHES)], edgecolor="#000000", linewidth=0.4, label=seg)
+        left += wide[seg]
+
+    ax.set_yticks(list(y))
+    ax.set_yticklabels([f"{v}  {k}" for v, k in rows], fontsize=6)
+    ax.invert_yaxis()
+    ax.set_xlabel(kind_label(kind))
+    ax.grid(True, axis="y", alpha=0)
+    ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.08), ncol=min(5, len(wide.columns)),
+              frameon=False, fontsize=6)
+
+    suptitle = f"Server-side stats at N={n:,}: {kind_label(kind)}"
+    if title:
+        suptitle = f"{title} — {suptitle}"
+    fig.suptitle(suptitle, y=0.995, fontsize=11)
+    fig.tight_layout()
+
+    base = os.path.join(outdir, f"server_stats_{n}_{kind}")
+    fig.savefig(base + ".pdf")
+    fig.savefig(base + ".png", dpi=max(300, dpi))
+    plt.close(fig)
+
+# ----------------------- Main -----------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Wait events and pg_statio blocks per scenario from the result store.")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--glob", default=None, help="Read performance_run_<N>.xlsx files instead (older exports)")
+    ap.add_argument("--outdir", default="viz_server_stats", help="Output directory")
+    ap.add_argument("--size", type=int, default=None, help="N to plot (default: the largest found)")
+    ap.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS, help="Figures to draw")
+    ap.add_argument("--labels", nargs="*", default=["jsonb_indexed", "rel_indexed"],
+                    help="Label keys to compare (default: jsonb_indexed rel_indexed)")
+    ap.add_argument("--variants", nargs="*", default=[], help="Restrict to these scenarios (default: all)")
+    ap.add_argument("--title", default="", help="Optional title prefix")
+    ap.add_argument("--width", type=float, default=6.5, help="Figure width in inches")
+    ap.add_argument("--row-height", type=float, default=0.22, help="Height per bar in inches")
+    ap.add_argument("--dpi", type=int, default=300, help="Figure DPI (PNG fallback)")
+    args = ap.parse_args()
+
+    apply_style(dpi=args.dpi, base_font=9)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    def select(df: pd.DataFrame) -> pd.DataFrame:
+        df = df[df["size"] == (args.size or df["size"].max())]
+        if args.labels:
+            df = df[df["key"].isin(args.labels)]
+        if args.variants:
+            df = df[df["variant"].isin(args.variants)]
+        # read scenarios only; the write scenarios' counters are in the sheet
+        return df[df["source"] == "run"]
+
+    stats = select(sheet_frame("server_stats", args.store, args.glob))
+    if stats.empty:
+        raise SystemExit("Nothing to plot after filtering.")
+    n = int(stats["size"].iloc[0])
+
+    if "waits" in args.kinds:
+        waits = select(sheet_frame("wait_events", args.store, args.glob))
+        if waits.empty:
+            print("[warn] no wait samples (BENCH_WAIT_SAMPLE_MS=0?); skipping the waits figure")
+        else:
+            plot_stacked(wait_shares(waits), n, "waits", args.labels, args.outdir, args.title or None,
+                         args.width, args.row_height, args.dpi)
+    if "blocks" in args.kinds:
+        plot_stacked(block_counts(stats), n, "blocks", args.labels, args.outdir, args.title or None,
+                     args.width, args.row_height, args.dpi)
+
+    tidy = stats.drop(columns=["label"]).sort_values(["variant", "key"])
+    tidy.to_csv(os.path.join(args.outdir, "server_stats_tidy.csv"), index=False)
+    print(f"Saved figures to: {os.path.abspath(args.outdir)}")
+
+if __name__ == "__main__":
+    main()
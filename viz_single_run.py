@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 # viz_single_run.py
-# Small-multiples by scenario (S1..S10). 2–4 labels (jsonb/rel, indexed/unindexed).
-# Figure: 2 columns × 5 rows (S1..S10). Each subplot is a grouped bar chart for the chosen metric.
+# Small-multiples by scenario family (S1..S10, ...). 2–6 labels (jsonb/rel, indexed/unindexed,
+# hybrid, jsonb_gin containment).
+# Figure: 2 columns × as many rows as families. Each subplot is a grouped bar chart for the chosen metric.
+# Family titles and SQL examples come from the "scenarios" sheet (scenario catalog).
 # Style controls mirror viz_scaling.py: --column, --rowheight, --ratio, --ylabel.
 # Default behavior:
 #   - No per-subplot y-axis label (so 'p95_ms' won't appear on the sides)
@@ -15,10 +17,13 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
 
+from bench_store import STORE, load_meta, sheet_frames
+from scenarios import family_titles
+
 ALL_METRICS = ["p50_ms","p95_ms","avg_ms","sum_shared_reads","sum_shared_hits"]
 
-# Grid geometry fixed for S1..S10
-COLS, ROWS = 2, 5
+# Grid geometry: fixed columns, rows = ceil(families / COLS)
+COLS = 2
 
 # ----------------------- Print-friendly style -----------------------
 
@@ -45,6 +50,8 @@ SERIES_FILL = {
     "jsonb_unindexed": "#8c8c8c",  # lighter gray
     "rel_indexed":     "#000000",  # black
     "rel_unindexed":   "#bfbfbf",  # medium-light gray
+    "hybrid_indexed":  "#606060",  # mid gray
+    "jsonb_gin_containment": "#303030",  # jsonb gray, cross-hatched
     "jsonb":           "#4d4d4d",  # fallback if no idx hint
     "rel":             "#1a1a1a",
 }
@@ -53,6 +60,8 @@ HATCH_MAP = {
     "jsonb_unindexed": "//",
     "rel_indexed":     "",
     "rel_unindexed":   "//",
+    "hybrid_indexed":  "..",
+    "jsonb_gin_containment": "xx",
     "jsonb":           "",
     "rel":             "",
 }
@@ -61,53 +70,31 @@ LEGEND_LABEL = {
     "jsonb_unindexed": "JSONB (unindexed)",
     "rel_indexed":     "REL (indexed)",
     "rel_unindexed":   "REL (unindexed)",
+    "hybrid_indexed":  "HYBRID (indexed)",
+    "jsonb_gin_containment": "JSONB (GIN @>)",
     "jsonb":           "JSONB",
     "rel":             "REL",
 }
 
-# Scenario metadata (optional SQL exemplars)
-SCENARIO_META_BASE = {
-    "S1":  ("Equality + Numeric Inequality",
-            "SELECT id FROM inv_jsonb WHERE (payload->>'indexed_text_1')='A' AND ((payload->>'indexed_number_1')::numeric)>100",
-            "SELECT id FROM inv_rel   WHERE indexed_text_1='A' AND indexed_number_1>100"),
-    "S2":  ("LIKE Prefix Search",
-            "SELECT id FROM inv_jsonb WHERE (payload->>'indexed_text_2') LIKE 'INV00012%'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_2 LIKE 'INV00012%'"),
-    "S3":  ("Substring Contains (ILIKE/trigram)",
-            "SELECT id FROM inv_jsonb WHERE (payload->>'indexed_text_3') ILIKE '%priority%'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_3 ILIKE '%priority%'"),
-    "S4":  ("Timestamp Range",
-            "SELECT id FROM inv_jsonb WHERE (payload->>'indexed_timestamp_1')>='2025-01-01T00:00:00.000Z' AND (payload->>'indexed_timestamp_1')<'2025-02-01T00:00:00.000Z'",
-            "SELECT id FROM inv_rel   WHERE indexed_timestamp_1>='2025-01-01 00:00:00+00' AND indexed_timestamp_1<'2025-02-01 00:00:00+00'"),
-    "S5":  ("Array AND (must contain both)",
-            "SELECT id FROM inv_jsonb WHERE (payload->'indexed_text_array_1') @> '[\"aml\",\"priority\"]'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_array_1 @> ARRAY['aml','priority']"),
-    "S6":  ("Array OR (any overlap)",
-            "SELECT id FROM inv_jsonb WHERE (payload->'indexed_text_array_1') @> '[\"aml\"]' OR (payload->'indexed_text_array_1') @> '[\"priority\"]'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_array_1 && ARRAY['aml','priority']"),
-    "S7":  ("Multi-key AND (2 keys)",
-            "SELECT id FROM inv_jsonb WHERE payload @> '{\"indexed_text_1\":\"A\",\"indexed_boolean_1\":true}'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_1='A' AND indexed_boolean_1=true"),
-    "S8":  ("Multi-key AND (3 keys)",
-            "SELECT id FROM inv_jsonb WHERE payload @> '{\"indexed_text_1\":\"A\",\"indexed_boolean_1\":true,\"indexed_number_1\":100}'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_1='A' AND indexed_boolean_1=true AND indexed_number_1=100"),
-    "S9":  ("OR Across Keys",
-            "SELECT id FROM inv_jsonb WHERE payload @> '{\"indexed_text_1\":\"A\"}' OR payload @> '{\"indexed_boolean_1\":true}'",
-            "SELECT id FROM inv_rel   WHERE indexed_text_1='A' OR indexed_boolean_1=true"),
-    "S10": ("Top-N by Timestamp Within Group",
-            "SELECT id FROM inv_jsonb WHERE (payload->>'indexed_text_1')='A' ORDER BY (payload->>'indexed_timestamp_1')",
-            "SELECT id FROM inv_rel   WHERE indexed_text_1='A' ORDER BY indexed_timestamp_1"),
-}
-
 # ----------------------- Load + helpers -----------------------
 
-def load_summary(xlsx_path: str) -> pd.DataFrame:
-    df = pd.read_excel(xlsx_path, sheet_name="summary")
-    df.columns = [c.strip().lower() for c in df.columns]
+def load_summary(xlsx_path: str | None = None, store: str = STORE, size: int | None = None):
+    """(N, summary) of one size: from an Excel export, or the result store (default: largest N)."""
+    frames = sheet_frames("summary", store, xlsx_path)
+    if not frames:
+        raise SystemExit(f"No summary in {xlsx_path or store}")
+    if xlsx_path:
+        n, df = frames[0]
+    else:
+        found = dict(frames)
+        n = size if size is not None else max(found)
+        if n not in found:
+            raise SystemExit(f"N={n} not in {store} (have: {', '.join(map(str, sorted(found)))})")
+        df = found[n]
     for c in ALL_METRICS:
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df
+    return n, df
 
 def ensure_metric_columns(df: pd.DataFrame):
     for col in ["sum_shared_reads","sum_shared_hits"]:
@@ -115,10 +102,13 @@ def ensure_metric_columns(df: pd.DataFrame):
             df[col] = pd.NA
 
 def infer_key_from_label(label: str) -> str:
-    """Return jsonb_indexed/jsonb_unindexed/rel_indexed/rel_unindexed or fallback jsonb/rel/unknown."""
+    """Return jsonb_indexed/.../rel_unindexed/hybrid_indexed or fallback jsonb/rel/unknown."""
     if not isinstance(label, str):
         return "unknown"
     t = label.lower()
+    m = re.search(r"\b(jsonb_gin|jsonb|rel|hybrid)_(containment|unindexed|indexed)\b", t)
+    if m:
+        return f"{m.group(1)}_{m.group(2)}"
     engine = "jsonb" if re.search(r"\bjsonb\b", t) else ("rel" if re.search(r"\brel\b", t) else None)
     idx = None
     if re.search(r"\bunindexed\b", t):   # IMPORTANT: check 'unindexed' first
@@ -138,13 +128,18 @@ def shorten_tick(label: str) -> str:
         "jsonb_unindexed": "jsonb\nno-idx",
         "rel_indexed":     "rel\nidx",
         "rel_unindexed":   "rel\nno-idx",
+        "hybrid_indexed":  "hybrid\nidx",
+        "jsonb_gin_containment": "jsonb\ngin @>",
         "jsonb":           "jsonb",
         "rel":             "rel",
         "unknown":         label,
     }
     return mapping.get(k, label)
 
-def family_of_variant(variant: str) -> str:
+def family_of_variant(variant: str, meta: dict | None = None) -> str:
+    """Catalog family when the scenarios sheet is present, else the S<n> prefix."""
+    if meta and variant in meta and meta[variant].get("family"):
+        return meta[variant]["family"]
     if not isinstance(variant, str):
         return "Other"
     m = re.match(r"^(S\d+)", variant)
@@ -154,6 +149,16 @@ def numeric_family_sort_key(fam: str):
     m = re.match(r"^S(\d+)$", fam)
     return (0, int(m.group(1))) if m else (1, fam)
 
+def family_order(fams: list[str], meta: dict) -> list[str]:
+    """Catalog order when the scenarios sheet is present, else S<n> numeric order."""
+    rank = {}
+    for r in sorted(meta.values(), key=lambda r: (r.get("ord") or 0)):
+        rank.setdefault(r.get("family"), len(rank))
+    return sorted(fams, key=lambda f: (rank.get(f, len(rank)), numeric_family_sort_key(f)))
+
+def grid_rows(n_families: int) -> int:
+    return max(1, -(-n_families // COLS))
+
 def filter_by_label_substring(df: pd.DataFrame, substr: str) -> pd.DataFrame:
     m = df["label"].str.contains(substr, case=False, na=False)
     out = df[m].copy()
@@ -165,7 +170,8 @@ def filter_by_label_substring(df: pd.DataFrame, substr: str) -> pd.DataFrame:
         sys.exit(1)
     return out
 
-def prepare_matrix_for_metric(df: pd.DataFrame, labels: list[str], metric: str) -> pd.DataFrame:
+def prepare_matrix_for_metric(df: pd.DataFrame, labels: list[str], metric: str,
+                              meta: dict | None = None) -> pd.DataFrame:
     frames = []
     for lbl in labels:
         sub = filter_by_label_substring(df, lbl)[["variant", metric]].rename(columns={metric: lbl})
@@ -175,7 +181,7 @@ def prepare_matrix_for_metric(df: pd.DataFrame, labels: list[str], metric: str)
         mat = pd.merge(mat, sub, on="variant", how="inner")
     if mat.empty:
         return mat
-    mat["family"] = mat["variant"].apply(family_of_variant)
+    mat["family"] = mat["variant"].apply(lambda v: family_of_variant(v, meta))
     return mat
 
 # ----------------------- Title helpers -----------------------
@@ -215,21 +221,12 @@ def resolve_N_for_title(labels: list[str], file_path: str, arg_n: str | None, n_
 
 # ----------------------- Example text helpers -----------------------
 
-def example_for_key(family: str, key: str) -> str:
-    meta = SCENARIO_META_BASE.get(family)
-    if not meta:
-        return ""
-    _, j_idx, r_idx = meta
-    base = None
-    if key.startswith("jsonb"):
-        base = j_idx
-        if key.endswith("unindexed"):
-            base = base.replace("indexed_", "unindexed_")
-    elif key.startswith("rel"):
-        base = r_idx
-        if key.endswith("unindexed"):
-            base = base.replace("indexed_", "unindexed_")
-    return base or ""
+def example_for_key(meta: dict, family: str, key: str) -> str:
+    """Rendered SQL of the first catalog scenario of the family for this label."""
+    for r in sorted(meta.values(), key=lambda r: (r.get("ord") or 0)):
+        if r.get("family") == family and r.get(f"sql_{key}"):
+            return " ".join(str(r[f"sql_{key}"]).split())
+    return ""
 
 def wrap_vertical(text: str, width: int = 60) -> str:
     t = text.strip()
@@ -277,7 +274,7 @@ def compose_label_with_percent(key: str, value: float, baselines: dict, metric:
     k = (key or "").strip().lower()
     if k == "jsonb_indexed":
         return f"{abs_txt} (100%)"
-    if k == "rel_indexed" and b_idx and b_idx > 0:
+    if k in ("rel_indexed", "hybrid_indexed", "jsonb_gin_containment") and b_idx and b_idx > 0:
         p = 100.0 * (value / b_idx); faster = 100.0 - p
         return f"{abs_txt} ({p:.0f}% of JSONB, {faster:.0f}% faster)"
     if k == "jsonb_unindexed":
@@ -315,14 +312,19 @@ def plot_grid_by_family(mat: pd.DataFrame, labels: list[str], metric: str, out_b
                         title: str | None, title_template: str, n_hint: str | None,
                         examples: bool, show_labels: bool, show_percent: bool,
                         ylabel_mode: str, error_mode: str,
-                        fig_w_per_col: float, fig_h_per_row: float):
+                        fig_w_per_col: float | None, fig_h_per_row: float, ratio: float | None,
+                        meta: dict):
     if mat.empty:
         return
 
-    fams = sorted(mat["family"].unique().tolist(), key=numeric_family_sort_key)
+    fams = family_order(mat["family"].unique().tolist(), meta)
+    titles = family_titles(meta)
     n = len(fams)
+    rows = grid_rows(n)
+    if ratio is not None:
+        fig_w_per_col = ratio * (rows / COLS) * fig_h_per_row
 
-    fig, axes = plt.subplots(ROWS, COLS, figsize=(fig_w_per_col * COLS, fig_h_per_row * ROWS), squeeze=False)
+    fig, axes = plt.subplots(rows, COLS, figsize=(fig_w_per_col * COLS, fig_h_per_row * rows), squeeze=False)
 
     # Figure legend handles (consistent across subplots)
     uniq_keys = []
@@ -376,8 +378,8 @@ def plot_grid_by_family(mat: pd.DataFrame, labels: list[str], metric: str, out_b
         margin = 1.42 if examples else 1.25
         ax.set_ylim(0, ymax * margin)
 
-        scen_title = SCENARIO_META_BASE.get(fam, ("", "", ""))[0]
-        ax.set_title(f"{fam} — {scen_title}", pad=4)
+        scen_title = titles.get(fam, "")
+        ax.set_title(f"{fam} — {scen_title}" if scen_title else fam, pad=4)
 
         if show_labels:
             baselines = compute_baselines(keys, vals)
@@ -391,7 +393,7 @@ def plot_grid_by_family(mat: pd.DataFrame, labels: list[str], metric: str, out_b
 
         if examples:
             for xi, k, vi in zip(x, keys, vals):
-                ex = example_for_key(fam, k)
+                ex = example_for_key(meta, fam, k)
                 if ex:
                     txt = wrap_vertical(ex, width=95)
                     ax.text(
@@ -405,7 +407,7 @@ def plot_grid_by_family(mat: pd.DataFrame, labels: list[str], metric: str, out_b
             ax.set_ylabel(metric_label(metric))
         ax.grid(True, axis='y', alpha=0.25)
 
-    for j in range(n, ROWS * COLS):
+    for j in range(n, rows * COLS):
         r, c = divmod(j, COLS)
         axes[r][c].axis('off')
 
@@ -432,11 +434,13 @@ def plot_grid_by_family(mat: pd.DataFrame, labels: list[str], metric: str, out_b
 
 def main():
     ap = argparse.ArgumentParser(
-        description="Grouped bar charts by scenario (S1..S10), 2–4 labels (jsonb/rel, indexed/unindexed)."
+        description="Grouped bar charts by scenario family, 2–6 labels (jsonb/rel, indexed/unindexed, hybrid, GIN)."
     )
-    ap.add_argument("--file", required=True, help="Path to performance_run_<N>.xlsx (summary sheet)")
+    ap.add_argument("--store", default=STORE, help="Result store (BENCH_STORE, default <OUTDIR>/store)")
+    ap.add_argument("--size", type=int, default=None, help="N to plot from the store (default: the largest found)")
+    ap.add_argument("--file", default=None, help="Read performance_run_<N>.xlsx instead (summary sheet, older exports)")
     ap.add_argument("--labels", nargs="+", required=True,
-                    help="2–4 label substrings (e.g. 'jsonb_indexed' 'jsonb_unindexed' 'rel_indexed' 'rel_unindexed')")
+                    help="2–6 label substrings (e.g. 'jsonb_indexed' 'rel_indexed' 'hybrid_indexed' 'jsonb_gin_containment')")
 
     g = ap.add_mutually_exclusive_group(required=False)
     g.add_argument("--metric", choices=ALL_METRICS, help="Single metric")
@@ -482,18 +486,16 @@ def main():
 
     apply_style(dpi=args.dpi, base_font=9)
 
-    # Compute per-subplot width to match viz_scaling.py behavior
+    # Per-subplot width to match viz_scaling.py behavior (--ratio: computed per figure)
     fig_h_per_row = args.rowheight
-    if args.ratio is not None:
-        fig_w_per_col = args.ratio * (ROWS / COLS) * fig_h_per_row
-    else:
-        fig_w_per_col = 3.5 if args.column == "single" else 7.2
+    fig_w_per_col = None if args.ratio is not None else (3.5 if args.column == "single" else 7.2)
 
-    df = load_summary(args.file)
+    size, df = load_summary(args.file, args.store, args.size)
+    meta = load_meta(args.store, args.file)
     ensure_metric_columns(df)
 
-    if len(args.labels) < 2 or len(args.labels) > 4:
-        print("Please pass between 2 and 4 --labels.")
+    if len(args.labels) < 2 or len(args.labels) > 6:
+        print("Please pass between 2 and 6 --labels.")
         sys.exit(1)
 
     os.makedirs(args.outdir, exist_ok=True)
@@ -508,12 +510,12 @@ def main():
     else:
         metrics = ["p50_ms"]
 
-    # Resolve N for title once (from --n or filename)
-    n_hint = resolve_N_for_title(args.labels, args.file, args.n, args.n_sep)
+    # Resolve N for title once (from --n, the store size or filename)
+    n_hint = resolve_N_for_title(args.labels, args.file or "", args.n or (str(size) if size else None), args.n_sep)
 
     # Build wide matrix for each metric and plot
     for m in metrics:
-        mat = prepare_matrix_for_metric(df, args.labels, m)
+        mat = prepare_matrix_for_metric(df, args.labels, m, meta)
         if mat.empty:
             print(f"[warn] No data for metric {m}; skipping.")
             continue
@@ -533,6 +535,8 @@ def main():
             error_mode=args.errors,
             fig_w_per_col=fig_w_per_col,
             fig_h_per_row=fig_h_per_row,
+            ratio=args.ratio,
+            meta=meta,
         )
         mat.to_csv(os.path.join(args.outdir, f"{m}_wide.csv"), index=False)
 